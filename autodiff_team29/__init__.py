@@ -1,2 +1,11 @@
 from autodiff_team29.node import Node
 from autodiff_team29.vector_function import VectorFunction
+from autodiff_team29.tape import Tape, trace
+from autodiff_team29.reverse import grad, hvp
+from autodiff_team29.tangent import SparseTangent
+from autodiff_team29.dual import Dual
+from autodiff_team29.taylor import Taylor, taylor_derivatives
+from autodiff_team29.implicit import implicit_solve
+from autodiff_team29.loop import Loop, scan, fori_loop
+from autodiff_team29.spill import MappedTape
+from autodiff_team29.codegen import compile_tape, numpy_source
@@ -0,0 +1,135 @@
+from __future__ import annotations
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class TangentArena:
+    def __init__(self) -> None:
+        """
+        Owns the tangent storage of in-place evaluations as the rows of a single preallocated buffer.
+        Row i holds the tangent of one instruction. The buffer is kept between evaluations and only reallocated
+        if a request does not fit into it, so evaluating repeatedly at the same shape allocates no tangent memory.
+
+        Notes
+        -----
+        Rows handed out by the arena are overwritten by the next request. An arena must not be shared
+        between evaluations running concurrently.
+
+        Example
+        -------
+        >>> arena = TangentArena()
+        >>> rows = arena.reserve(10, (3,))
+        >>> rows = arena.reserve(10, (2,))
+        >>> arena.allocations, arena.reuses
+        (1, 1)
+
+        """
+        self._buffer = None
+        self._allocations = 0
+        self._allocated_bytes = 0
+        self._reuses = 0
+
+    @property
+    def allocations(self) -> int:
+        """
+        Returns the number of buffers allocated since the arena was created
+
+        """
+        return self._allocations
+
+    @property
+    def allocated_bytes(self) -> int:
+        """
+        Returns the number of bytes allocated since the arena was created
+
+        """
+        return self._allocated_bytes
+
+    @property
+    def reuses(self) -> int:
+        """
+        Returns the number of requests served from the existing buffer
+
+        """
+        return self._reuses
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the number of bytes held by the current buffer
+
+        """
+        return 0 if self._buffer is None else self._buffer.nbytes
+
+    def reserve(
+        self, n_rows: int, row_shape: Tuple[int, ...], dtype: Union[str, type, np.dtype] = float
+    ) -> NDArray[float]:
+        """
+        Returns n_rows rows of the given shape backed by the buffer of the arena.
+        The buffer is grown to fit the request if needed, otherwise a view of the existing buffer is returned.
+        The rows are not initialized.
+
+        Parameters
+        ----------
+        n_rows : int
+            number of rows requested.
+        row_shape : Tuple[int, ...]
+            shape of every row.
+        dtype : Union[str, type, np.dtype], default=float
+            floating point type of the rows. Requests of another dtype than the buffer reallocate it.
+
+        Returns
+        -------
+        NDArray[float] :
+            array of shape (n_rows, *row_shape).
+
+        """
+        shape = (n_rows,) + tuple(row_shape)
+        buffer = self._buffer
+        if (
+            buffer is None
+            or buffer.dtype != dtype
+            or buffer.ndim != len(shape)
+            or any(available < requested for available, requested in zip(buffer.shape, shape))
+        ):
+            # grown buffers keep their larger dimensions so that alternating requests do not reallocate
+            if buffer is not None and buffer.dtype == dtype and buffer.ndim == len(shape):
+                shape = tuple(np.maximum(buffer.shape, shape))
+
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffer = buffer
+            self._allocations += 1
+            self._allocated_bytes += buffer.nbytes
+        else:
+            self._reuses += 1
+
+        return buffer[(slice(n_rows),) + tuple(slice(size) for size in row_shape)]
+
+    def release(self) -> None:
+        """
+        Drops the buffer of the arena. Counters are preserved.
+
+        """
+        self._buffer = None
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Summarizes the allocation counters of the arena.
+
+        Returns
+        -------
+        Dict[str, Any] :
+            allocated buffers and bytes, requests served from the existing buffer and bytes currently held.
+
+        """
+        return {
+            "allocations": self._allocations,
+            "allocated_bytes": self._allocated_bytes,
+            "reuses": self._reuses,
+            "stored_bytes": self.nbytes,
+        }
+
+    def __repr__(self) -> str:
+        return f"TangentArena(allocations={self._allocations}, stored_bytes={self.nbytes})"
@@ -0,0 +1,243 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from autodiff_team29.tape import Tape
+
+
+# NumPy expressions of the value and of the partial derivative with respect to every operand of each operation.
+# {0} and {1} stand for the values of the operands, {v} for the value of the operation and {p0} for its first parameter.
+# partials are multiplied with tangents, so a partial with a top-level sum is parenthesized
+_NUMPY_TEMPLATES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "+": ("{0} + {1}", ("1", "1")),
+    "-": ("{0} - {1}", ("1", "-1")),
+    "*": ("{0} * {1}", ("{1}", "{0}")),
+    "/": ("{0} / {1}", ("1 / {1}", "-{v} / {1}")),
+    "neg": ("-{0}", ("-1",)),
+    "**": ("{0} ** {1}", ("{v} * {1} / {0}", "{v} * np.log({0})")),
+    "sqrt": ("np.sqrt({0})", ("0.5 / {v}",)),
+    "ln": ("np.log({0})", ("1 / {0}",)),
+    "log": ("np.log({0}) / float(np.log({p0}))", ("1 / ({0} * float(np.log({p0})))",)),
+    "exp": ("np.exp({0})", ("{v}",)),
+    "sin": ("np.sin({0})", ("np.cos({0})",)),
+    "cos": ("np.cos({0})", ("-np.sin({0})",)),
+    "tan": ("np.tan({0})", ("1 / np.cos({0}) ** 2",)),
+    "arcsin": ("np.arcsin({0})", ("1 / np.sqrt(1 - {0} ** 2)",)),
+    "arccos": ("np.arccos({0})", ("-1 / np.sqrt(1 - {0} ** 2)",)),
+    "arctan": ("np.arctan({0})", ("1 / (1 + {0} ** 2)",)),
+    "sinh": ("np.sinh({0})", ("np.cosh({0})",)),
+    "cosh": ("np.cosh({0})", ("np.sinh({0})",)),
+    "tanh": ("np.tanh({0})", ("(1 - {v} ** 2)",)),
+    "logistic": ("np.exp(-np.logaddexp(0, -{0}))", ("{v} * (1 - {v})",)),
+}
+
+# compiled functions keyed by their source, so tapes of the same structure share one function.
+# the least recently used functions are evicted beyond _MAX_COMPILED_FUNCTIONS, tapes keep their own function
+_MAX_COMPILED_FUNCTIONS = 128
+_COMPILED_FUNCTIONS: OrderedDict[str, Callable] = OrderedDict()
+_COMPILED_FUNCTIONS_LOCK = threading.Lock()
+
+
+def _stack(entries: List[Union[float, NDArray]], axis: int, dtype: np.dtype = None) -> NDArray[float]:
+    """
+    Stacks values or rows of derivatives of possibly different shapes, broadcasting them to a common shape first.
+    The result has the given dtype, by default the floating point type the entries promote to, so that float32 values
+    are not promoted by python float literals.
+
+    """
+    if dtype is None:
+        dtype = np.result_type(*entries)
+        if not np.issubdtype(dtype, np.inexact):
+            dtype = np.dtype(float)
+
+    return np.stack(np.broadcast_arrays(*entries), axis=axis).astype(dtype, copy=False)
+
+
+def _product(partial: str, tangent: str) -> str:
+    """
+    Returns the expression of a partial derivative times a tangent, simplifying unit factors.
+
+    """
+    if partial in ("1", "-1") and tangent in ("1", "-1"):
+        return "1" if partial == tangent else "-1"
+    if partial == "1" or tangent == "1":
+        return tangent if partial == "1" else partial
+    if partial == "-1" or tangent == "-1":
+        factor = tangent if partial == "-1" else partial
+        return factor[1:] if factor.startswith("-") else f"-{factor}"
+    return f"{partial} * {tangent}"
+
+
+def _is_atom(expression: str) -> bool:
+    """
+    Returns whether an expression is a name or a unit, which tangents refer to instead of assigning it.
+
+    """
+    return expression.isidentifier() or expression in ("1", "-1")
+
+
+def numpy_source(tape: Tape) -> str:
+    """
+    Generates straight-line NumPy source computing the value and Jacobian of a tape, without nodes, registry or rules.
+    Shared subexpressions are computed once, since the tape records every node once. Tangents are propagated
+    one input direction at a time as plain NumPy expressions, and only along the directions a slot depends on,
+    so derivatives that are structurally zero are never computed.
+
+    Parameters
+    ----------
+    tape : Tape
+        tape to translate.
+
+    Returns
+    -------
+    str :
+        source of a function _compiled_tape(x0, x1, ...) returning the value and gradient, or the vector of values
+        and the Jacobian, like Tape.evaluate.
+
+    Raises
+    ------
+    ValueError :
+        Raise value error if the tape holds an operation without a NumPy template or a batched constant
+
+    Example
+    -------
+    >>> print(numpy_source(trace(lambda x, y: x * sin(y), 2)))
+    def _compiled_tape(x0, x1):
+        v2 = np.sin(x1)
+        d2_1 = np.cos(x1)
+        v3 = x0 * v2
+        d3_1 = x0 * d2_1
+        return v3, _stack([v2, d3_1], axis=-1, dtype=np.float64)
+
+    """
+    n_inputs = len(tape._input_slots)
+    names = {}
+    tangents: Dict[int, Dict[int, str]] = {}
+    lines = [f"def _compiled_tape({', '.join(f'x{index}' for index in range(n_inputs))}):"]
+
+    for index, slot in enumerate(tape._input_slots):
+        names[slot] = f"x{index}"
+        tangents[slot] = {index: "1"}
+
+    for slot, constant in enumerate(tape._initial_slots):
+        if constant is None:
+            continue
+        if np.ndim(constant.value) != 0:
+            raise ValueError("Only tapes of scalar functions can be compiled, found a batched constant")
+        # negative literals are parenthesized so that they bind like variables, e.g. in (-2.0) ** v3,
+        # and non-finite constants have no literal, their repr inf or nan is not a name of the generated source
+        literal = repr(float(constant.value))
+        if not np.isfinite(constant.value):
+            names[slot] = f"float('{literal}')"
+        else:
+            names[slot] = f"({literal})" if literal.startswith("-") else literal
+        tangents[slot] = {}
+
+    for operation, operand_slots, parameters, output_slot in tape._instructions:
+        if operation not in _NUMPY_TEMPLATES:
+            raise ValueError(f"Operation '{operation}' cannot be compiled to NumPy")
+
+        value_template, partial_templates = _NUMPY_TEMPLATES[operation]
+        value = f"v{output_slot}"
+        substitutions = {
+            "v": value,
+            **{f"p{index}": repr(parameter) for index, parameter in enumerate(parameters)},
+        }
+        operands = [names[slot] for slot in operand_slots]
+        lines.append(f"    {value} = {value_template.format(*operands, **substitutions)}")
+        names[output_slot] = value
+
+        # directions of every operand, with the partial derivative of the operation with respect to it
+        contributions: Dict[int, List[str]] = {}
+        for operand_slot, partial_template in zip(operand_slots, partial_templates):
+            if not tangents[operand_slot]:
+                continue
+            partial = partial_template.format(*operands, **substitutions)
+            if len(tangents[operand_slot]) > 1 and partial not in ("1", "-1"):
+                lines.append(f"    p{output_slot}_{len(contributions)} = {partial}")
+                partial = f"p{output_slot}_{len(contributions)}"
+            for direction, tangent in tangents[operand_slot].items():
+                contributions.setdefault(direction, []).append(_product(partial, tangent))
+
+        tangents[output_slot] = {}
+        for direction, terms in sorted(contributions.items()):
+            if len(terms) == 1 and _is_atom(terms[0]):
+                tangents[output_slot][direction] = terms[0]
+                continue
+            tangent = f"d{output_slot}_{direction}"
+            lines.append(f"    {tangent} = {' + '.join(terms)}")
+            tangents[output_slot][direction] = tangent
+
+    # derivatives have the dtype the tape was traced with, like the seed vectors of Tape.evaluate
+    dtype = f"np.{tape._seed_vectors.dtype.name}"
+    rows = []
+    for output_slot in tape._output_slots:
+        row = [tangents[output_slot].get(direction, "0.0") for direction in range(n_inputs)]
+        row = [f"{entry}.0" if entry in ("1", "-1") else entry for entry in row]
+        rows.append(f"_stack([{', '.join(row)}], axis=-1, dtype={dtype})")
+
+    outputs = [names[slot] for slot in tape._output_slots]
+    if tape._vector_output:
+        lines.append(
+            f"    return _stack([{', '.join(outputs)}], axis=-1), "
+            f"_stack([{', '.join(rows)}], axis=-2, dtype={dtype})"
+        )
+    else:
+        lines.append(f"    return {outputs[0]}, {rows[0]}")
+
+    return "\n".join(lines) + "\n"
+
+
+def compile_tape(tape: Tape) -> Callable[..., Tuple[Union[float, NDArray], NDArray]]:
+    """
+    Compiles a tape into a plain NumPy function with compile and exec, see numpy_source.
+    Calls only run NumPy expressions, so arrays of points are evaluated at the speed of hand-written NumPy.
+    Functions are cached by their source, keeping the most recently used ones, and on the tape,
+    so compiling again is free.
+
+    Parameters
+    ----------
+    tape : Tape
+        tape to compile.
+
+    Returns
+    -------
+    Callable[..., Tuple[Union[float, NDArray], NDArray]] :
+        function of the inputs returning the value and gradient, or the vector of values and the Jacobian,
+        like Tape.evaluate. Its source is available as the source attribute.
+
+    Notes
+    -----
+    Compiled functions do not check domains, points outside the domain of an elementary give nan like NumPy does.
+
+    Example
+    -------
+    >>> f = compile_tape(trace(lambda x, y: [x * y, sin(x)], 2))
+    >>> values, jacobians = f(np.linspace(0, 1, 1_000_000), 2.0)
+    >>> jacobians.shape
+    (1000000, 2, 2)
+
+    """
+    if tape._compiled is not None:
+        return tape._compiled
+
+    source = numpy_source(tape)
+    with _COMPILED_FUNCTIONS_LOCK:
+        compiled = _COMPILED_FUNCTIONS.get(source)
+        if compiled is None:
+            namespace = {"np": np, "_stack": _stack}
+            exec(compile(source, "<autodiff_team29 compiled tape>", "exec"), namespace)
+            compiled = namespace["_compiled_tape"]
+            compiled.source = source
+            _COMPILED_FUNCTIONS[source] = compiled
+            while len(_COMPILED_FUNCTIONS) > _MAX_COMPILED_FUNCTIONS:
+                _COMPILED_FUNCTIONS.popitem(last=False)
+        else:
+            _COMPILED_FUNCTIONS.move_to_end(source)
+
+    tape._compiled = compiled
+    return compiled
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import Tuple, Union
+
+from numpy.typing import NDArray
+
+from autodiff_team29.node import Node
+
+
+class Dual:
+    # no instance dictionary, so creating a dual number only stores its two traces
+    __slots__ = ("value", "derivative")
+
+    def __init__(
+        self,
+        value: Union[int, float, NDArray],
+        derivative: Union[int, float, NDArray] = 0,
+    ) -> None:
+        """
+        Dual number holding a value and its derivative, for hot inner loops that do not need symbols.
+        Operators and elementaries apply the same forward rules as Node, but skip the type checks,
+        symbols, registry lookups and dependency tracking of Node. Numbers are treated as constants.
+
+        Parameters
+        ----------
+        value : int, float, NDArray
+            value of the dual number.
+        derivative : int, float, NDArray, default=0
+            derivative, or tangent for seed vectors, of the dual number.
+
+        Example
+        -------
+        >>> x = Dual(2.0, np.array([1.0, 0.0]))
+        >>> y = Dual(3.0, np.array([0.0, 1.0]))
+        >>> (x * sin(y)).derivative
+        array([ 0.14112001, -1.97998499])
+
+        """
+        self.value = value
+        self.derivative = derivative
+
+    @classmethod
+    def _apply_operation(
+        cls, operation: str, operands: Tuple[Dual, ...], parameters: Tuple = ()
+    ) -> Dual:
+        """
+        Returns the dual number resulting from applying an operation to its operands with its forward rule, see Node.
+
+        """
+        return cls(*Node._FORWARD_RULES[operation](*operands, *parameters))
+
+    def __add__(self, other: Union[int, float, Dual]) -> Dual:
+        if other.__class__ is not Dual:
+            other = Dual(other)
+        return Dual(*Node._FORWARD_RULES["+"](self, other))
+
+    def __radd__(self, other: Union[int, float]) -> Dual:
+        return self.__add__(other)
+
+    def __sub__(self, other: Union[int, float, Dual]) -> Dual:
+        if other.__class__ is not Dual:
+            other = Dual(other)
+        return Dual(*Node._FORWARD_RULES["-"](self, other))
+
+    def __rsub__(self, other: Union[int, float]) -> Dual:
+        return Dual(*Node._FORWARD_RULES["-"](Dual(other), self))
+
+    def __mul__(self, other: Union[int, float, Dual]) -> Dual:
+        if other.__class__ is not Dual:
+            other = Dual(other)
+        return Dual(*Node._FORWARD_RULES["*"](self, other))
+
+    def __rmul__(self, other: Union[int, float]) -> Dual:
+        return self.__mul__(other)
+
+    def __truediv__(self, other: Union[int, float, Dual]) -> Dual:
+        if other.__class__ is not Dual:
+            other = Dual(other)
+        return Dual(*Node._FORWARD_RULES["/"](self, other))
+
+    def __rtruediv__(self, other: Union[int, float]) -> Dual:
+        return Dual(*Node._FORWARD_RULES["/"](Dual(other), self))
+
+    def __neg__(self) -> Dual:
+        return Dual(*Node._FORWARD_RULES["neg"](self))
+
+    def __pow__(self, exponent: Union[int, float, Dual]) -> Dual:
+        if exponent.__class__ is not Dual:
+            exponent = Dual(exponent)
+        return Dual(*Node._FORWARD_RULES["**"](self, exponent))
+
+    def __rpow__(self, base: Union[int, float]) -> Dual:
+        return Dual(*Node._FORWARD_RULES["**"](Dual(base), self))
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value}, {self.derivative})"
@@ -1,7 +1,98 @@
-from typing import Union
+from typing import Tuple, Union
 import numpy as np
-import math
 from autodiff_team29 import Node
+from autodiff_team29.dual import Dual
+from autodiff_team29.node import (
+    _align_with_tangent,
+    _taylor_exp,
+    _taylor_integral_of_quotient,
+    _taylor_product,
+    _taylor_quotient,
+)
+from autodiff_team29.taylor import Taylor
+
+
+def _any_point(condition: Union[bool, np.ndarray]) -> bool:
+    """
+    Returns whether a domain condition holds for a scalar value, or for any point of a batched value.
+
+    """
+    if isinstance(condition, np.ndarray):
+        return condition.any()
+
+    return condition
+
+
+def _apply_elementary(
+    operation: str, x: Union[int, float, Node, Dual], parameters: Tuple = ()
+) -> Union[Node, Dual]:
+    """
+    Applies an elementary to a node or a number. Dual numbers are passed to the same forward rule
+    without any symbolic bookkeeping, see Dual, and Taylor series to the Taylor rule of the elementary.
+
+    """
+    if isinstance(x, (Dual, Taylor)):
+        return type(x)._apply_operation(operation, (x,), parameters)
+
+    x = Node._convert_numeric_type_to_node(x)
+    return Node._apply_operation(operation, (x,), parameters=parameters)
+
+
+def _taylor_constant(value: Union[int, float], n_coefficients: int) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of a constant.
+
+    """
+    coefficients = np.zeros(n_coefficients)
+    coefficients[0] = value
+    return coefficients
+
+
+def _taylor_sqrt(a: np.ndarray) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of sqrt(a), solving s * s = a for s one order at a time.
+
+    """
+    s = np.empty(len(a))
+    s[0] = np.sqrt(a[0])
+    for k in range(1, len(a)):
+        s[k] = (a[k] - np.dot(s[1:k], s[1:k][::-1])) / (2 * s[0])
+
+    return s
+
+
+def _taylor_sin_cos(a: np.ndarray, hyperbolic: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the Taylor coefficients of sin(a) and cos(a), or sinh(a) and cosh(a),
+    propagated together from s' = a' c and c' = -a' s, or c' = a' s for the hyperbolic functions.
+
+    """
+    weighted = np.arange(len(a)) * a
+    s, c = np.empty(len(a)), np.empty(len(a))
+    s[0], c[0] = (np.sinh(a[0]), np.cosh(a[0])) if hyperbolic else (np.sin(a[0]), np.cos(a[0]))
+    sign = 1 if hyperbolic else -1
+    for k in range(1, len(a)):
+        s[k] = np.dot(weighted[1 : k + 1], c[:k][::-1]) / k
+        c[k] = sign * np.dot(weighted[1 : k + 1], s[:k][::-1]) / k
+
+    return s, c
+
+
+def _taylor_tan(a: np.ndarray, hyperbolic: bool = False) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of tan(a), or tanh(a), from t' = a' u with u = 1 + t * t, or u = 1 - t * t.
+
+    """
+    weighted = np.arange(len(a)) * a
+    sign = -1 if hyperbolic else 1
+    t, u = np.empty(len(a)), np.empty(len(a))
+    t[0] = np.tanh(a[0]) if hyperbolic else np.tan(a[0])
+    u[0] = 1 + sign * t[0] ** 2
+    for k in range(1, len(a)):
+        t[k] = np.dot(weighted[1 : k + 1], u[:k][::-1]) / k
+        u[k] = sign * np.dot(t[: k + 1], t[: k + 1][::-1])
+
+    return t
 
 
 def _check_log_domain_restrictions(x: Node) -> None:
@@ -33,7 +124,7 @@ def _check_log_domain_restrictions(x: Node) -> None:
     ValueError: Value '-1' not valid for a logarithmic functionNone
 
     """
-    if x.value <= 0:
+    if _any_point(x.value <= 0):
         raise ValueError(f"Value '{x.value} 'not valid for a logarithmic function")
 
 
@@ -66,7 +157,7 @@ def _check_sqrt_domain_restrictions(x: Node) -> None:
     ValueError: Square roots of negative numbers not supported
 
     """
-    if x.value < 0:
+    if _any_point(x.value < 0):
         raise ValueError("Square roots of negative numbers not supported")
 
 
@@ -98,7 +189,7 @@ def _check_tan_domain_restrictions(x: Node) -> None:
     ValueError: Value, pi/2, not within domain of tan
 
     """
-    if np.cos(x.value) == 0:
+    if _any_point(np.cos(x.value) == 0):
         raise ValueError(f"Value, {x.value}, not within domain of tan")
 
 
@@ -131,7 +222,7 @@ def _check_arccos_domain_restrictions(x: Node) -> None:
     ValueError: '-5' is not within the domain [-1,1] of f(x)=arccos(x)
 
     """
-    if np.abs(x.value) > 1:
+    if _any_point(np.abs(x.value) > 1):
         raise ValueError(
             f"'{x.value}' is not within the domain [-1,1] of f(x)=arccos(x)"
         )
@@ -165,10 +256,40 @@ def _check_arcsin_domain_restrictions(x: Node) -> None:
     >>> _check_arcsin_domain_restrictions(Node("-5",-1,0))
     ValueError: '-5' is not within the domain [-1,1] of f(x)=arcsin(x)
     """
-    if np.abs(x.value) > 1:
+    if _any_point(np.abs(x.value) > 1):
         raise ValueError(f"{x.value} is not within the domain [-1,1] of f(x)=arcsin(x)")
 
 
+def _sqrt_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of sqrt(x).
+
+    """
+    _check_sqrt_domain_restrictions(x)
+
+    forward_trace = np.sqrt(x.value)
+    tangent_trace = x.derivative / _align_with_tangent(2 * np.sqrt(x.value))
+    return forward_trace, tangent_trace
+
+
+def _sqrt_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of sqrt(x).
+
+    """
+    return ((-1 / (4 * x.value * np.sqrt(x.value)),),)
+
+
+def _sqrt_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of sqrt(x).
+
+    """
+    _check_sqrt_domain_restrictions(x)
+
+    return _taylor_sqrt(x.coefficients)
+
+
 def sqrt(x: Union[int, float, Node]) -> Node:
     """
     Takes in an instance of the Node class and returns a new node with its symbolic
@@ -193,19 +314,38 @@ def sqrt(x: Union[int, float, Node]) -> Node:
     ValueError: Square roots of negative numbers not supported
 
     """
-    symbolic_representation = "sqrt({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("sqrt", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    _check_sqrt_domain_restrictions(x)
+def _ln_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of ln(x).
 
-    forward_trace = np.sqrt(x.value)
-    tangent_trace = x.derivative / (2 * np.sqrt(x.value))
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+    """
+    _check_log_domain_restrictions(x)
+
+    forward_trace = np.log(x.value)
+    tangent_trace = x.derivative / _align_with_tangent(x.value)
+    return forward_trace, tangent_trace
+
+
+def _ln_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of ln(x).
+
+    """
+    return ((-1 / x.value**2,),)
+
+
+def _ln_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of ln(x).
+
+    """
+    _check_log_domain_restrictions(x)
 
-    return new_node
+    a = x.coefficients
+    return _taylor_integral_of_quotient(a, a, np.log(a[0]))
 
 
 def ln(x: Union[int, float, Node]) -> Node:
@@ -224,7 +364,7 @@ def ln(x: Union[int, float, Node]) -> Node:
 
     Examples
     --------
-    >>> ln(Node("1",1,0))
+    >>> ln(Node("1",1,1))
     Node("ln(1)", 0, 1)
     >>> ln(Node("0",0,0))
     ValueError: Value 0 not valid for a logarithmic function
@@ -232,19 +372,40 @@ def ln(x: Union[int, float, Node]) -> Node:
     ValueError: Value '-1' not valid for a logarithmic functionNone
 
     """
-    symbolic_representation = "ln({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("ln", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
+def _log_forward_rule(x: Node, base: Union[int, float]) -> Tuple:
+    """
+    Returns the primal and tangent trace of the logarithm of x in the given base.
+
+    """
     _check_log_domain_restrictions(x)
 
-    forward_trace = np.log(x.value)
-    tangent_trace = 1 / x.value
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+    # the scale is a python float, so that it keeps the dtype of float32 values and tangents
+    scale = _align_with_tangent(np.log(base))
+    forward_trace = np.log(x.value) / scale
+    tangent_trace = x.derivative / _align_with_tangent(x.value) / scale
+    return forward_trace, tangent_trace
+
+
+def _log_second_derivative_rule(x: Node, base: Union[int, float]) -> Tuple:
+    """
+    Returns the second derivative of the logarithm of x in the given base.
+
+    """
+    return ((-1 / (x.value**2 * np.log(base)),),)
+
+
+def _log_taylor_rule(x: Node, base: Union[int, float]) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of the logarithm of x in the given base.
+
+    """
+    _check_log_domain_restrictions(x)
 
-    return new_node
+    a = x.coefficients
+    return _taylor_integral_of_quotient(a, a, np.log(a[0])) / np.log(base)
 
 
 def log(x: Union[int, float, Node], base: Union[int, float, Node] = np.e) -> Node:
@@ -266,9 +427,9 @@ def log(x: Union[int, float, Node], base: Union[int, float, Node] = np.e) -> Nod
 
     Examples
     --------
-    >>> log(Node("1",1,0), 10)
+    >>> log(Node("1",1,1), 10)
     Node("log10(1)", 0, 0.4343)
-    >>> log(Node("1",1,0), 2)
+    >>> log(Node("1",1,1), 2)
     Node("log2(1)", 0, 1.4427)
     >>> log(Node("0",0,0))
     ValueError: Value 0 not valid for a logarithmic function
@@ -279,19 +440,33 @@ def log(x: Union[int, float, Node], base: Union[int, float, Node] = np.e) -> Nod
     if not base > 1:
         raise ValueError("Base must be greater than 1")
 
-    symbolic_representation = f"log{str(base)}({str(x)})"
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("log", x, parameters=(base,))
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    _check_log_domain_restrictions(x)
+def _exp_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of exp(x).
+
+    """
+    forward_trace = np.exp(x.value)
+    tangent_trace = x.derivative * _align_with_tangent(forward_trace)
+    return forward_trace, tangent_trace
+
+
+def _exp_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of exp(x).
+
+    """
+    return ((np.exp(x.value),),)
 
-    forward_trace = math.log(x.value, base)
-    tangent_trace = 1 / (x.value * np.log(base))
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
 
-    return new_node
+def _exp_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of exp(x).
+
+    """
+    return _taylor_exp(x.coefficients)
 
 
 def exp(x: Union[int, float, Node]) -> Node:
@@ -318,17 +493,33 @@ def exp(x: Union[int, float, Node]) -> Node:
     Node("exp(-1)", 0.3679, 0)
 
     """
-    symbolic_representation = "exp({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("exp", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    forward_trace = np.exp(x.value)
-    tangent_trace = x.derivative * forward_trace
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+def _sin_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of sin(x).
 
-    return new_node
+    """
+    forward_trace = np.sin(x.value)
+    tangent_trace = _align_with_tangent(np.cos(x.value)) * x.derivative
+    return forward_trace, tangent_trace
+
+
+def _sin_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of sin(x).
+
+    """
+    return ((-np.sin(x.value),),)
+
+
+def _sin_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of sin(x).
+
+    """
+    return _taylor_sin_cos(x.coefficients)[0]
 
 
 def sin(x: Union[int, float, Node]) -> Node:
@@ -355,17 +546,33 @@ def sin(x: Union[int, float, Node]) -> Node:
     Node("sin(-1)", -0.8415, 0)
 
     """
-    symbolic_representation = "sin({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("sin", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    forward_trace = np.sin(x.value)
-    tangent_trace = np.cos(x.value) * x.derivative
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+def _cos_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of cos(x).
 
-    return new_node
+    """
+    forward_trace = np.cos(x.value)
+    tangent_trace = _align_with_tangent(-np.sin(x.value)) * x.derivative
+    return forward_trace, tangent_trace
+
+
+def _cos_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of cos(x).
+
+    """
+    return ((-np.cos(x.value),),)
+
+
+def _cos_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of cos(x).
+
+    """
+    return _taylor_sin_cos(x.coefficients)[1]
 
 
 def cos(x: Union[int, float, Node]) -> Node:
@@ -392,17 +599,37 @@ def cos(x: Union[int, float, Node]) -> Node:
     Node("cos(-1)", -0.5403, 0)
 
     """
-    symbolic_representation = "cos({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("cos", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    forward_trace = np.cos(x.value)
-    tangent_trace = -np.sin(x.value) * x.derivative
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+def _tan_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of tan(x).
+
+    """
+    _check_tan_domain_restrictions(x)
+
+    forward_trace = np.tan(x.value)
+    tangent_trace = x.derivative / _align_with_tangent(np.cos(x.value) ** 2)
+    return forward_trace, tangent_trace
+
 
-    return new_node
+def _tan_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of tan(x).
+
+    """
+    return ((2 * np.tan(x.value) / np.cos(x.value) ** 2,),)
+
+
+def _tan_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of tan(x).
+
+    """
+    _check_tan_domain_restrictions(x)
+
+    return _taylor_tan(x.coefficients)
 
 
 def tan(x: Union[int, float, Node]) -> Node:
@@ -429,19 +656,39 @@ def tan(x: Union[int, float, Node]) -> Node:
     Node("tan(-1)", -1.557, 0)
 
     """
-    symbolic_representation = "tan({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("tan", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    _check_tan_domain_restrictions(x)
+def _arcsin_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of arcsin(x).
 
-    forward_trace = np.tan(x.value)
-    tangent_trace = x.derivative / (np.cos(x.value) ** 2)
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+    """
+    _check_arcsin_domain_restrictions(x)
+
+    forward_trace = np.arcsin(x.value)
+    tangent_trace = x.derivative / _align_with_tangent(np.sqrt(1 - x.value ** 2))
+    return forward_trace, tangent_trace
 
-    return new_node
+
+def _arcsin_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of arcsin(x).
+
+    """
+    return ((x.value / (1 - x.value**2) ** 1.5,),)
+
+
+def _arcsin_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of arcsin(x).
+
+    """
+    _check_arcsin_domain_restrictions(x)
+
+    a = x.coefficients
+    q = _taylor_sqrt(_taylor_constant(1, len(a)) - _taylor_product(a, a))
+    return _taylor_integral_of_quotient(a, q, np.arcsin(a[0]))
 
 
 def arcsin(x: Union[int, float, Node]) -> Node:
@@ -468,19 +715,39 @@ def arcsin(x: Union[int, float, Node]) -> Node:
     Node("arcsin(-1)", -1.5708, 0)
 
     """
-    symbolic_representation = "arcsin({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("arcsin", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    _check_arcsin_domain_restrictions(x)
+def _arccos_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of arccos(x).
 
-    forward_trace = np.arcsin(x.value)
-    tangent_trace = x.derivative / np.sqrt(1 - x.value ** 2)
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+    """
+    _check_arccos_domain_restrictions(x)
 
-    return new_node
+    forward_trace = np.arccos(x.value)
+    tangent_trace = -x.derivative / _align_with_tangent(np.sqrt(1 - x.value ** 2))
+    return forward_trace, tangent_trace
+
+
+def _arccos_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of arccos(x).
+
+    """
+    return ((-x.value / (1 - x.value**2) ** 1.5,),)
+
+
+def _arccos_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of arccos(x).
+
+    """
+    _check_arccos_domain_restrictions(x)
+
+    a = x.coefficients
+    q = _taylor_sqrt(_taylor_constant(1, len(a)) - _taylor_product(a, a))
+    return _taylor_integral_of_quotient(-a, q, np.arccos(a[0]))
 
 
 def arccos(x: Union[int, float, Node]) -> Node:
@@ -507,19 +774,35 @@ def arccos(x: Union[int, float, Node]) -> Node:
     Node("arccos(-1)", -3.1416, 0)
 
     """
-    symbolic_representation = "arccos({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("arccos", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    _check_arccos_domain_restrictions(x)
+def _arctan_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of arctan(x).
 
-    forward_trace = np.arccos(x.value)
-    tangent_trace = -x.derivative / np.sqrt(1 - x.value ** 2)
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+    """
+    forward_trace = np.arctan(x.value)
+    tangent_trace = x.derivative / _align_with_tangent(1 + x.value ** 2)
+    return forward_trace, tangent_trace
 
-    return new_node
+
+def _arctan_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of arctan(x).
+
+    """
+    return ((-2 * x.value / (1 + x.value**2) ** 2,),)
+
+
+def _arctan_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of arctan(x).
+
+    """
+    a = x.coefficients
+    q = _taylor_constant(1, len(a)) + _taylor_product(a, a)
+    return _taylor_integral_of_quotient(a, q, np.arctan(a[0]))
 
 
 def arctan(x: Union[int, float, Node]) -> Node:
@@ -546,21 +829,7 @@ def arctan(x: Union[int, float, Node]) -> Node:
     Node("arctan(-1)", -0.7854, 0)
 
     """
-    symbolic_representation = "arctan({})".format(str(x))
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
-
-    x = Node._convert_numeric_type_to_node(x)
-
-    forward_trace = np.arctan(x.value)
-    tangent_trace = x.derivative / (1 + x.value ** 2)
-    new_node = Node(
-        symbolic_representation,
-        forward_trace,
-        tangent_trace,
-    )
-
-    return new_node
+    return _apply_elementary("arctan", x)
 
 
 def power(base: Union[int, float, Node], exponent: Union[int, float, Node]) -> Node:
@@ -584,15 +853,40 @@ def power(base: Union[int, float, Node], exponent: Union[int, float, Node]) -> N
     Node("3**2", 9, 0)
 
     """
-    symbolic_representation = f"({base}**{exponent})"
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
-
-    base = Node._convert_numeric_type_to_node(base)
+    if isinstance(exponent, Taylor) and not isinstance(base, Taylor):
+        base = exponent._lift(base)
+    elif not isinstance(base, (Dual, Taylor)):
+        base = Dual(base) if isinstance(exponent, Dual) else Node._convert_numeric_type_to_node(base)
 
     return base ** exponent
 
 
+def _sinh_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of sinh(x).
+
+    """
+    forward_trace = np.sinh(x.value)
+    tangent_trace = _align_with_tangent(np.cosh(x.value)) * x.derivative
+    return forward_trace, tangent_trace
+
+
+def _sinh_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of sinh(x).
+
+    """
+    return ((np.sinh(x.value),),)
+
+
+def _sinh_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of sinh(x).
+
+    """
+    return _taylor_sin_cos(x.coefficients, hyperbolic=True)[0]
+
+
 def sinh(x: Union[int, float, Node]) -> Node:
     """
     Takes in an instance of the Node class and returns a new node with its symbolic
@@ -614,17 +908,33 @@ def sinh(x: Union[int, float, Node]) -> Node:
     Node("sinh(1)", 1.1752011936438014, 0)
 
     """
-    symbolic_representation = f"sinh({x})"
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("sinh", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    forward_trace = np.sinh(x.value)
-    tangent_trace = np.cosh(x.value) * x.derivative
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+def _cosh_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of cosh(x).
 
-    return new_node
+    """
+    forward_trace = np.cosh(x.value)
+    tangent_trace = _align_with_tangent(np.sinh(x.value)) * x.derivative
+    return forward_trace, tangent_trace
+
+
+def _cosh_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of cosh(x).
+
+    """
+    return ((np.cosh(x.value),),)
+
+
+def _cosh_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of cosh(x).
+
+    """
+    return _taylor_sin_cos(x.coefficients, hyperbolic=True)[1]
 
 
 def cosh(x: Union[int, float, Node]) -> Node:
@@ -647,17 +957,33 @@ def cosh(x: Union[int, float, Node]) -> Node:
     Node("cosh(1)", 1.5430806348152437, 0)
 
     """
-    symbolic_representation = f"cosh({x})"
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("cosh", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    forward_trace = np.cosh(x.value)
-    tangent_trace = np.sinh(x.value) * x.derivative
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+def _tanh_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of tanh(x).
 
-    return new_node
+    """
+    forward_trace = np.tanh(x.value)
+    tangent_trace = _align_with_tangent(1 - np.tanh(x.value) ** 2) * x.derivative
+    return forward_trace, tangent_trace
+
+
+def _tanh_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of tanh(x).
+
+    """
+    return ((-2 * np.tanh(x.value) * (1 - np.tanh(x.value) ** 2),),)
+
+
+def _tanh_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of tanh(x).
+
+    """
+    return _taylor_tan(x.coefficients, hyperbolic=True)
 
 
 def tanh(x: Union[int, float, Node]) -> Node:
@@ -681,17 +1007,42 @@ def tanh(x: Union[int, float, Node]) -> Node:
     Node("tanh(1)", 0.76159415595, 0)
 
     """
-    symbolic_representation = f"tanh({x})"
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
+    return _apply_elementary("tanh", x)
 
-    x = Node._convert_numeric_type_to_node(x)
 
-    forward_trace = np.tanh(x.value)
-    tangent_trace = (1 - np.tanh(x.value) ** 2) * x.derivative
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
+def _logistic_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of logistic(x).
 
-    return new_node
+    """
+    forward_trace = np.exp(-np.logaddexp(0, -x.value))
+    tangent_trace = (
+            _align_with_tangent(np.exp(-np.logaddexp(0, -x.value)))
+            * _align_with_tangent(1 - np.exp(-np.logaddexp(0, -x.value)))
+            * x.derivative
+    )
+    return forward_trace, tangent_trace
+
+
+def _logistic_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second derivative of logistic(x).
+
+    """
+    sigmoid = np.exp(-np.logaddexp(0, -x.value))
+    return ((sigmoid * (1 - sigmoid) * (1 - 2 * sigmoid),),)
+
+
+def _logistic_taylor_rule(x: Node) -> np.ndarray:
+    """
+    Returns the Taylor coefficients of logistic(x).
+
+    """
+    a = x.coefficients
+    coefficients = _taylor_quotient(_taylor_constant(1, len(a)), _taylor_constant(1, len(a)) + _taylor_exp(-a))
+    # the value is computed as in the forward rule, which does not overflow for large negative values
+    coefficients[0] = np.exp(-np.logaddexp(0, -a[0]))
+    return coefficients
 
 
 def logistic(x: Union[int, float, Node]) -> Node:
@@ -714,18 +1065,63 @@ def logistic(x: Union[int, float, Node]) -> Node:
     Node("logistic(1)", 1.1752011936438014, 0)
 
     """
-    symbolic_representation = f"logistic({x})"
-    if Node._check_node_exists(symbolic_representation):
-        return Node._get_existing_node(symbolic_representation)
-
-    x = Node._convert_numeric_type_to_node(x)
-
-    forward_trace = np.exp(-np.logaddexp(0, -x.value))
-    tangent_trace = (
-            (np.exp(-np.logaddexp(0, -x.value)))
-            * (1 - np.exp(-np.logaddexp(0, -x.value)))
-            * x.derivative
-    )
-    new_node = Node(symbolic_representation, forward_trace, tangent_trace)
-
-    return new_node
+    return _apply_elementary("logistic", x)
+
+
+# register the forward rules so that nodes computed by these functions can be recomputed from their operands
+Node._FORWARD_RULES.update(
+    {
+        "sqrt": _sqrt_forward_rule,
+        "ln": _ln_forward_rule,
+        "log": _log_forward_rule,
+        "exp": _exp_forward_rule,
+        "sin": _sin_forward_rule,
+        "cos": _cos_forward_rule,
+        "tan": _tan_forward_rule,
+        "arcsin": _arcsin_forward_rule,
+        "arccos": _arccos_forward_rule,
+        "arctan": _arctan_forward_rule,
+        "sinh": _sinh_forward_rule,
+        "cosh": _cosh_forward_rule,
+        "tanh": _tanh_forward_rule,
+        "logistic": _logistic_forward_rule,
+    }
+)
+
+Node._SECOND_DERIVATIVE_RULES.update(
+    {
+        "sqrt": _sqrt_second_derivative_rule,
+        "ln": _ln_second_derivative_rule,
+        "log": _log_second_derivative_rule,
+        "exp": _exp_second_derivative_rule,
+        "sin": _sin_second_derivative_rule,
+        "cos": _cos_second_derivative_rule,
+        "tan": _tan_second_derivative_rule,
+        "arcsin": _arcsin_second_derivative_rule,
+        "arccos": _arccos_second_derivative_rule,
+        "arctan": _arctan_second_derivative_rule,
+        "sinh": _sinh_second_derivative_rule,
+        "cosh": _cosh_second_derivative_rule,
+        "tanh": _tanh_second_derivative_rule,
+        "logistic": _logistic_second_derivative_rule,
+    }
+)
+
+Node._TAYLOR_RULES.update(
+    {
+        "sqrt": _sqrt_taylor_rule,
+        "ln": _ln_taylor_rule,
+        "log": _log_taylor_rule,
+        "exp": _exp_taylor_rule,
+        "sin": _sin_taylor_rule,
+        "cos": _cos_taylor_rule,
+        "tan": _tan_taylor_rule,
+        "arcsin": _arcsin_taylor_rule,
+        "arccos": _arccos_taylor_rule,
+        "arctan": _arctan_taylor_rule,
+        "sinh": _sinh_taylor_rule,
+        "cosh": _cosh_taylor_rule,
+        "tanh": _tanh_taylor_rule,
+        "logistic": _logistic_taylor_rule,
+    }
+)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+from typing import Callable, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from autodiff_team29.dual import Dual
+from autodiff_team29.node import Node
+from autodiff_team29.vector_function import VectorFunction
+
+
+class _ImplicitProblem:
+    def __init__(
+        self,
+        residual: Callable,
+        initial_guess: Sequence[float],
+        scalar_solution: bool,
+        scalar_parameters: bool,
+        tolerance: float,
+        max_iterations: int,
+    ) -> None:
+        """
+        Root finding problem g(x, theta) = 0 shared by the nodes of its solution. The solution and its
+        sensitivity to the parameters are cached for the last parameter values, so that the nodes of every
+        component, their partials and their recomputation after an update solve the problem once per point.
+
+        Parameters
+        ----------
+        residual : Callable
+            function g(x, theta) built from operators and elementaries, see implicit_solve.
+        initial_guess : Sequence[float]
+            starting point of the first solve. Later solves start from the previous solution.
+        scalar_solution : bool
+            whether g receives x as a single number instead of a list.
+        scalar_parameters : bool
+            whether g receives theta as a single number instead of a list.
+        tolerance : float
+            largest absolute residual accepted as a root.
+        max_iterations : int
+            maximum number of Newton iterations of a solve.
+
+        """
+        self._residual = residual
+        self._guess = np.array(initial_guess, dtype=float)
+        self._scalar_solution = scalar_solution
+        self._scalar_parameters = scalar_parameters
+        self._tolerance = tolerance
+        self._max_iterations = max_iterations
+        self._cached_parameters = None
+        self._cached_solution = None
+        self._cached_second_sensitivity = None
+
+    def _evaluate(self, solution: List, parameters: List) -> List:
+        """
+        Evaluates the residual on the given solution and parameters, as numbers or lists like the user provided them.
+
+        """
+        output = self._residual(
+            solution[0] if self._scalar_solution else solution,
+            parameters[0] if self._scalar_parameters else parameters,
+        )
+        return [output] if not isinstance(output, (list, tuple)) else list(output)
+
+    def _newton(self, parameters: Tuple[float, ...]) -> NDArray[float]:
+        """
+        Finds a root of the residual with Newton's method. The residual and its Jacobian with respect to x are
+        evaluated with dual numbers, so iterations only compute floats and build no graph.
+
+        """
+        n_unknowns = len(self._guess)
+        seeds = np.eye(n_unknowns)
+        constants = [Dual(parameter) for parameter in parameters]
+
+        solution = self._guess.copy()
+        for _ in range(self._max_iterations):
+            # outputs that do not depend on x are numbers, constants with a zero derivative
+            outputs = [
+                output if isinstance(output, Dual) else Dual(output)
+                for output in self._evaluate(
+                    [Dual(value, seed) for value, seed in zip(solution, seeds)], constants
+                )
+            ]
+            residual = np.array([output.value for output in outputs], dtype=float)
+            if np.max(np.abs(residual)) <= self._tolerance:
+                return solution
+
+            jacobian = np.array(
+                [np.broadcast_to(output.derivative, (n_unknowns,)) for output in outputs],
+                dtype=float,
+            )
+            solution = solution - np.linalg.solve(jacobian, residual)
+
+        raise ValueError(
+            f"Implicit solve did not converge to a residual below {self._tolerance} in {self._max_iterations} iterations"
+        )
+
+    def _sensitivity(self, solution: NDArray[float], parameters: Tuple[float, ...]) -> NDArray[float]:
+        """
+        Returns the derivatives of the solution with respect to the parameters from the implicit function theorem,
+        dx/dtheta = -(dg/dx)^-1 dg/dtheta. The Jacobian of g is computed once at the solution with a vector function,
+        in a scope of its own so that the nodes it creates do not enter the active registry.
+
+        """
+        n_unknowns = len(solution)
+        names = [f"_implicit_x_{index}" for index in range(n_unknowns)] + [
+            f"_implicit_theta_{index}" for index in range(len(parameters))
+        ]
+        with Node.registry_scope():
+            inputs = Node.variables(names, list(solution) + list(parameters))
+            jacobian = VectorFunction(
+                self._evaluate(inputs[:n_unknowns], inputs[n_unknowns:])
+            ).jacobian
+
+        return -np.linalg.solve(jacobian[:, :n_unknowns], jacobian[:, n_unknowns:])
+
+    def solve(self, parameters: Tuple[float, ...]) -> Tuple[NDArray[float], NDArray[float]]:
+        """
+        Returns the solution at the given parameters and its sensitivity, of shape (n_unknowns, n_parameters).
+
+        """
+        if parameters != self._cached_parameters:
+            solution = self._newton(parameters)
+            self._cached_solution = (solution, self._sensitivity(solution, parameters))
+            self._cached_second_sensitivity = None
+            self._cached_parameters = parameters
+            self._guess = solution
+
+        return self._cached_solution
+
+    def second_sensitivity(self, parameters: Tuple[float, ...]) -> NDArray[float]:
+        """
+        Returns the second derivatives of the solution with respect to the parameters, of shape
+        (n_unknowns, n_parameters, n_parameters). Differentiating g(x(theta), theta) = 0 twice gives
+        dg/dx d2x/dtheta_i dtheta_j = -D2g(w_i, w_j), where w_i = (dx/dtheta_i, e_i) is the direction of (x, theta)
+        along theta_i and D2g the Hessians of g. They are only computed when Hessians are requested,
+        and cached like the solution.
+
+        """
+        solution, sensitivity = self.solve(parameters)
+        if self._cached_second_sensitivity is None:
+            n_unknowns, n_parameters = sensitivity.shape
+            names = [f"_implicit_x_{index}" for index in range(n_unknowns)] + [
+                f"_implicit_theta_{index}" for index in range(n_parameters)
+            ]
+            with Node.registry_scope():
+                inputs = Node.variables(names, list(solution) + list(parameters))
+                outputs = self._evaluate(inputs[:n_unknowns], inputs[n_unknowns:])
+                jacobian = VectorFunction(outputs).jacobian
+                hessians = np.array(
+                    [
+                        Node._hessians([output])[0]
+                        if isinstance(output, Node)
+                        else np.zeros((len(inputs), len(inputs)))
+                        for output in outputs
+                    ]
+                )
+
+            directions = np.vstack([sensitivity, np.identity(n_parameters)])
+            curvature = np.einsum("kab,ai,bj->kij", hessians, directions, directions)
+            self._cached_second_sensitivity = -np.linalg.solve(
+                jacobian[:, :n_unknowns], curvature.reshape(n_unknowns, -1)
+            ).reshape(n_unknowns, n_parameters, n_parameters)
+
+        return self._cached_second_sensitivity
+
+    def __str__(self) -> str:
+        return "[{}]".format(getattr(self._residual, "__name__", "g"))
+
+
+def _implicit_forward_rule(*operands_and_parameters) -> Tuple:
+    """
+    Forward rule of a component of the solution of an implicit problem. The operands are the parameters theta,
+    followed by the problem and the index of the component. The tangent of the solution is its sensitivity
+    applied to the tangents of the parameters.
+
+    """
+    *operands, problem, index = operands_and_parameters
+    solution, sensitivity = problem.solve(tuple(operand.value for operand in operands))
+    tangent = sum(
+        partial * operand.derivative
+        for partial, operand in zip(sensitivity[index], operands)
+    )
+    return solution[index], tangent
+
+
+def _implicit_second_derivative_rule(*operands_and_parameters) -> Tuple:
+    """
+    Returns the second partial derivatives of a component of the solution of an implicit problem
+    with respect to the parameters.
+
+    """
+    *operands, problem, index = operands_and_parameters
+    second_sensitivity = problem.second_sensitivity(tuple(operand.value for operand in operands))
+    return tuple(tuple(row) for row in second_sensitivity[index])
+
+
+Node._FORWARD_RULES.update({"implicit": _implicit_forward_rule})
+Node._SECOND_DERIVATIVE_RULES.update({"implicit": _implicit_second_derivative_rule})
+
+
+def implicit_solve(
+    g: Callable,
+    theta: Union[Node, List[Node]],
+    x0: Union[int, float, Sequence[float]],
+    tolerance: float = 1e-10,
+    max_iterations: int = 50,
+) -> Union[Node, List[Node]]:
+    """
+    Solves g(x, theta) = 0 for x and returns the solution as nodes that depend on the parameters theta.
+    The root is found with Newton's method on plain floats, without building a graph of the iterations.
+    Derivatives are attached with the implicit function theorem, from the Jacobian of g at the root,
+    so the cost of differentiating the solution does not depend on the number of iterations.
+    Fixed points x = f(x, theta) are the roots of g(x, theta) = f(x, theta) - x.
+
+    Parameters
+    ----------
+    g : Callable
+        residual g(x, theta) built from operators and elementaries. It receives x as a number if x0 is a number,
+        otherwise as a list, theta likewise, and returns as many outputs as there are unknowns.
+    theta : Union[Node, List[Node]]
+        parameters the solution depends on.
+    x0 : Union[int, float, Sequence[float]]
+        initial guess of the solution.
+    tolerance : float, default=1e-10
+        largest absolute residual accepted as a root.
+    max_iterations : int, default=50
+        maximum number of Newton iterations.
+
+    Returns
+    -------
+    Union[Node, List[Node]] :
+        solution, a node if x0 is a number, otherwise a list of nodes. Updating the parameters solves the problem
+        again, starting from the previous solution.
+
+    Raises
+    ------
+    ValueError :
+        Raise value error if a parameter is not a node, or Newton's method does not converge
+
+    Example
+    -------
+    Square root of theta as the root of x * x - theta, whose derivative is 1 / (2 * sqrt(theta))
+    >>> theta = Node("theta", 4.0, 1)
+    >>> x = implicit_solve(lambda x, theta: x * x - theta, theta, 1.0)
+    >>> x.value, x.derivative
+    (2.000000000000002, 0.24999999999999972)
+
+    """
+    scalar_parameters = not isinstance(theta, (list, tuple))
+    parameters = [theta] if scalar_parameters else list(theta)
+    if not all(isinstance(parameter, Node) for parameter in parameters):
+        raise ValueError("Parameters of an implicit solve must be Nodes")
+
+    scalar_solution = isinstance(x0, Node._COMPATIBLE_VALUE_TYPES)
+    problem = _ImplicitProblem(
+        g,
+        [x0] if scalar_solution else list(x0),
+        scalar_solution,
+        scalar_parameters,
+        tolerance,
+        max_iterations,
+    )
+
+    # solve before creating any node, so that a failure leaves the registry untouched
+    problem.solve(tuple(parameter.value for parameter in parameters))
+    solution = [
+        Node._apply_operation("implicit", tuple(parameters), parameters=(problem, index))
+        for index in range(len(problem._guess))
+    ]
+    return solution[0] if scalar_solution else solution
@@ -0,0 +1,501 @@
+from __future__ import annotations
+from math import ceil, comb, sqrt
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from autodiff_team29.node import Node
+from autodiff_team29.tape import Tape, trace
+
+
+class Loop:
+    def __init__(
+        self,
+        body: Callable,
+        n_carry: int,
+        point: Sequence[Union[int, float]] = None,
+        scalar_carry: bool = False,
+    ) -> None:
+        """
+        Loop whose body is traced once as a tape and then iterated on compact state. Every step replays the tape
+        on the carried values, so iterating creates no node, no registry entry and no symbol.
+        Forward mode carries the tangents of the state along, in two buffers that are swapped between steps,
+        so memory does not grow with the number of steps. Reverse mode stores the state at checkpoints
+        and recomputes the steps between two checkpoints when sweeping back.
+
+        Parameters
+        ----------
+        body : Callable
+            function body(carry, x) built from operators and elementaries, returning the next carry.
+            It receives the carry as a list of nodes, or as a node if scalar_carry is set, and the input x of the step as a node.
+        n_carry : int
+            number of values carried from one step to the next.
+        point : Sequence[Union[int, float]], optional
+            carry followed by the input of a step the body is traced at. Python control flow is recorded
+            as it was taken at this point, see trace.
+        scalar_carry : bool, default=False
+            whether body receives and returns a single node instead of a list.
+
+        Example
+        -------
+        Explicit Euler steps of dy/dt = -t y
+        >>> loop = Loop(lambda y, t: y - 0.01 * t * y, 1, scalar_carry=True)
+        >>> values, tangents = loop.forward([1.0], np.arange(0, 1, 0.01))
+
+        """
+        if point is None:
+            point = [0.5] * (n_carry + 1)
+
+        def step(*inputs: Node) -> List[Node]:
+            carry = inputs[0] if scalar_carry else list(inputs[:-1])
+            outputs = body(carry, inputs[-1])
+            return [outputs] if scalar_carry else list(outputs)
+
+        self._tape = trace(step, n_carry + 1, point)
+        if len(self._tape._output_slots) != n_carry:
+            raise ValueError(
+                f"Loop body must return {n_carry} values, got {len(self._tape._output_slots)}"
+            )
+
+        self._n_carry = n_carry
+        self._body_name = getattr(body, "__name__", "body")
+        self._statistics = {"steps": 0, "recomputed_steps": 0, "stored_carries": 0}
+
+    @property
+    def tape(self) -> Tape:
+        """
+        Returns the tape the body was traced to
+
+        """
+        return self._tape
+
+    def _step(self, carry: Sequence[float], x: float) -> List[float]:
+        """
+        Returns the carry after one step, without tangents.
+
+        """
+        slots = self._tape._replay_values(list(carry) + [x])
+        return [slots[slot] for slot in self._tape._output_slots]
+
+    def run(self, carry: Sequence[Union[int, float]], xs: Sequence[Union[int, float]]) -> NDArray[float]:
+        """
+        Iterates the body over the inputs xs, without tangents.
+
+        Parameters
+        ----------
+        carry : Sequence[Union[int, float]]
+            initial carry.
+        xs : Sequence[Union[int, float]]
+            input of every step.
+
+        Returns
+        -------
+        NDArray[float] :
+            final carry.
+
+        """
+        carry = list(carry)
+        for x in xs:
+            carry = self._step(carry, x)
+
+        return np.array(carry, dtype=float)
+
+    def forward(
+        self,
+        carry: Sequence[Union[int, float]],
+        xs: Sequence[Union[int, float]],
+        seed_vectors: NDArray = None,
+    ) -> Tuple[NDArray[float], NDArray[float]]:
+        """
+        Iterates the body over the inputs xs and propagates the tangents of the carry in forward mode.
+        Each step evaluates the tape in place into the buffer the previous step did not write to,
+        so memory is independent of the number of steps.
+
+        Parameters
+        ----------
+        carry : Sequence[Union[int, float]]
+            initial carry.
+        xs : Sequence[Union[int, float]]
+            input of every step.
+        seed_vectors : NDArray, optional
+            array of shape (n_carry, n_directions) holding the tangent of the initial carry.
+            Defaults to the identity, which differentiates with respect to the initial carry.
+
+        Returns
+        -------
+        Tuple[NDArray[float], NDArray[float]] :
+            final carry and its Jacobian, of shape (n_carry, n_directions).
+
+        """
+        dtype = Node._active_dtype()
+        if seed_vectors is None:
+            seed_vectors = np.identity(self._n_carry, dtype=dtype)
+        seed_vectors = np.asarray(seed_vectors, dtype=dtype)
+
+        # the last row seeds the input of the step, which carries no tangent
+        buffers = np.zeros((2, self._n_carry + 1, seed_vectors.shape[1]), dtype=dtype)
+        buffers[0, : self._n_carry] = seed_vectors
+
+        values = np.array(carry, dtype=float)
+        for index, x in enumerate(xs):
+            current, following = buffers[index % 2], buffers[(index + 1) % 2]
+            values, _ = self._tape.evaluate(
+                *values, x, seed_vectors=current, out=following[: self._n_carry]
+            )
+
+        return values, buffers[len(xs) % 2, : self._n_carry].copy()
+
+    def vjp(
+        self,
+        carry: Sequence[Union[int, float]],
+        xs: Sequence[Union[int, float]],
+        cotangent: Sequence[float],
+        checkpoint_every: int = None,
+        checkpoints: int = None,
+    ) -> Tuple[NDArray[float], NDArray[float]]:
+        """
+        Iterates the body over the inputs xs and multiplies a cotangent of the final carry with the Jacobian
+        with respect to the initial carry in reverse mode, sweeping back through the steps with Tape.vjp.
+        Only some carries are stored, the others are recomputed from the closest stored carry when the sweep reaches them.
+
+        By default, the carry is stored every checkpoint_every steps, and the steps of one segment are recomputed at a time,
+        so at most n_steps / checkpoint_every + checkpoint_every carries are stored at the cost of a second forward sweep.
+        If a budget of checkpoints is given, carries are placed with the binomial schedule of revolve instead.
+        At most checkpoints carries are stored at any time, and every step is recomputed at most r times,
+        r being the smallest integer with comb(checkpoints + r, r) >= n_steps. The recomputation
+        thus grows slowly as the budget shrinks, 10 carries reverse 10,000 steps at about six times their cost.
+
+        Parameters
+        ----------
+        carry : Sequence[Union[int, float]]
+            initial carry.
+        xs : Sequence[Union[int, float]]
+            input of every step.
+        cotangent : Sequence[float]
+            weight of every value of the final carry.
+        checkpoint_every : int, optional
+            number of steps between two checkpoints. Defaults to the square root of the number of steps,
+            which minimizes the number of stored carries.
+        checkpoints : int, optional
+            maximum number of carries stored at once, including the initial carry. Overrides checkpoint_every.
+
+        Returns
+        -------
+        Tuple[NDArray[float], NDArray[float]] :
+            final carry and the product of the cotangent with its Jacobian, one entry per value of the carry.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if checkpoint_every or checkpoints is not positive
+
+        Example
+        -------
+        >>> loop = Loop(lambda carry, i: [carry[0] - 0.0001 * carry[0] * carry[0]], 1)
+        >>> loop.vjp([0.5], range(10_000), [1.0], checkpoints=10)
+        >>> loop.statistics()
+        {'steps': 10000, 'recomputed_steps': 60657, 'stored_carries': 10}
+
+        """
+        if checkpoints is not None:
+            if checkpoints < 1:
+                raise ValueError(f"Number of checkpoints must be positive, got {checkpoints}")
+            return self._binomial_vjp(list(carry), xs, cotangent, checkpoints)
+
+        n_steps = len(xs)
+        if checkpoint_every is None:
+            checkpoint_every = max(1, ceil(sqrt(n_steps)))
+        if checkpoint_every < 1:
+            raise ValueError(f"Steps between checkpoints must be positive, got {checkpoint_every}")
+
+        stored = []
+        values = list(carry)
+        for index, x in enumerate(xs):
+            if index % checkpoint_every == 0:
+                stored.append(values)
+            values = self._step(values, x)
+
+        recomputed_steps = n_steps
+        peak_stored = len(stored)
+        adjoint = np.array(cotangent, dtype=float)
+        for start in reversed(range(0, n_steps, checkpoint_every)):
+            stop = min(start + checkpoint_every, n_steps)
+            segment = [stored[start // checkpoint_every]]
+            for x in xs[start : stop - 1]:
+                segment.append(self._step(segment[-1], x))
+            recomputed_steps += len(segment) - 1
+            peak_stored = max(peak_stored, len(stored) + len(segment) - 1)
+
+            for step_carry, x in zip(reversed(segment), reversed(xs[start:stop])):
+                _, gradient = self._tape.vjp(*step_carry, x, cotangent=adjoint)
+                adjoint = gradient[: self._n_carry]
+            stored.pop()
+
+        self._statistics = {
+            "steps": n_steps,
+            "recomputed_steps": recomputed_steps,
+            "stored_carries": peak_stored,
+        }
+        return np.array(values, dtype=float), adjoint
+
+    def _binomial_vjp(
+        self, carry: List[float], xs: Sequence[Union[int, float]], cotangent: Sequence[float], checkpoints: int
+    ) -> Tuple[NDArray[float], NDArray[float]]:
+        """
+        Reverse sweep with the binomial checkpoint schedule of revolve, see vjp.
+        With s checkpoints, counting the stored carry at the start of a segment, and r recomputations of every step,
+        at most comb(s + r, s) steps can be reversed. A segment of n steps is split after comb(s + r - 1, s) steps,
+        r being the smallest with comb(s + r, s) >= n, so the part before the split can be reversed with s checkpoints
+        and one recomputation less, and the part after it with one checkpoint less. The carry at the split is stored
+        and the later part is reversed first. Segments are kept on a stack, so no recursion is involved.
+
+        """
+        n_steps = len(xs)
+        if n_steps == 0:
+            self._statistics = {"steps": 0, "recomputed_steps": 0, "stored_carries": 1}
+            return np.array(carry, dtype=float), np.array(cotangent, dtype=float)
+
+        stack = [(0, carry)]
+        end = n_steps
+        values = None
+        recomputed_steps = 0
+        peak_stored = 1
+        adjoint = np.array(cotangent, dtype=float)
+        while end > 0:
+            start, state = stack[-1]
+            free = checkpoints - len(stack)
+            if end - start > 1 and free > 0:
+                length = end - start
+                snapshots = free + 1
+                repetitions = 0
+                while comb(snapshots + repetitions, snapshots) < length:
+                    repetitions += 1
+
+                split = start + comb(snapshots + repetitions - 1, snapshots)
+                for x in xs[start:split]:
+                    state = self._step(state, x)
+                recomputed_steps += split - start
+                stack.append((split, state))
+                peak_stored = max(peak_stored, len(stack))
+                continue
+
+            # without free checkpoints the last step of the segment is reached from its start
+            for x in xs[start : end - 1]:
+                state = self._step(state, x)
+            recomputed_steps += end - 1 - start
+
+            step_values, gradient = self._tape.vjp(*state, xs[end - 1], cotangent=adjoint)
+            adjoint = gradient[: self._n_carry]
+            if values is None:
+                values = step_values
+
+            end -= 1
+            if end == start and start > 0:
+                stack.pop()
+
+        self._statistics = {
+            "steps": n_steps,
+            "recomputed_steps": recomputed_steps,
+            "stored_carries": peak_stored,
+        }
+        return np.array(values, dtype=float), adjoint
+
+    def _second_order(
+        self, carry: Sequence[float], xs: Sequence[Union[int, float]]
+    ) -> Tuple[NDArray[float], NDArray[float], NDArray[float]]:
+        """
+        Iterates the body over the inputs xs and propagates the Jacobian and second derivatives of the carry
+        with respect to the initial carry, replaying the tape forward over forward at every step.
+
+        Returns
+        -------
+        Tuple[NDArray[float], NDArray[float], NDArray[float]] :
+            final carry, its Jacobian and its second derivatives, entry [k, i, j] for value k of the final carry
+            with respect to values i and j of the initial carry.
+
+        """
+        values = list(carry)
+        tangents = list(np.identity(self._n_carry))
+        hessians = [None] * self._n_carry
+        for x in xs:
+            values, tangents, hessians = self._tape._replay_second_order(
+                values + [x], tangents + [None], hessians + [None]
+            )
+
+        hessians = [
+            np.zeros((self._n_carry, self._n_carry)) if hessian is None else hessian
+            for hessian in hessians
+        ]
+        return np.array(values, dtype=float), np.array(tangents), np.array(hessians)
+
+    def statistics(self) -> Dict[str, int]:
+        """
+        Summarizes the last reverse sweep.
+
+        Returns
+        -------
+        Dict[str, int] :
+            number of steps, number of steps computed without tangents before and during the sweep,
+            and largest number of carries stored at once.
+
+        """
+        return dict(self._statistics)
+
+    def __repr__(self) -> str:
+        return f"Loop(n_carry={self._n_carry}, instructions={len(self._tape)})"
+
+
+class _LoopRun:
+    def __init__(self, loop: Loop, xs: NDArray[float]) -> None:
+        """
+        Loop iterated over fixed inputs, shared by the nodes of its final carry. The final carry and its Jacobian
+        with respect to the initial carry are cached for the last initial carry, so that the nodes of every value,
+        their partials and their recomputation after an update iterate the loop once per point.
+
+        """
+        self._loop = loop
+        self._xs = xs
+        self._cached_carry = None
+        self._cached_result = None
+        self._cached_second_carry = None
+        self._cached_second_derivatives = None
+
+    def evaluate(self, carry: Tuple[float, ...]) -> Tuple[NDArray[float], NDArray[float]]:
+        """
+        Returns the final carry and its Jacobian with respect to the initial carry.
+
+        """
+        if carry != self._cached_carry:
+            self._cached_result = self._loop.forward(carry, self._xs)
+            self._cached_carry = carry
+
+        return self._cached_result
+
+    def second_derivatives(self, carry: Tuple[float, ...]) -> NDArray[float]:
+        """
+        Returns the second derivatives of the final carry with respect to the initial carry, see Loop._second_order.
+        They are only computed when Hessians are requested, and cached like the Jacobian.
+
+        """
+        if carry != self._cached_second_carry:
+            _, _, self._cached_second_derivatives = self._loop._second_order(carry, self._xs)
+            self._cached_second_carry = carry
+
+        return self._cached_second_derivatives
+
+    def __str__(self) -> str:
+        return "[{}]".format(self._loop._body_name)
+
+
+def _scan_forward_rule(*operands_and_parameters) -> Tuple:
+    """
+    Forward rule of a value of the final carry of a loop. The operands are the initial carry,
+    followed by the loop run and the index of the value. The tangent is the Jacobian of the loop
+    applied to the tangents of the initial carry.
+
+    """
+    *operands, run, index = operands_and_parameters
+    values, jacobian = run.evaluate(tuple(operand.value for operand in operands))
+    tangent = sum(
+        partial * operand.derivative
+        for partial, operand in zip(jacobian[index], operands)
+    )
+    return values[index], tangent
+
+
+def _scan_second_derivative_rule(*operands_and_parameters) -> Tuple:
+    """
+    Returns the second partial derivatives of a value of the final carry of a loop with respect to the initial carry.
+
+    """
+    *operands, run, index = operands_and_parameters
+    second_derivatives = run.second_derivatives(tuple(operand.value for operand in operands))
+    return tuple(tuple(row) for row in second_derivatives[index])
+
+
+Node._FORWARD_RULES.update({"scan": _scan_forward_rule})
+Node._SECOND_DERIVATIVE_RULES.update({"scan": _scan_second_derivative_rule})
+
+
+def scan(
+    body: Callable,
+    init: Union[Node, List[Node]],
+    xs: Sequence[Union[int, float]],
+) -> Union[Node, List[Node]]:
+    """
+    Iterates body(carry, x) over the inputs xs, starting from init, and returns the final carry as nodes.
+    The body is traced once, see Loop, so a loop of any length adds one node per value of the carry to the graph
+    instead of one per operation and step. The derivatives of the final carry with respect to the initial carry
+    are propagated in forward mode with constant memory. Use Loop.vjp for reverse mode with checkpoints.
+
+    Parameters
+    ----------
+    body : Callable
+        function body(carry, x) built from operators and elementaries, returning the next carry. The carry is a node
+        if init is a node, otherwise a list of nodes. Python control flow is recorded as it was taken at the first step.
+        Values the body depends on, such as parameters, must be part of the carry.
+    init : Union[Node, List[Node]]
+        initial carry.
+    xs : Sequence[Union[int, float]]
+        input of every step, such as the time of a time step.
+
+    Returns
+    -------
+    Union[Node, List[Node]] :
+        final carry, of the structure of init.
+
+    Raises
+    ------
+    ValueError :
+        Raise value error if the carry does not consist of scalar nodes, or body does not return a carry of the structure
+        of init
+
+    Example
+    -------
+    Explicit Euler steps of dy/dt = -k y, with k carried along
+    >>> y, k = Node("y", 1.0, 1, seed_vector=[1, 0]), Node("k", 2.0, 1, seed_vector=[0, 1])
+    >>> y_end, _ = scan(lambda carry, t: [carry[0] - 0.001 * carry[1] * carry[0], carry[1]], [y, k], np.arange(1000))
+    >>> y_end.derivative
+    array([ 0.13506452, -0.13533519])
+
+    """
+    scalar_carry = isinstance(init, Node)
+    carry = [init] if scalar_carry else list(init)
+    if not all(isinstance(value, Node) for value in carry):
+        raise ValueError("Carry of a loop must consist of Nodes")
+    # loops replay the tape on scalar carries, and cache their results per initial carry
+    if any(value.is_batched for value in carry):
+        raise ValueError("Carry of a loop must consist of scalar Nodes, batched carries are not supported")
+
+    xs = np.asarray(xs, dtype=float)
+    if len(xs) == 0:
+        return init
+
+    loop = Loop(
+        body, len(carry), [value.value for value in carry] + [xs[0]], scalar_carry=scalar_carry
+    )
+    run = _LoopRun(loop, xs)
+    final_carry = [
+        Node._apply_operation("scan", tuple(carry), parameters=(run, index))
+        for index in range(len(carry))
+    ]
+    return final_carry[0] if scalar_carry else final_carry
+
+
+def fori_loop(
+    n_steps: int,
+    body: Callable,
+    init: Union[Node, List[Node]],
+) -> Union[Node, List[Node]]:
+    """
+    Applies body(i, carry) for i from 0 to n_steps - 1, starting from init, see scan.
+
+    Example
+    -------
+    >>> x = Node("x", 0.5, 1)
+    >>> fori_loop(10_000, lambda i, x: x - 0.0001 * x * x, x).derivative
+    0.44442502229662795
+
+    """
+    return scan(lambda carry, i: body(i, carry), init, np.arange(n_steps))
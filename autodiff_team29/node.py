@@ -1,19 +1,451 @@
 from __future__ import annotations
-from typing import Union
+from typing import Callable, Dict, Hashable, Iterator, List, NamedTuple, Sequence, Tuple, Union
+import contextlib
+import contextvars
+import itertools
+import threading
 import warnings
+import weakref
 
 import numpy as np
 from numpy.typing import NDArray
 
+from autodiff_team29.registry import NodeRegistry
+from autodiff_team29.tangent import SparseTangent
+
+# registry and overwrite mode of the enclosing Node.registry_scope. None falls back to the class level settings.
+# context variables are local to each thread and are copied into asyncio tasks when they are created
+_SCOPED_REGISTRY = contextvars.ContextVar("scoped_registry", default=None)
+_SCOPED_OVERWRITE_MODE = contextvars.ContextVar("scoped_overwrite_mode", default=None)
+
+# floating point type of the enclosing Node.dtype_scope. None falls back to the class level dtype
+_SCOPED_DTYPE = contextvars.ContextVar("scoped_dtype", default=None)
+
+
+def _align_with_tangent(partial: Union[float, int, NDArray]) -> Union[float, int, NDArray]:
+    """
+    Aligns a partial derivative with the tangent it scales. Batched values have shape (batch,)
+    while batched derivatives have shape (batch, n_seeds), so batched partials are turned into columns.
+    Scalar partials are returned unchanged.
+
+    """
+    if isinstance(partial, np.ndarray) and partial.ndim == 1:
+        return partial[:, np.newaxis]
+
+    # numpy scalars would promote float32 tangents to float64, python scalars keep the dtype of the tangent
+    if isinstance(partial, np.generic):
+        return partial.item()
+
+    return partial
+
+
+class _Trace(NamedTuple):
+    """
+    Primal and tangent trace of a slot on a tape or operand of a rule. Exposes the value and derivative attributes
+    the forward rules of Node read, without any of the bookkeeping of a Node.
+
+    """
+
+    value: Union[float, int, NDArray]
+    derivative: Union[float, int, NDArray]
+
+
+def _local_partials(node: Node) -> List:
+    """
+    Returns the partial derivatives of a node with respect to each of its operands.
+    The partials are obtained from the forward rule of the operation by seeding a unit tangent
+    on one operand at a time, so reverse mode and second order derivatives share the derivative rules of forward mode.
+
+    Parameters
+    ----------
+    node : Node
+        node computed from an operation.
+
+    Returns
+    -------
+    List :
+        partial derivative with respect to every operand, in operand order.
+
+    """
+    forward_rule = Node._FORWARD_RULES[node._operation]
+    values = [operand.value for operand in node._operands]
+
+    partials = []
+    for seeded_index in range(len(values)):
+        operands = [
+            _Trace(value, 1 if index == seeded_index else 0)
+            for index, value in enumerate(values)
+        ]
+        _, partial = forward_rule(*operands, *node._parameters)
+
+        # batched partials are returned as columns aligned with tangents, adjoints have the shape of the value
+        if isinstance(partial, np.ndarray) and partial.ndim > np.ndim(node.value):
+            partial = np.reshape(partial, np.shape(node.value))
+        partials.append(partial)
+
+    return partials
+
+
+def _add_forward_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of x + y.
+
+    """
+    primal_trace = x.value + y.value
+    tangent_trace = x.derivative + y.derivative
+    return primal_trace, tangent_trace
+
+
+def _sub_forward_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of x - y.
+
+    """
+    primal_trace = x.value - y.value
+    tangent_trace = x.derivative - y.derivative
+    return primal_trace, tangent_trace
+
+
+def _mul_forward_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of x * y.
+
+    """
+    primal_trace = x.value * y.value
+    tangent_trace = (
+        _align_with_tangent(x.value) * y.derivative
+        + _align_with_tangent(y.value) * x.derivative
+    )
+    return primal_trace, tangent_trace
+
+
+def _truediv_forward_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of x / y.
+
+    """
+    primal_trace = x.value / y.value
+    tangent_trace = (
+        x.derivative * _align_with_tangent(y.value)
+        - _align_with_tangent(x.value) * y.derivative
+    ) / _align_with_tangent(y.value**2)
+    return primal_trace, tangent_trace
+
+
+def _neg_forward_rule(x: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of -x.
+
+    """
+    primal_trace = -1 * x.value
+    tangent_trace = -1 * x.derivative
+    return primal_trace, tangent_trace
+
+
+def _pow_forward_rule(base: Node, exponent: Node) -> Tuple:
+    """
+    Returns the primal and tangent trace of base ** exponent.
+
+    """
+    primal_trace = base.value**exponent.value
+    tangent_trace = _align_with_tangent(primal_trace) * (
+        exponent.derivative * _align_with_tangent(np.log(base.value))
+        + (base.derivative * _align_with_tangent(exponent.value))
+        / _align_with_tangent(base.value)
+    )
+    return primal_trace, tangent_trace
+
+
+def _align_with_hessian(partial: Union[float, int, NDArray]) -> Union[float, int, NDArray]:
+    """
+    Aligns a partial derivative with the second order tangent it scales, of shape (n_seeds, n_seeds)
+    or (batch, n_seeds, n_seeds) for batched values. See _align_with_tangent.
+
+    """
+    if isinstance(partial, np.ndarray) and partial.ndim == 1:
+        return partial[:, np.newaxis, np.newaxis]
+
+    return _align_with_tangent(partial)
+
+
+def _add_second_derivative_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the second partial derivatives of x + y.
+
+    """
+    return ((0, 0), (0, 0))
+
+
+def _sub_second_derivative_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the second partial derivatives of x - y.
+
+    """
+    return ((0, 0), (0, 0))
+
+
+def _mul_second_derivative_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the second partial derivatives of x * y.
+
+    """
+    return ((0, 1), (1, 0))
+
+
+def _truediv_second_derivative_rule(x: Node, y: Node) -> Tuple:
+    """
+    Returns the second partial derivatives of x / y.
+
+    """
+    mixed = -1 / y.value**2
+    return ((0, mixed), (mixed, 2 * x.value / y.value**3))
+
+
+def _neg_second_derivative_rule(x: Node) -> Tuple:
+    """
+    Returns the second partial derivative of -x.
+
+    """
+    return ((0,),)
+
+
+def _pow_second_derivative_rule(base: Node, exponent: Node) -> Tuple:
+    """
+    Returns the second partial derivatives of base ** exponent.
+
+    """
+    a, b = base.value, exponent.value
+    mixed = a ** (b - 1) * (1 + b * np.log(a))
+    return ((b * (b - 1) * a ** (b - 2), mixed), (mixed, a**b * np.log(a) ** 2))
+
+
+def _taylor_product(a: NDArray, b: NDArray) -> NDArray:
+    """
+    Returns the Taylor coefficients of the product of two truncated series, by their Cauchy product.
+
+    """
+    return np.convolve(a, b)[: len(a)]
+
+
+def _taylor_quotient(a: NDArray, b: NDArray) -> NDArray:
+    """
+    Returns the Taylor coefficients of a / b, solving b * c = a for c one order at a time.
+
+    """
+    c = np.empty(len(a))
+    for k in range(len(a)):
+        c[k] = (a[k] - np.dot(b[1 : k + 1], c[:k][::-1])) / b[0]
+
+    return c
+
+
+def _taylor_exp(a: NDArray) -> NDArray:
+    """
+    Returns the Taylor coefficients of exp(a), from e' = a' e.
+
+    """
+    weighted = np.arange(len(a)) * a
+    e = np.empty(len(a))
+    e[0] = np.exp(a[0])
+    for k in range(1, len(a)):
+        e[k] = np.dot(weighted[1 : k + 1], e[:k][::-1]) / k
+
+    return e
+
+
+def _taylor_integral_of_quotient(a: NDArray, q: NDArray, f0: float) -> NDArray:
+    """
+    Returns the Taylor coefficients of the function f with f(0) = f0 and f' = a' / q,
+    the recurrence shared by logarithms and inverse trigonometric functions.
+
+    """
+    f = np.empty(len(a))
+    f[0] = f0
+    for k in range(1, len(a)):
+        f[k] = (k * a[k] - np.dot(np.arange(1, k) * f[1:k], q[1:k][::-1])) / (k * q[0])
+
+    return f
+
+
+def _add_taylor_rule(x: Node, y: Node) -> NDArray:
+    """
+    Returns the Taylor coefficients of x + y.
+
+    """
+    return x.coefficients + y.coefficients
+
+
+def _sub_taylor_rule(x: Node, y: Node) -> NDArray:
+    """
+    Returns the Taylor coefficients of x - y.
+
+    """
+    return x.coefficients - y.coefficients
+
+
+def _mul_taylor_rule(x: Node, y: Node) -> NDArray:
+    """
+    Returns the Taylor coefficients of x * y.
+
+    """
+    return _taylor_product(x.coefficients, y.coefficients)
+
+
+def _truediv_taylor_rule(x: Node, y: Node) -> NDArray:
+    """
+    Returns the Taylor coefficients of x / y.
+
+    """
+    return _taylor_quotient(x.coefficients, y.coefficients)
+
+
+def _neg_taylor_rule(x: Node) -> NDArray:
+    """
+    Returns the Taylor coefficients of -x.
+
+    """
+    return -x.coefficients
+
+
+def _pow_taylor_rule(base: Node, exponent: Node) -> NDArray:
+    """
+    Returns the Taylor coefficients of base ** exponent.
+
+    """
+    a = base.coefficients
+    if np.any(exponent.coefficients[1:]):
+        return _taylor_exp(
+            _taylor_product(exponent.coefficients, _taylor_integral_of_quotient(a, a, np.log(a[0])))
+        )
+
+    b = exponent.value
+    if float(b).is_integer() and b >= 0:
+        # repeated squaring also holds for bases whose value is zero
+        result = np.zeros(len(a))
+        result[0] = 1
+        power, remaining = a, int(b)
+        while remaining:
+            if remaining % 2:
+                result = _taylor_product(result, power)
+            power = _taylor_product(power, power)
+            remaining //= 2
+        return result
+
+    # from a p' = b a' p
+    p = np.empty(len(a))
+    p[0] = a[0] ** b
+    for k in range(1, len(a)):
+        j = np.arange(1, k + 1)
+        p[k] = np.dot(((b + 1) * j - k) * a[1 : k + 1], p[:k][::-1]) / (k * a[0])
+
+    return p
+
+
+def _add_tangent_kernel(out: NDArray, scratch: NDArray, x: Node, y: Node) -> Union[float, NDArray]:
+    """
+    Writes the tangent trace of x + y to out and returns the primal trace.
+
+    """
+    np.add(x.derivative, y.derivative, out=out)
+    return x.value + y.value
+
+
+def _sub_tangent_kernel(out: NDArray, scratch: NDArray, x: Node, y: Node) -> Union[float, NDArray]:
+    """
+    Writes the tangent trace of x - y to out and returns the primal trace.
+
+    """
+    np.subtract(x.derivative, y.derivative, out=out)
+    return x.value - y.value
+
+
+def _mul_tangent_kernel(out: NDArray, scratch: NDArray, x: Node, y: Node) -> Union[float, NDArray]:
+    """
+    Writes the tangent trace of x * y to out and returns the primal trace.
+
+    """
+    np.multiply(_align_with_tangent(x.value), y.derivative, out=out)
+    np.multiply(_align_with_tangent(y.value), x.derivative, out=scratch)
+    np.add(out, scratch, out=out)
+    return x.value * y.value
+
+
+def _neg_tangent_kernel(out: NDArray, scratch: NDArray, x: Node) -> Union[float, NDArray]:
+    """
+    Writes the tangent trace of -x to out and returns the primal trace.
+
+    """
+    np.negative(x.derivative, out=out)
+    return -1 * x.value
+
 
 class Node:
     # other types that are capable of being converted to Node
     _COMPATIBLE_VALUE_TYPES = (int, float)
-    _COMPATIBLE_DERIVATIVE_TYPES = (int, float, np.ndarray)
+    _COMPATIBLE_DERIVATIVE_TYPES = (int, float, np.ndarray, SparseTangent)
 
     # store nodes that have been computed previously
     _OVERWRITE_MODE = False
-    _NODE_REGISTRY = {}
+    _NODE_REGISTRY = NodeRegistry()
+    _REGISTRY_SCOPE_POLICIES = ("isolated", "layered", "disabled")
+
+    # floating point type of seed vectors, batched values and batched derivatives
+    _DTYPE = np.dtype(np.float64)
+    _SUPPORTED_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+    # every node receives a unique integer id. derived nodes are keyed on the operation
+    # and the ids of their operands, so keys stay small no matter how deep the graph is
+    _NODE_IDS = itertools.count()
+
+    # guards node ids and the benchmarking counter when graphs are built from several threads
+    _COUNTER_LOCK = threading.Lock()
+
+    # operations that are rendered infix when building the symbolic representation
+    _INFIX_OPERATIONS = ("+", "-", "*", "/", "**")
+    _COMMUTATIVE_OPERATIONS = ("+", "*")
+
+    # rules computing the primal and tangent trace of each operation from its operands and parameters.
+    # operands only need to expose value and derivative attributes. elementaries registers its own rules
+    _FORWARD_RULES: Dict[str, Callable[..., Tuple]] = {
+        "+": _add_forward_rule,
+        "-": _sub_forward_rule,
+        "*": _mul_forward_rule,
+        "/": _truediv_forward_rule,
+        "neg": _neg_forward_rule,
+        "**": _pow_forward_rule,
+    }
+
+    # rules returning the second partial derivatives of each operation, entry [i][j] with respect to operands i and j.
+    # called with the operands and parameters of the operation, like the forward rules. elementaries registers its own rules
+    _SECOND_DERIVATIVE_RULES: Dict[str, Callable[..., Tuple]] = {
+        "+": _add_second_derivative_rule,
+        "-": _sub_second_derivative_rule,
+        "*": _mul_second_derivative_rule,
+        "/": _truediv_second_derivative_rule,
+        "neg": _neg_second_derivative_rule,
+        "**": _pow_second_derivative_rule,
+    }
+
+    # rules returning the truncated Taylor coefficients of each operation from the coefficients of its operands,
+    # in O(order ** 2). operands only need to expose value and coefficients attributes. elementaries registers its own rules
+    _TAYLOR_RULES: Dict[str, Callable[..., NDArray]] = {
+        "+": _add_taylor_rule,
+        "-": _sub_taylor_rule,
+        "*": _mul_taylor_rule,
+        "/": _truediv_taylor_rule,
+        "neg": _neg_taylor_rule,
+        "**": _pow_taylor_rule,
+    }
+
+    # kernels writing the tangent trace of an operation into preallocated storage and returning the primal trace.
+    # called as kernel(out, scratch, *operands, *parameters), where scratch is a temporary of the shape of out.
+    # in-place evaluation linearizes the forward rule of operations without a kernel
+    _TANGENT_KERNELS: Dict[str, Callable[..., Union[float, NDArray]]] = {
+        "+": _add_tangent_kernel,
+        "-": _sub_tangent_kernel,
+        "*": _mul_tangent_kernel,
+        "neg": _neg_tangent_kernel,
+    }
 
     # only to be used for our benchmarking example
     # not to be used for any other purpose
@@ -28,6 +460,9 @@ class Node:
     ) -> Node:
         """
         Represents a node which is the foundation of a computational graph.
+        Creating a node with the symbol of an existing input node but a different value or derivative
+        rebinds the symbol: the new node replaces the previous one in the registry, and every node computed
+        from the previous one is removed. Nodes that do not depend on the symbol are kept.
 
         Parameters
         ----------
@@ -48,10 +483,12 @@ class Node:
 
         **kwargs
         ---------
-        seed_vector : List
+        seed_vector : List, SparseTangent
                 A seed vector for computing partial derivatives of multi-variable functions.
                 The seed vector allows us to cherry-pick a certain derivative of interest (choose direction).
                 For F:Rm --> Rn, our seed vector should be of length m with a 1 in the direction of interest and 0 elsewhere.
+        sparse : bool, default=False
+                Stores the seed vector as a SparseTangent, so that derivatives only propagate its nonzero entries.
 
         Examples
         --------
@@ -61,60 +498,794 @@ class Node:
         >>> Node('x+x',20,2)
 
         """
-        # check if node already exist before recreating
-        if cls._check_node_exists(symbol):
-            return cls._get_existing_node(symbol)
-
         # ensure that the values and derivatives specified are of the correct datatype
         # if they are not these methods will raise an exception
         cls._check_foreign_value_type_compatibility(value)
         cls._check_foreign_derivative_type_compatibility(derivative)
 
-        # creating an instance of the class
-        instance = super().__new__(cls)
-        instance._symbol = str(symbol)
-        instance._value = value
-
         # if kwargs are specified we are dealing with an n-dimensional function
         if "seed_vector" in kwargs:
-            seed_vector = np.array(kwargs["seed_vector"])
-            instance._derivative = derivative * seed_vector
+            derivative = cls._seed_derivative(
+                derivative, kwargs["seed_vector"], kwargs.get("sparse", False)
+            )
+
+        return cls._bind_input(str(symbol), value, derivative)
+
+    @classmethod
+    def variables(
+        cls,
+        names: Sequence[str],
+        values: Sequence[Union[int, float]],
+        derivative: Union[int, float] = 1,
+        sparse: bool = False,
+    ) -> List[Node]:
+        """
+        Creates the inputs of a multi-variable function in one call, input i being seeded with the i-th unit vector.
+        The seed vectors are rows of a single identity buffer shared by all inputs, or unit SparseTangents
+        if sparse is set, and types are validated once for all inputs.
+
+        Parameters
+        ----------
+        names : Sequence[str]
+                Symbols of the inputs.
+        values : Sequence[Union[int, float]]
+                Analytical values of the inputs.
+        derivative : int, float, default=1
+                Derivative shared by all inputs.
+        sparse : bool, default=False
+                Seeds the inputs with unit SparseTangents instead of rows of a dense identity.
+
+        Returns
+        -------
+        List[Node] :
+            input nodes, in the order of names.
+
+        Raises
+        ------
+        ValueError
+            Raises ValueError if names and values differ in length or names are not unique
+        TypeError
+            Raises TypeError if a value or the derivative is of an unsupported type
+
+        Examples
+        --------
+        >>> x, y = Node.variables(["x", "y"], [2, 3])
+        >>> (x * y).derivative
+        array([3., 2.])
+
+        """
+        names = [str(name) for name in names]
+        values = list(values)
+        if len(names) != len(values):
+            raise ValueError(f"Got {len(names)} names but {len(values)} values")
+        if len(set(names)) != len(names):
+            raise ValueError("Names of variables must be unique")
+
+        for value in values:
+            cls._check_foreign_value_type_compatibility(value)
+        cls._check_foreign_derivative_type_compatibility(derivative)
+
+        n_variables = len(names)
+        dtype = cls._active_dtype()
+        if sparse:
+            seed_vectors = [
+                SparseTangent(np.array([index]), np.full(1, derivative, dtype=dtype), n_variables)
+                for index in range(n_variables)
+            ]
         else:
-            instance._derivative = derivative
+            # rows of one buffer are views, so no seed vector is allocated per input
+            seed_vectors = np.identity(n_variables, dtype=dtype)
+            if derivative != 1:
+                seed_vectors *= derivative
+
+        return [
+            cls._bind_input(name, value, seed_vector)
+            for name, value, seed_vector in zip(names, values, seed_vectors)
+        ]
+
+    @staticmethod
+    def _seed_derivative(
+        derivative: Union[int, float],
+        seed_vector: Union[List, NDArray, SparseTangent],
+        sparse: bool = False,
+    ) -> Union[NDArray, SparseTangent]:
+        """
+        Multiplies the derivative of an input with its seed vector.
+
+        Parameters
+        ----------
+        derivative : int, float
+                Derivative with respect to the value attribute.
+        seed_vector : List, NDArray, SparseTangent
+                Seed vector of the input.
+        sparse : bool, default=False
+                Whether a dense seed vector is converted to a SparseTangent.
+
+        Returns
+        -------
+        Union[NDArray, SparseTangent] :
+            seeded derivative, sparse if the seed vector is sparse.
+
+        """
+        dtype = Node._active_dtype()
+        if not isinstance(seed_vector, SparseTangent):
+            seed_vector = np.array(seed_vector, dtype=dtype)
+            if sparse:
+                return SparseTangent.from_dense(derivative * seed_vector, dtype=dtype)
+
+            # multiplying in place keeps the dtype of the policy whatever the type of the derivative
+            seed_vector *= derivative
+            return seed_vector
+
+        return derivative * seed_vector
+
+    @classmethod
+    def batch(
+        cls,
+        symbol: str,
+        values: Union[List[float], NDArray],
+        derivative: Union[int, float, NDArray] = 1,
+        **kwargs,
+    ) -> Node:
+        """
+        Creates an input node holding a batch of points. Its value is a 1-D array of shape (batch,)
+        and its derivative an array of shape (batch, n_seeds). Every operation and elementary applied to
+        a batched node evaluates all points at once, and scalar nodes are broadcast against the batch.
+
+        Parameters
+        ----------
+        symbol : str
+                Symbolic representation of a Node instance that acts as a unique identifier.
+        values : List[float], NDArray
+                Points the node is evaluated at.
+        derivative : int, float, NDArray, default=1
+                Derivative with respect to the value attribute, either shared by all points or one per point.
+
+        **kwargs
+        ---------
+        seed_vector : List
+                A seed vector multiplied with the derivative of every point, see Node.
+
+        Returns
+        -------
+        Node :
+            batched input node.
+
+        Raises
+        ------
+        ValueError
+            Raises ValueError if values is not one dimensional or derivative does not match the batch
+
+        Examples
+        --------
+        >>> x = Node.batch("x", np.linspace(0, 1, 5), seed_vector=[1, 0])
+        >>> y = Node.batch("y", np.linspace(1, 2, 5), seed_vector=[0, 1])
+        >>> (x * y).derivative.shape
+        (5, 2)
+
+        """
+        values = np.asarray(values, dtype=cls._active_dtype())
+        if values.ndim != 1:
+            raise ValueError(f"Batched values must be one dimensional, got shape {values.shape}")
+
+        derivative = cls._batch_derivative(values, derivative, kwargs.get("seed_vector"))
+        return cls._bind_input(str(symbol), values, derivative)
+
+    @staticmethod
+    def _batch_derivative(
+        values: NDArray,
+        derivative: Union[int, float, NDArray],
+        seed_vector: Union[List, NDArray] = None,
+    ) -> NDArray:
+        """
+        Broadcasts the derivative of a batched input to shape (batch, n_seeds).
+
+        Parameters
+        ----------
+        values : NDArray
+                Points of the batched node.
+        derivative : int, float, NDArray
+                Scalar derivative, one derivative per point or an array of shape (batch, n_seeds).
+        seed_vector : List, NDArray, optional
+                Seed vector multiplied with the derivative of every point.
+
+        Returns
+        -------
+        NDArray :
+            derivative of shape (batch, n_seeds).
+
+        """
+        dtype = Node._active_dtype()
+        derivative = np.asarray(derivative, dtype=dtype)
+        if derivative.ndim < 2:
+            derivative = derivative.reshape(-1, 1)
+        if seed_vector is not None:
+            derivative = derivative * np.asarray(seed_vector, dtype=dtype)
+
+        try:
+            return np.array(
+                np.broadcast_to(derivative, (len(values), derivative.shape[-1]))
+            )
+        except ValueError:
+            raise ValueError(
+                f"Derivative of shape {derivative.shape} does not match a batch of {len(values)} points"
+            ) from None
+
+    @classmethod
+    def _bind_input(
+        cls,
+        symbol: str,
+        value: Union[float, int, NDArray],
+        derivative: Union[int, float, NDArray],
+    ) -> Node:
+        """
+        Returns the input node bound to a symbol, creating it or rebinding the symbol if its value or derivative changed.
+
+        Parameters
+        ----------
+        symbol : str
+                Symbol of the input node.
+        value : int, float, NDArray
+                Analytical value of the node.
+        derivative : int, float, NDArray
+                Derivative with respect to the value attribute.
+
+        Returns
+        -------
+        Node :
+            existing or newly created instance.
+
+        """
+        # check if node already exist before recreating
+        existing_node = cls._lookup_node(symbol)
+        if existing_node is None:
+            return cls._create_node(symbol, value, derivative, symbol=symbol)
+
+        if (
+            np.array_equal(existing_node._value, value)
+            and np.array_equal(existing_node._derivative, derivative)
+            # inputs created under another dtype policy are rebound, so that their derivatives are recomputed
+            and getattr(existing_node._derivative, "dtype", None) == getattr(derivative, "dtype", None)
+        ):
+            return existing_node
+
+        # the symbol is bound to a new point, invalidate what was computed from the previous binding
+        return cls._create_node(symbol, value, derivative, symbol=symbol, rebind=True)
+
+    @classmethod
+    def _create_node(
+        cls,
+        key: Hashable,
+        value: Union[float, int],
+        derivative: Union[int, float, NDArray],
+        symbol: str = None,
+        operation: str = None,
+        operands: Tuple[Node, ...] = (),
+        parameters: Tuple = (),
+        rebind: bool = False,
+    ) -> Node:
+        """
+        Allocates a new Node instance and stores it in the registry under the given key.
+
+        Parameters
+        ----------
+        key : Hashable
+                Unique identifier of the node in the registry.
+        value : int, float
+                Analytical value of the node.
+        derivative : int, float, np.ndarray
+                Derivative with respect to the value attribute.
+        symbol : str, optional
+                Symbolic representation of the node. Only provided for leaf nodes,
+                the symbol of derived nodes is rendered from their operands when requested.
+        operation : str, optional
+                Name of the operation that produced the node.
+        operands : Tuple[Node, ...], optional
+                Nodes the operation was applied to.
+        parameters : Tuple, optional
+                Constant parameters of the operation such as the base of a logarithm.
+        rebind : bool, default=False
+                Replace the node currently stored under key and remove the nodes computed from it.
+
+        Returns
+        -------
+        Node :
+            newly created instance, or the instance another thread stored under key first.
+
+        """
+        instance = super().__new__(cls)
+        instance._key = key
+        instance._symbol = symbol
+        instance._operation = operation
+        instance._operands = operands
+        instance._parameters = parameters
+        instance._value = value
+        instance._derivative = derivative
+
+        # consumers are referenced weakly so that tracking them does not keep finished computations alive
+        instance._consumers = []
+        instance._dirty = False
+        for operand in operands:
+            operand._consumers.append(weakref.ref(instance))
+
+        with Node._COUNTER_LOCK:
+            instance._id = next(cls._NODE_IDS)
+            # for benchmarking purposes only
+            Node._NODES_COMPUTED_FOR_BENCHMARKING += 1
+
+        if cls._overwrite_mode_enabled():
+            return instance
+
+        if rebind:
+            return cls._active_registry().rebind(key, instance)
+
+        # another thread may have stored a node under the same key since the lookup
+        return cls._insert_node_to_registry(instance)
+
+    @classmethod
+    def _apply_operation(
+        cls, operation: str, operands: Tuple[Node, ...], parameters: Tuple = ()
+    ) -> Node:
+        """
+        Returns the node resulting from applying an operation to its operands.
+        The registry is checked before any computation, and new nodes are computed with the forward rule of the operation.
+
+        Parameters
+        ----------
+        operation : str
+                Name of the operation, e.g. "+" or "sqrt".
+        operands : Tuple[Node, ...]
+                Nodes the operation is applied to.
+        parameters : Tuple, optional
+                Constant parameters of the operation such as the base of a logarithm.
+
+        Returns
+        -------
+        Node :
+            existing or newly created instance.
+
+        """
+        structural_key = cls._structural_key(operation, *operands, parameters=parameters)
+        existing_node = cls._lookup_node(structural_key)
+        if existing_node is not None:
+            return existing_node
+
+        forward_rule = cls._FORWARD_RULES[operation]
+        primal_trace, tangent_trace = forward_rule(*operands, *parameters)
+
+        batched = any(operand.is_batched for operand in operands)
+        cls._check_foreign_value_type_compatibility(primal_trace, batched=batched)
+        cls._check_foreign_derivative_type_compatibility(tangent_trace)
 
-        if not cls._OVERWRITE_MODE:
-            cls._insert_node_to_registry(instance)
+        return cls._create_node(
+            structural_key,
+            primal_trace,
+            tangent_trace,
+            operation=operation,
+            operands=operands,
+            parameters=parameters,
+        )
+
+    @classmethod
+    def _structural_key(
+        cls, operation: str, *operands: Node, parameters: Tuple = ()
+    ) -> Tuple:
+        """
+        Builds the registry key of the node resulting from an operation.
+        The key only holds the operation, its parameters and the ids of the operands,
+        so it has constant size regardless of the depth of the computational graph.
+
+        Parameters
+        ----------
+        operation : str
+            Name of the operation, e.g. "+" or "sqrt".
+        *operands : Node
+            Nodes the operation is applied to.
+        parameters : Tuple, optional
+            Constant parameters of the operation such as the base of a logarithm.
+
+        Returns
+        -------
+        Tuple :
+            structural key of the resulting node.
+
+        Examples
+        --------
+        >>> x = Node("x", 1, 1)
+        >>> y = Node("y", 2, 1)
+        >>> Node._structural_key("+", x, y) == Node._structural_key("+", y, x)
+        True
+
+        """
+        operand_ids = [operand._id for operand in operands]
+        if operation in cls._COMMUTATIVE_OPERATIONS:
+            operand_ids.sort()
 
-        # for benchmarking purposes only
-        cls._NODES_COMPUTED_FOR_BENCHMARKING += 1
-        return instance
+        return (operation, *parameters, *operand_ids)
 
     @property
     def symbol(self) -> str:
         """
-        Returns symbolic representation of the computational node
+        Returns symbolic representation of the computational node.
+        The representation of derived nodes is rendered on first access and cached.
 
         """
+        if self._symbol is None:
+            self._symbol = self._render_symbol()
+
         return self._symbol
 
     @property
     def value(self) -> float | int:
         """
-        Returns analytical value of the computational node
+        Returns analytical value of the computational node.
+        If an input the node depends on was updated, the node is recomputed first.
 
         """
+        if self._dirty:
+            self._recompute()
+
         return self._value
 
+    @property
+    def is_batched(self) -> bool:
+        """
+        Returns whether the node holds a batch of points, see Node.batch
+
+        """
+        return isinstance(self._value, np.ndarray)
+
     @property
     def derivative(self) -> int | float:
         """
-        Returns derivative value of the computational node
+        Returns derivative value of the computational node.
+        If an input the node depends on was updated, the node is recomputed first.
 
         """
+        if self._dirty:
+            self._recompute()
+
         return self._derivative
 
+    @property
+    def hessian(self) -> Union[float, NDArray]:
+        """
+        Returns the second derivatives of the node with respect to the seed directions of its inputs.
+        The Hessian is computed on request from the graph of the node, see Node._hessians.
+
+        Returns
+        -------
+        Union[float, NDArray] :
+            second derivative if the inputs have scalar derivatives, otherwise an array of shape (n_seeds, n_seeds),
+            prepended by the batch dimension for batched nodes.
+
+        Examples
+        --------
+        >>> x = Node("x", 2, 1, seed_vector=[1, 0])
+        >>> y = Node("y", 3, 1, seed_vector=[0, 1])
+        >>> (x * x * y).hessian
+        array([[6., 4.],
+               [4., 0.]])
+
+        """
+        return Node._hessians([self])[0]
+
     @staticmethod
-    def _check_foreign_value_type_compatibility(other_type: Union[int, float]) -> None:
+    def _hessians(outputs: List[Node]) -> List[Union[float, NDArray]]:
+        """
+        Propagates first and second order tangents through the graph the outputs were computed from, forward over forward.
+        Inputs are linear in their seed directions, so their second order tangent is zero. A node g computed
+        from operands u_i has first order tangent sum_i dg/du_i t_i and second order tangent
+        sum_i dg/du_i H_i + sum_ij d2g/du_i du_j outer(t_i, t_j), with the partials of the forward rules
+        and the second partials of Node._SECOND_DERIVATIVE_RULES.
+
+        Parameters
+        ----------
+        outputs : List[Node]
+                Nodes whose Hessians are computed.
+
+        Returns
+        -------
+        List[Union[float, NDArray]] :
+            Hessian of every output, see Node.hessian.
+
+        """
+        # tangents have a trailing seed axis, None stands for the zero tangents of constants and linear nodes
+        tangents = {}
+        hessians = {}
+        for node in Node._topological_order(outputs):
+            if node._operation is None:
+                derivative = node.derivative
+                if isinstance(derivative, (int, float)) and derivative == 0:
+                    tangents[id(node)] = None
+                else:
+                    tangent = np.asarray(derivative)
+                    if tangent.ndim == np.ndim(node.value):
+                        tangent = tangent[..., np.newaxis]
+                    tangents[id(node)] = tangent
+                hessians[id(node)] = None
+                continue
+
+            partials = _local_partials(node)
+            second_partials = Node._SECOND_DERIVATIVE_RULES[node._operation](
+                *node._operands, *node._parameters
+            )
+            operand_tangents = [tangents[id(operand)] for operand in node._operands]
+            operand_hessians = [hessians[id(operand)] for operand in node._operands]
+
+            tangent = None
+            hessian = None
+            for i, (partial, tangent_i) in enumerate(zip(partials, operand_tangents)):
+                if tangent_i is None:
+                    continue
+
+                term = _align_with_tangent(partial) * tangent_i
+                tangent = term if tangent is None else tangent + term
+                if operand_hessians[i] is not None:
+                    term = _align_with_hessian(partial) * operand_hessians[i]
+                    hessian = term if hessian is None else hessian + term
+
+                for j, tangent_j in enumerate(operand_tangents):
+                    second_partial = second_partials[i][j]
+                    if tangent_j is None or (isinstance(second_partial, int) and second_partial == 0):
+                        continue
+
+                    term = _align_with_hessian(second_partial) * (
+                        tangent_i[..., :, np.newaxis] * tangent_j[..., np.newaxis, :]
+                    )
+                    hessian = term if hessian is None else hessian + term
+
+            tangents[id(node)] = tangent
+            hessians[id(node)] = hessian
+
+        results = []
+        for output in outputs:
+            seeded = np.ndim(output.derivative) > np.ndim(output.value)
+            n_seeds = np.shape(output.derivative)[-1] if seeded else 1
+            hessian = hessians[id(output)]
+            if hessian is None:
+                hessian = np.zeros(np.shape(output.value) + (n_seeds, n_seeds))
+            else:
+                hessian = np.broadcast_to(hessian, np.shape(output.value) + (n_seeds, n_seeds))
+
+            # inputs without seed vectors have a single seed direction, dropped from their Hessian
+            hessian = np.array(hessian)
+            results.append(hessian if seeded else hessian[..., 0, 0][()])
+
+        return results
+
+    def update(
+        self,
+        value: Union[float, int],
+        derivative: Union[int, float] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Updates the value, and optionally the derivative, of an input node in place.
+        Every node computed from this node is marked dirty and lazily recomputed
+        the next time its value or derivative is read. Nodes that do not depend on this node are not recomputed.
+
+        Parameters
+        ----------
+        value : int, float, List[float], NDArray
+                New analytical value of the node, or new points of a batched node.
+        derivative : int, float, optional
+                New derivative of the node. The current derivative is kept if not specified,
+                which requires batched nodes to keep their number of points.
+
+        **kwargs
+        ---------
+        seed_vector : List
+                A seed vector multiplied with the derivative, see Node.
+
+        Raises
+        ------
+        ValueError
+            Raises ValueError if the node was computed from other nodes
+
+        Examples
+        --------
+        >>> x = Node("x", 2, 1)
+        >>> y = x * x
+        >>> x.update(3)
+        >>> y.value
+        9
+
+        """
+        if self._operation is not None:
+            raise ValueError(
+                f"Only input nodes can be updated, '{self.symbol}' is computed from other nodes"
+            )
+
+        if derivative is None:
+            derivative = self._derivative
+        else:
+            self._check_foreign_derivative_type_compatibility(derivative)
+
+        if self.is_batched:
+            value = np.asarray(value, dtype=self._active_dtype())
+            self._check_foreign_value_type_compatibility(value, batched=True)
+            derivative = self._batch_derivative(value, derivative, kwargs.get("seed_vector"))
+        else:
+            self._check_foreign_value_type_compatibility(value)
+            if "seed_vector" in kwargs:
+                derivative = self._seed_derivative(
+                    derivative, kwargs["seed_vector"], kwargs.get("sparse", False)
+                )
+
+        self._value = value
+        self._derivative = derivative
+        self._mark_consumers_dirty()
+
+    def _mark_consumers_dirty(self) -> None:
+        """
+        Marks every node computed, directly or transitively, from this node as dirty.
+        Nodes that are already dirty are not visited again, since their consumers are already dirty.
+
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            live_consumers = []
+            for reference in node._consumers:
+                consumer = reference()
+                if consumer is None:
+                    continue
+                live_consumers.append(reference)
+                if not consumer._dirty:
+                    consumer._dirty = True
+                    stack.append(consumer)
+
+            # drop references to consumers that have been garbage collected
+            node._consumers = live_consumers
+
+    def _recompute(self) -> None:
+        """
+        Recomputes the dirty nodes this node depends on, in topological order, and then the node itself.
+        The graph is walked iteratively so that very deep graphs do not exceed the recursion limit.
+
+        """
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            dirty_operands = [operand for operand in node._operands if operand._dirty]
+            if dirty_operands:
+                stack.extend(dirty_operands)
+                continue
+
+            stack.pop()
+            if node._dirty:
+                forward_rule = Node._FORWARD_RULES[node._operation]
+                node._value, node._derivative = forward_rule(
+                    *node._operands, *node._parameters
+                )
+                node._dirty = False
+
+    @staticmethod
+    def _topological_order(outputs: List[Node]) -> List[Node]:
+        """
+        Returns every node the outputs are computed from, each once, with operands before the nodes consuming them.
+        The graph is walked iteratively so that very deep graphs do not exceed the recursion limit.
+
+        Parameters
+        ----------
+        outputs : List[Node]
+                Nodes whose computational graph is ordered.
+
+        Returns
+        -------
+        List[Node] :
+            nodes in evaluation order.
+
+        """
+        order = []
+        visited = set()
+        stack = [(output, False) for output in reversed(outputs)]
+        while stack:
+            node, operands_visited = stack.pop()
+            if id(node) in visited:
+                continue
+
+            if operands_visited or not node._operands:
+                visited.add(id(node))
+                order.append(node)
+            else:
+                stack.append((node, True))
+                stack.extend((operand, False) for operand in reversed(node._operands))
+
+        return order
+
+    def _format_symbol(self, operand_symbols: List[str]) -> str:
+        """
+        Formats the symbolic representation of a derived node from the symbols of its operands.
+
+        Parameters
+        ----------
+        operand_symbols : List[str]
+            Symbolic representations of the operands, in operand order.
+
+        Returns
+        -------
+        str :
+            symbolic representation of the node.
+
+        """
+        operation = self._operation
+
+        if operation in Node._INFIX_OPERATIONS:
+            if operation in Node._COMMUTATIVE_OPERATIONS:
+                operand_symbols = sorted(operand_symbols)
+            return "({}{}{})".format(operand_symbols[0], operation, operand_symbols[1])
+
+        if operation == "neg":
+            return "-{}".format(*operand_symbols)
+
+        parameters = "".join(str(parameter) for parameter in self._parameters)
+        return "{}{}({})".format(operation, parameters, ",".join(operand_symbols))
+
+    def _render_symbol(self) -> str:
+        """
+        Renders the symbolic representation of the node from its operands.
+        The graph is walked iteratively so that very deep graphs do not exceed the recursion limit,
+        and intermediate symbols are released as soon as every node consuming them has been rendered.
+
+        Returns
+        -------
+        str :
+            symbolic representation of the node.
+
+        """
+        # count how many times each unrendered node is consumed within this subgraph
+        consumers = {id(self): 1}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for operand in node._operands:
+                if operand._symbol is not None:
+                    continue
+                if id(operand) not in consumers:
+                    consumers[id(operand)] = 0
+                    stack.append(operand)
+                consumers[id(operand)] += 1
+
+        rendered = {}
+        finished = set()
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if id(node) in finished:
+                stack.pop()
+                continue
+
+            pending = [
+                operand
+                for operand in node._operands
+                if operand._symbol is None and id(operand) not in finished
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+
+            stack.pop()
+            operand_symbols = []
+            for operand in node._operands:
+                if operand._symbol is not None:
+                    operand_symbols.append(operand._symbol)
+                    continue
+                operand_symbols.append(rendered[id(operand)])
+                consumers[id(operand)] -= 1
+                if consumers[id(operand)] == 0:
+                    del rendered[id(operand)]
+
+            rendered[id(node)] = node._format_symbol(operand_symbols)
+            finished.add(id(node))
+
+        return rendered[id(self)]
+
+    @staticmethod
+    def _check_foreign_value_type_compatibility(
+        other_type: Union[int, float], batched: bool = False
+    ) -> None:
         """
         Checks to see if a datatype can be represented as a node.
 
@@ -122,6 +1293,8 @@ class Node:
         ----------
         other_type : Any
             Python object that will be attempt being converted to a Node
+        batched : bool, default=False
+            Whether the value belongs to a batched node, in which case 1-D arrays are accepted as well
 
         Raises
         -------
@@ -135,6 +1308,9 @@ class Node:
         >>> TypeError Unsupported type 'str' for value attribute in class Node
 
         """
+        if batched and isinstance(other_type, np.ndarray) and other_type.ndim == 1:
+            return
+
         if not isinstance(other_type, Node._COMPATIBLE_VALUE_TYPES):
             raise TypeError(
                 f"Unsupported type '{type(other_type)}' for value attribute in class Node"
@@ -199,14 +1375,60 @@ class Node:
         )
 
     @staticmethod
-    def _check_node_exists(key: str) -> bool:
+    def _active_registry() -> NodeRegistry:
+        """
+        Returns the registry of the innermost Node.registry_scope, or the global registry outside of any scope.
+
+        """
+        registry = _SCOPED_REGISTRY.get()
+        return Node._NODE_REGISTRY if registry is None else registry
+
+    @staticmethod
+    def _active_dtype() -> np.dtype:
+        """
+        Returns the dtype of the innermost Node.dtype_scope, or the global dtype outside of any scope.
+
+        """
+        dtype = _SCOPED_DTYPE.get()
+        return Node._DTYPE if dtype is None else dtype
+
+    @classmethod
+    def _check_dtype(cls, dtype: Union[str, type, np.dtype]) -> np.dtype:
+        """
+        Returns dtype as a numpy dtype if it is supported.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if dtype is not float32 or float64
+
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in cls._SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported dtype '{dtype}'. Expected one of {[str(supported) for supported in cls._SUPPORTED_DTYPES]}"
+            )
+
+        return dtype
+
+    @staticmethod
+    def _overwrite_mode_enabled() -> bool:
+        """
+        Returns the overwrite mode of the innermost Node.registry_scope, or the global mode outside of any scope.
+
+        """
+        overwrite_mode = _SCOPED_OVERWRITE_MODE.get()
+        return Node._OVERWRITE_MODE if overwrite_mode is None else overwrite_mode
+
+    @staticmethod
+    def _check_node_exists(key: Hashable) -> bool:
         """
         Checks if an instance of class Node has already been created.
 
         Parameters
         ----------
-        key : str
-            Symbolic representation of a Node instance that acts as a unique identifier.
+        key : Hashable
+            Symbolic representation of a leaf node or structural key of a derived node.
 
         Returns
         -------
@@ -214,17 +1436,43 @@ class Node:
             True if key argument is found. False otherwise.
 
         """
-        return key in Node._NODE_REGISTRY if not Node._OVERWRITE_MODE else False
+        if Node._overwrite_mode_enabled():
+            return False
+
+        return key in Node._active_registry()
+
+    @staticmethod
+    def _lookup_node(key: Hashable) -> Union[Node, None]:
+        """
+        Returns the existing Node instance stored under key, or None if there is none or overwrite mode is enabled.
+        Unlike _check_node_exists followed by _get_existing_node, the registry is queried once under its lock,
+        so a node evicted by another thread in between cannot raise a KeyError.
+
+        Parameters
+        ----------
+        key : Hashable
+            Symbolic representation of a leaf node or structural key of a derived node.
+
+        Returns
+        -------
+        Union[Node, None] :
+            instance that matches the specified key, or None.
+
+        """
+        if Node._overwrite_mode_enabled():
+            return None
+
+        return Node._active_registry().get(key)
 
     @staticmethod
-    def _get_existing_node(key: str) -> Node:
+    def _get_existing_node(key: Hashable) -> Node:
         """
         Returns existing Node instance to avoid recomputing nodes.
 
         Parameters
         ----------
-        key : str
-            Symbolic representation of a Node instance that acts as a unique identifier.
+        key : Hashable
+            Symbolic representation of a leaf node or structural key of a derived node.
 
         Returns
         -------
@@ -233,13 +1481,14 @@ class Node:
 
         """
 
-        return Node._NODE_REGISTRY[key]
+        return Node._active_registry()[key]
 
     @staticmethod
-    def _insert_node_to_registry(node: Node) -> None:
+    def _insert_node_to_registry(node: Node) -> Node:
         """
         Adds Node instance to the registry, and allows computational graph to keep track of what nodes have
-        already been computed .
+        already been computed. Insertion is atomic: if another thread stored a node under the same key first,
+        that node is kept and returned instead.
 
         Parameters
         ----------
@@ -248,19 +1497,188 @@ class Node:
 
         Returns
         -------
-        None
+        Node :
+            instance stored in the registry under the key of node.
 
         """
-        Node._NODE_REGISTRY[node._symbol] = node
+        return Node._active_registry().setdefault(node._key, node)
 
     @classmethod
     def count_nodes_stored(cls) -> int:
         """
-        Returns the number of nodes currently stored in the registry.
+        Returns the number of nodes currently stored in the active registry.
+        Nodes stored in the parent of a layered scope are not counted.
+
+        """
+        return len(Node._active_registry())
+
+    @classmethod
+    def configure_registry(
+        cls,
+        policy: str = None,
+        max_entries: int = None,
+        max_bytes: int = None,
+        weak_references: bool = False,
+    ) -> None:
+        """
+        Replaces the global node registry with one bounded by the given eviction policy and budgets.
+        Nodes currently stored are carried over and evicted if they exceed the new budgets.
+
+        Parameters
+        ----------
+        policy : {None, "lru", "lfu"}, default=None
+            Eviction policy. "lru" evicts the least recently retrieved node,
+            "lfu" the least frequently retrieved node and None never evicts.
+        max_entries : int, optional
+            Maximum number of nodes stored in the registry.
+        max_bytes : int, optional
+            Approximate maximum number of bytes held by stored nodes, including array derivatives.
+        weak_references : bool, default=False
+            Only hold weak references to stored nodes. Nodes still reachable from user code remain
+            deduplicated, while intermediates of finished computations are garbage collected.
+
+        Examples
+        --------
+        >>> Node.configure_registry(policy="lru", max_entries=10_000, max_bytes=64 * 2**20)
+        >>> Node.registry_statistics()["evictions"]
+        0
+
+        """
+        registry = NodeRegistry(policy, max_entries, max_bytes, weak_references)
+        registry.update(Node._NODE_REGISTRY)
+        Node._NODE_REGISTRY = registry
+
+    @classmethod
+    def registry_statistics(cls) -> dict:
+        """
+        Returns the configuration, occupancy and eviction counters of the active node registry.
+
+        """
+        return Node._active_registry().statistics()
+
+    @classmethod
+    @contextlib.contextmanager
+    def registry_scope(
+        cls,
+        policy: str = "isolated",
+        eviction_policy: str = None,
+        max_entries: int = None,
+        max_bytes: int = None,
+        weak_references: bool = False,
+    ) -> Iterator[NodeRegistry]:
+        """
+        Context manager that gives the enclosed computations their own node registry.
+        Scopes are stored in context variables, so each thread and asyncio task sees its own scope,
+        and neither the global registry nor the global overwrite mode are modified.
+
+        Parameters
+        ----------
+        policy : {"isolated", "layered", "disabled"}, default="isolated"
+            "isolated" starts from an empty registry.
+            "layered" starts from an empty registry that falls back to the enclosing registry read-only,
+            so previously computed nodes are reused while new nodes stay local to the scope.
+            "disabled" recomputes every node within the scope, as with overwrite mode enabled.
+        eviction_policy : {None, "lru", "lfu"}, default=None
+            Eviction policy of the scoped registry, see Node.configure_registry.
+        max_entries : int, optional
+            Maximum number of nodes stored in the scoped registry.
+        max_bytes : int, optional
+            Approximate maximum number of bytes held by the scoped registry.
+        weak_references : bool, default=False
+            Only hold weak references to nodes stored in the scoped registry.
+
+        Yields
+        ------
+        NodeRegistry :
+            registry active within the scope.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the scope policy is unknown
+
+        Examples
+        --------
+        >>> x = Node("x", 2, 1)
+        >>> with Node.registry_scope(policy="layered"):
+        ...     y = x * x
+        ...     Node.count_nodes_stored()
+        1
+        >>> Node.count_nodes_stored()
+        1
+
+        """
+        if policy not in cls._REGISTRY_SCOPE_POLICIES:
+            raise ValueError(
+                f"Unsupported registry scope policy '{policy}'. Expected one of {cls._REGISTRY_SCOPE_POLICIES}"
+            )
+
+        if policy == "disabled":
+            registry = cls._active_registry()
+        else:
+            parent = cls._active_registry() if policy == "layered" else None
+            registry = NodeRegistry(
+                eviction_policy, max_entries, max_bytes, weak_references, parent
+            )
+
+        registry_token = _SCOPED_REGISTRY.set(registry)
+        overwrite_mode_token = _SCOPED_OVERWRITE_MODE.set(policy == "disabled")
+        try:
+            yield registry
+        finally:
+            _SCOPED_OVERWRITE_MODE.reset(overwrite_mode_token)
+            _SCOPED_REGISTRY.reset(registry_token)
+
+    @classmethod
+    def set_dtype(cls, dtype: Union[str, type, np.dtype]) -> None:
+        """
+        Sets the floating point type of seed vectors, batched values and batched derivatives created from now on.
+        Derivatives computed from them keep their dtype. Values of scalar nodes remain Python numbers.
+
+        Parameters
+        ----------
+        dtype : {"float64", "float32"}
+            float64 is the default. float32 halves the memory of tangents and batches at single precision.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if dtype is not float32 or float64
+
+        """
+        cls._DTYPE = cls._check_dtype(dtype)
 
+    @classmethod
+    @contextlib.contextmanager
+    def dtype_scope(cls, dtype: Union[str, type, np.dtype]) -> Iterator[np.dtype]:
         """
-        return len(Node._NODE_REGISTRY)
+        Context manager that sets the floating point type of the nodes created within it, see Node.set_dtype.
+        Like registry scopes, dtype scopes are local to each thread and asyncio task.
+
+        Parameters
+        ----------
+        dtype : {"float64", "float32"}
+            floating point type within the scope.
+
+        Yields
+        ------
+        np.dtype :
+            dtype active within the scope.
 
+        Examples
+        --------
+        >>> with Node.dtype_scope("float32"):
+        ...     x = Node("x", 2, 1, seed_vector=[1, 0])
+        >>> (x * x).derivative.dtype
+        dtype('float32')
+
+        """
+        dtype = cls._check_dtype(dtype)
+        token = _SCOPED_DTYPE.set(dtype)
+        try:
+            yield dtype
+        finally:
+            _SCOPED_DTYPE.reset(token)
 
     @classmethod
     def set_overwrite_mode(cls, enabled: bool) -> None:
@@ -291,7 +1709,7 @@ class Node:
                 RuntimeWarning,
             )
             # clear registry when overwrite mode is enabled because we will not need it
-            cls.clear_node_registry()
+            Node._NODE_REGISTRY.clear()
 
         # if enabling is switched to false, be sure to warn th user
         if enabled == False:
@@ -307,153 +1725,59 @@ class Node:
     @staticmethod
     def clear_node_registry() -> None:
         """
-        Removes all key value pairs currently stored the node registry.
+        Removes all key value pairs currently stored the active node registry.
+        Within a layered scope, the parent registry is left untouched.
         WARNING previous computations made by the graph will be permanently erased.
 
         """
-        Node._NODE_REGISTRY.clear()
+        Node._active_registry().clear()
 
     def __add__(self, other: Union[int, float, Node]) -> Node:
-
-        symbolic_representation = "({}+{})".format(*sorted([self._symbol, str(other)]))
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
         other = self._convert_numeric_type_to_node(other)
-        primal_trace = self._value + other._value
-        tangent_trace = self._derivative + other._derivative
-
-        return Node(
-            symbolic_representation,
-            primal_trace,
-            tangent_trace,
-        )
+        return self._apply_operation("+", (self, other))
 
     def __radd__(self, other: Union[int, float]) -> Node:
         return self.__add__(other)
 
     def __sub__(self, other: Union[int, float, Node]) -> Node:
-
-        symbolic_representation = "({}-{})".format(self._symbol, str(other))
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
         other = self._convert_numeric_type_to_node(other)
-        primal_trace = self._value - other._value
-        tangent_trace = self._derivative - other._derivative
-
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._apply_operation("-", (self, other))
 
     def __rsub__(self, other: Union[int, float]) -> Node:
-
-        symbolic_representation = "({}-{})".format(str(other), self._symbol)
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
-        other = self._convert_numeric_type_to_node(other)
-        primal_trace = other._value - self._value
-        tangent_trace = other._derivative - self._derivative
-
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._convert_numeric_type_to_node(other).__sub__(self)
 
     def __mul__(self, other: Union[int, float, Node]) -> Node:
-
-        symbolic_representation = "({}*{})".format(*sorted([self._symbol, str(other)]))
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
         other = self._convert_numeric_type_to_node(other)
-        primal_trace = self._value * other._value
-        tangent_trace = (
-            self._value * other._derivative + other._value * self._derivative
-        )
-
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._apply_operation("*", (self, other))
 
     def __rmul__(self, other: Union[int, float]) -> Node:
         return self.__mul__(other)
 
     def __truediv__(self, other: Union[int, float, Node]) -> Node:
-        symbolic_representation = "({}/{})".format(self._symbol, str(other))
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
         other = self._convert_numeric_type_to_node(other)
-        primal_trace = self._value / other._value
-        tangent_trace = (
-            self._derivative * other._value - self._value * other._derivative
-        ) / other._value**2
-
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._apply_operation("/", (self, other))
 
     def __rtruediv__(self, other: Union[int, float]) -> Node:
-        symbolic_representation = "({}/{})".format(str(other), self._symbol)
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
-        other = self._convert_numeric_type_to_node(other)
-        primal_trace = other._value / self._value
-        tangent_trace = (
-            self._value * other._derivative - other._value * self._derivative
-        ) / self._value**2
-
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._convert_numeric_type_to_node(other).__truediv__(self)
 
     def __neg__(self) -> Node:
-        symbolic_representation = "-{}".format(self._symbol)
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
-        primal_trace = -1 * self._value
-        tangent_trace = -1 * self._derivative
-
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._apply_operation("neg", (self,))
 
     def __pow__(self, exponent: Union[int, float, Node]) -> Node:
-        symbolic_representation = "({}**{})".format(self._symbol, str(exponent))
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
         exponent = self._convert_numeric_type_to_node(exponent)
-        primal_trace = self._value**exponent._value
-        tangent_trace = self._value**exponent._value * (
-            exponent._derivative * np.log(self._value)
-            + (self._derivative * exponent._value) / self._value
-        )
-
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._apply_operation("**", (self, exponent))
 
     def __rpow__(self, base: Union[int, float]) -> Node:
-        symbolic_representation = "({}**{})".format(str(base), self._symbol)
-
-        if self._check_node_exists(symbolic_representation):
-            return self._get_existing_node(symbolic_representation)
-
-        base = self._convert_numeric_type_to_node(base)
-        primal_trace = base._value**self._value
-        tangent_trace = base._value**self._value * (
-            self._derivative * np.log(base._value)
-            + (base._derivative * self._value) / base._value
-        )
-        
-        return Node(symbolic_representation, primal_trace, tangent_trace)
+        return self._convert_numeric_type_to_node(base).__pow__(self)
 
     def __str__(self) -> str:
-        return self._symbol
+        return self.symbol
 
     def __repr__(self) -> str:
-        return f"Node({self._symbol},{self._value},{self._derivative})"
+        return f"Node({self.symbol},{self.value},{self.derivative})"
 
     def __eq__(self, other: Node) -> bool:
-        symbolic_representation_equal = self._symbol == other._symbol
+        symbolic_representation_equal = self.symbol == other.symbol
         value_equal = self._value = other._value
         derivative_equal = self._derivative = other._derivative
 
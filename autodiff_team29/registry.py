@@ -0,0 +1,608 @@
+from __future__ import annotations
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterator
+import sys
+import threading
+import weakref
+
+import numpy as np
+
+
+def _estimate_node_bytes(node: Any) -> int:
+    """
+    Approximates the memory held by a registry entry.
+    Array valued values and derivatives, dense or sparse, are accounted for by their buffer size.
+
+    Parameters
+    ----------
+    node : Node
+        Entry stored in the registry.
+
+    Returns
+    -------
+    int :
+        approximate number of bytes held by the entry.
+
+    """
+    size = sys.getsizeof(node) + sys.getsizeof(getattr(node, "__dict__", None))
+    for attribute in ("_value", "_derivative"):
+        component = getattr(node, attribute, None)
+        if isinstance(component, np.ndarray):
+            size += component.nbytes
+        elif hasattr(component, "nbytes"):
+            size += sys.getsizeof(component) + component.nbytes
+        else:
+            size += sys.getsizeof(component)
+
+    return size
+
+
+class NodeRegistry(MutableMapping):
+    # supported eviction policies. None never evicts
+    _EVICTION_POLICIES = (None, "lru", "lfu")
+
+    def __init__(
+        self,
+        policy: str = None,
+        max_entries: int = None,
+        max_bytes: int = None,
+        weak_references: bool = False,
+        parent: NodeRegistry = None,
+    ) -> None:
+        """
+        Mapping from node keys to previously computed nodes with optional eviction.
+
+        Parameters
+        ----------
+        policy : {None, "lru", "lfu"}, default=None
+                Eviction policy applied once a budget is exceeded.
+                "lru" evicts the least recently retrieved node and "lfu" the least frequently retrieved node.
+        max_entries : int, optional
+                Maximum number of nodes stored in the registry.
+        max_bytes : int, optional
+                Approximate maximum number of bytes held by the stored nodes, including array derivatives.
+        weak_references : bool, default=False
+                Store weak references to the nodes. Nodes that are no longer reachable from user code,
+                directly or as operands of reachable nodes, are garbage collected and removed from the registry.
+        parent : NodeRegistry, optional
+                Registry consulted read-only for keys that are not stored locally.
+                Nodes are only ever inserted into, evicted from and cleared from the local registry.
+
+        Notes
+        -----
+        All operations are guarded by a reentrant lock, so a registry can be shared between threads.
+        Use NodeRegistry.setdefault to insert a node unless another thread stored one under the same key first.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the policy is unknown, or if a budget is given without a policy
+
+        Examples
+        --------
+        >>> registry = NodeRegistry(policy="lru", max_entries=2)
+        >>> registry["a"], registry["b"], registry["c"] = 1, 2, 3
+        >>> list(registry)
+        ['b', 'c']
+        >>> registry.evictions
+        1
+
+        """
+        if policy not in self._EVICTION_POLICIES:
+            raise ValueError(
+                f"Unsupported eviction policy '{policy}'. Expected one of {self._EVICTION_POLICIES}"
+            )
+
+        if policy is None and (max_entries is not None or max_bytes is not None):
+            raise ValueError("An eviction policy is required to bound the registry")
+
+        self._policy = policy
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._weak_references = weak_references
+        self._parent = parent
+        self._lock = threading.RLock()
+
+        # keys of garbage collected nodes, removed at the start of the next locked operation.
+        # weakref callbacks may run in the middle of a mutation of this thread, so they only append here
+        self._pending_removals = deque()
+
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._stored_bytes = 0
+
+        # least frequently used bookkeeping. keys are grouped in buckets by access frequency
+        self._frequencies = {}
+        self._frequency_buckets = {}
+        self._minimum_frequency = 0
+
+        # keys of the nodes each stored node was computed from, and the reverse edges,
+        # so that rebinding an input can remove every node computed from it
+        self._operand_keys = {}
+        self._dependents = {}
+
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._reclaimed = 0
+        self._generation = 0
+        self._invalidations = 0
+
+    @property
+    def policy(self) -> str | None:
+        """
+        Returns the eviction policy of the registry
+
+        """
+        return self._policy
+
+    @property
+    def max_entries(self) -> int | None:
+        """
+        Returns the maximum number of nodes stored in the registry
+
+        """
+        return self._max_entries
+
+    @property
+    def max_bytes(self) -> int | None:
+        """
+        Returns the approximate byte budget of the registry
+
+        """
+        return self._max_bytes
+
+    @property
+    def weak_references(self) -> bool:
+        """
+        Returns True if the registry only holds weak references to its nodes
+
+        """
+        return self._weak_references
+
+    @property
+    def parent(self) -> NodeRegistry | None:
+        """
+        Returns the registry consulted for keys that are not stored locally
+
+        """
+        return self._parent
+
+    @property
+    def stored_bytes(self) -> int:
+        """
+        Returns the approximate number of bytes held by the stored nodes
+
+        """
+        with self._lock:
+            self._remove_pending()
+            return self._stored_bytes
+
+    @property
+    def evictions(self) -> int:
+        """
+        Returns the number of nodes evicted since the registry was created
+
+        """
+        return self._evictions
+
+    @property
+    def evicted_bytes(self) -> int:
+        """
+        Returns the approximate number of bytes evicted since the registry was created
+
+        """
+        return self._evicted_bytes
+
+    @property
+    def reclaimed(self) -> int:
+        """
+        Returns the number of weakly referenced nodes removed after being garbage collected
+
+        """
+        with self._lock:
+            self._remove_pending()
+            return self._reclaimed
+
+    @property
+    def generation(self) -> int:
+        """
+        Returns the number of times a key has been rebound to a new node
+
+        """
+        return self._generation
+
+    @property
+    def invalidations(self) -> int:
+        """
+        Returns the number of nodes removed because a node they were computed from was rebound
+
+        """
+        return self._invalidations
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Summarizes the configuration, occupancy and eviction counters of the registry.
+
+        Returns
+        -------
+        Dict[str, Any] :
+            policy, budgets, reference mode, stored entries and bytes, evictions, evicted bytes,
+            garbage collected nodes, generation and invalidated nodes.
+
+        """
+        with self._lock:
+            self._remove_pending()
+            return {
+                "policy": self._policy,
+                "max_entries": self._max_entries,
+                "max_bytes": self._max_bytes,
+                "weak_references": self._weak_references,
+                "entries": len(self._entries),
+                "stored_bytes": self._stored_bytes,
+                "evictions": self._evictions,
+                "evicted_bytes": self._evicted_bytes,
+                "reclaimed": self._reclaimed,
+                "generation": self._generation,
+                "invalidations": self._invalidations,
+            }
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            self._remove_pending()
+            value = self._entries.get(key)
+            if value is not None and self._weak_references:
+                value = value()
+
+            if value is not None:
+                self._touch(key)
+                return value
+
+        if self._parent is not None:
+            return self._parent[key]
+
+        raise KeyError(key)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        size = _estimate_node_bytes(value)
+        with self._lock:
+            self._remove_pending()
+            self._store(key, value, size)
+
+    def _store(self, key: Hashable, value: Any, size: int) -> None:
+        """
+        Stores a node, evicting other nodes if the budgets would be exceeded. Requires the lock to be held.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key to store the node under.
+        value : Node
+            Node to store.
+        size : int
+            Approximate number of bytes held by the node.
+
+        """
+        if key in self._entries:
+            self._discard(key)
+
+        # nodes computed from a node previously stored under key cannot be reached from the new node
+        self._invalidate_dependents(key)
+
+        # make room before storing so that the incoming node is never the eviction candidate
+        while self._entries and self._exceeds_budget(1, size):
+            self._evict()
+
+        operand_keys = tuple(operand._key for operand in getattr(value, "_operands", ()))
+        self._operand_keys[key] = operand_keys
+        for operand_key in operand_keys:
+            self._dependents.setdefault(operand_key, {})[key] = None
+
+        if self._weak_references:
+            value = weakref.ref(value, self._reclaim_callback(key))
+
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._stored_bytes += size
+
+        if self._policy == "lfu":
+            self._frequencies[key] = 1
+            self._frequency_buckets.setdefault(1, OrderedDict())[key] = None
+            self._minimum_frequency = 1
+
+        # a node larger than the whole byte budget is not retained
+        if self._exceeds_budget(0, 0):
+            self._evict()
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove_pending()
+            if key not in self._entries:
+                raise KeyError(key)
+
+            self._discard(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            self._remove_pending()
+            reference = self._entries.get(key)
+            if reference is not None:
+                if not self._weak_references or reference() is not None:
+                    return True
+
+        return self._parent is not None and key in self._parent
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retrieves the node stored under key in a single locked lookup, or returns default if there is none.
+        Checking membership before retrieving is not atomic, as another thread or the garbage collector
+        may evict the node in between.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the node to retrieve.
+        default : Any, optional
+            Value returned if no node is stored under key.
+
+        Returns
+        -------
+        Any :
+            node stored under key, or default.
+
+        """
+        with self._lock:
+            try:
+                return self[key]
+            except KeyError:
+                return default
+
+    def __iter__(self) -> Iterator[Hashable]:
+        # other threads and garbage collected nodes may remove keys, so iterate over a snapshot
+        with self._lock:
+            self._remove_pending()
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_pending()
+            return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"NodeRegistry(policy={self._policy}, max_entries={self._max_entries}, max_bytes={self._max_bytes}, "
+            f"weak_references={self._weak_references}, entries={len(self)})"
+        )
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Atomically retrieves the node stored under key, or stores default if there is none.
+        This lets concurrent threads that computed the same node agree on a single instance.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the node.
+        default : Node
+            Node to store if key is not found, including in the parent registry.
+
+        Returns
+        -------
+        Node :
+            the node stored under key.
+
+        """
+        size = _estimate_node_bytes(default)
+        with self._lock:
+            self._remove_pending()
+            try:
+                return self[key]
+            except KeyError:
+                self._store(key, default, size)
+                return default
+
+    def rebind(self, key: Hashable, value: Any) -> Any:
+        """
+        Atomically replaces the node stored under key, typically an input bound to a new value,
+        and removes every node that was computed from the previous node.
+        Each removal takes constant time, and nodes that do not depend on key are kept.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the node to replace.
+        value : Node
+            Node replacing the current one.
+
+        Returns
+        -------
+        Node :
+            the node stored under key.
+
+        """
+        size = _estimate_node_bytes(value)
+        with self._lock:
+            self._remove_pending()
+            self._generation += 1
+            self._store(key, value, size)
+            return value
+
+    def _invalidate_dependents(self, key: Hashable) -> None:
+        """
+        Removes the nodes computed, directly or transitively, from the node stored under key.
+        The edges towards the dependents of a key outlive the key itself, so they are removed
+        even if the node stored under key has already been evicted. Requires the lock to be held.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key whose dependents are removed.
+
+        """
+        stack = list(self._dependents.pop(key, ()))
+        while stack:
+            dependent = stack.pop()
+            if dependent in self._entries:
+                self._discard(dependent)
+                self._invalidations += 1
+            stack.extend(self._dependents.pop(dependent, ()))
+
+    def clear(self) -> None:
+        """
+        Removes all nodes from the registry. Eviction counters are preserved.
+
+        """
+        with self._lock:
+            self._pending_removals.clear()
+            self._entries.clear()
+            self._operand_keys.clear()
+            self._dependents.clear()
+            self._sizes.clear()
+            self._stored_bytes = 0
+            self._frequencies.clear()
+            self._frequency_buckets.clear()
+            self._minimum_frequency = 0
+
+    def _reclaim_callback(self, key: Hashable):
+        """
+        Builds the callback scheduling the removal of a weakly referenced node once it has been garbage collected.
+        The garbage collector may run the callback on a thread that is in the middle of an eviction and already holds
+        the reentrant lock, so the callback does not touch the entries. It queues the key, and the next locked
+        operation removes it, like the pending removals of WeakValueDictionary.
+        The callback only holds a weak reference to the registry so that it does not keep the registry alive.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key the node is stored under.
+
+        Returns
+        -------
+        Callable[[weakref.ref], None] :
+            callback for weakref.ref.
+
+        """
+        registry_reference = weakref.ref(self)
+
+        def reclaim(reference: weakref.ref) -> None:
+            registry = registry_reference()
+            if registry is not None:
+                registry._pending_removals.append((key, reference))
+
+        return reclaim
+
+    def _remove_pending(self) -> None:
+        """
+        Removes the garbage collected nodes queued by their weakref callbacks. Requires the lock to be held.
+
+        """
+        while self._pending_removals:
+            key, reference = self._pending_removals.popleft()
+            # the key may have been overwritten or removed since the reference was created
+            if self._entries.get(key) is reference:
+                self._discard(key)
+                self._reclaimed += 1
+
+    def _touch(self, key: Hashable) -> None:
+        """
+        Records an access to a stored key for the eviction policy.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key that was retrieved.
+
+        """
+        if self._policy == "lru":
+            self._entries.move_to_end(key)
+
+        elif self._policy == "lfu":
+            frequency = self._frequencies[key]
+            bucket = self._frequency_buckets[frequency]
+            del bucket[key]
+            if not bucket:
+                del self._frequency_buckets[frequency]
+                if self._minimum_frequency == frequency:
+                    self._minimum_frequency = frequency + 1
+
+            self._frequencies[key] = frequency + 1
+            self._frequency_buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def _discard(self, key: Hashable) -> int:
+        """
+        Removes a key and its bookkeeping from the registry.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key to remove.
+
+        Returns
+        -------
+        int :
+            approximate number of bytes released.
+
+        """
+        del self._entries[key]
+        size = self._sizes.pop(key)
+        self._stored_bytes -= size
+
+        # the edges towards the dependents of key are kept, so that rebinding key still reaches them
+        for operand_key in self._operand_keys.pop(key):
+            dependents = self._dependents.get(operand_key)
+            if dependents is not None:
+                dependents.pop(key, None)
+                if not dependents:
+                    del self._dependents[operand_key]
+
+        if self._policy == "lfu":
+            frequency = self._frequencies.pop(key)
+            bucket = self._frequency_buckets[frequency]
+            del bucket[key]
+            if not bucket:
+                del self._frequency_buckets[frequency]
+
+        return size
+
+    def _exceeds_budget(self, incoming_entries: int, incoming_bytes: int) -> bool:
+        """
+        Checks whether the registry would hold more entries or bytes than allowed.
+
+        Parameters
+        ----------
+        incoming_entries : int
+            Number of entries about to be stored.
+        incoming_bytes : int
+            Approximate number of bytes about to be stored.
+
+        Returns
+        -------
+        bool :
+            True if an entry has to be evicted. False otherwise.
+
+        """
+        if (
+            self._max_entries is not None
+            and len(self._entries) + incoming_entries > self._max_entries
+        ):
+            return True
+
+        return (
+            self._max_bytes is not None
+            and self._stored_bytes + incoming_bytes > self._max_bytes
+        )
+
+    def _evict(self) -> None:
+        """
+        Evicts a single entry according to the eviction policy.
+
+        """
+        if self._policy == "lru":
+            key = next(iter(self._entries))
+        else:
+            if self._minimum_frequency not in self._frequency_buckets:
+                self._minimum_frequency = min(self._frequency_buckets)
+            key = next(iter(self._frequency_buckets[self._minimum_frequency]))
+
+        self._evicted_bytes += self._discard(key)
+        self._evictions += 1
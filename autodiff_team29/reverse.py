@@ -0,0 +1,196 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from autodiff_team29.node import Node, _local_partials
+
+
+def backward(
+    outputs: List[Node], cotangents: Sequence[Union[int, float]]
+) -> Dict[int, Union[float, NDArray]]:
+    """
+    Runs a single adjoint sweep over the graph the outputs were computed from.
+
+    Parameters
+    ----------
+    outputs : List[Node]
+        nodes the sweep starts from.
+    cotangents : Sequence[Union[int, float]]
+        adjoint seeded on every output.
+
+    Returns
+    -------
+    Dict[int, Union[float, NDArray]] :
+        adjoint of every node in the graph, keyed by the id of the node.
+
+    Example
+    -------
+    >>> x = Node("x", 2, 0)
+    >>> y = x * x + 3
+    >>> backward([y], [1])[id(x)]
+    4.0
+
+    """
+    order = Node._topological_order(outputs)
+    adjoints = {id(node): 0.0 for node in order}
+    for output, cotangent in zip(outputs, cotangents):
+        adjoints[id(output)] = adjoints[id(output)] + cotangent
+
+    # operands are ordered before their consumers, so every adjoint is complete once the sweep reaches it
+    for node in reversed(order):
+        if node._operation is None:
+            continue
+
+        adjoint = adjoints[id(node)]
+        for operand, partial in zip(node._operands, _local_partials(node)):
+            adjoints[id(operand)] = adjoints[id(operand)] + adjoint * partial
+
+    return adjoints
+
+
+def grad(
+    fn: Callable[..., Node]
+) -> Callable[[Union[int, float, Sequence[float]]], Union[float, NDArray]]:
+    """
+    Returns a function computing the gradient of a scalar valued function with a single backward pass,
+    so the cost does not grow with the number of inputs as it does with seed vectors in forward mode.
+
+    Parameters
+    ----------
+    fn : Callable[..., Node]
+        function built from Node operations and elementaries. It receives a node if evaluated at a number,
+        otherwise a list of nodes, and returns a node.
+
+    Returns
+    -------
+    Callable[[Union[int, float, Sequence[float]]], Union[float, NDArray]] :
+        function evaluating the gradient of fn at a point.
+
+    Example
+    -------
+    >>> grad(lambda x: x[0] * sin(x[1]))([2.0, 0.0])
+    array([0., 2.])
+
+    """
+
+    def gradient(x: Union[int, float, Sequence[float]]) -> Union[float, NDArray]:
+        scalar_input = isinstance(x, Node._COMPATIBLE_VALUE_TYPES)
+        values = [x] if scalar_input else list(x)
+
+        # inputs carry no tangent so that building the graph only propagates scalar derivatives
+        with Node.registry_scope(policy="disabled"):
+            inputs = [
+                Node(f"_grad_input_{index}", value, 0)
+                for index, value in enumerate(values)
+            ]
+            output = fn(inputs[0] if scalar_input else inputs)
+
+        if not isinstance(output, Node):
+            raise ValueError("Differentiated function must return a Node")
+
+        adjoints = backward([output], [1])
+        gradient = np.array([adjoints.get(id(node), 0.0) for node in inputs], dtype=float)
+
+        return gradient[0] if scalar_input else gradient
+
+    return gradient
+
+
+def hvp(
+    fn: Callable[..., Node],
+    x: Union[int, float, Sequence[float]],
+    v: Union[int, float, Sequence[float]],
+) -> Union[float, NDArray]:
+    """
+    Computes the product of the Hessian of a scalar valued function with a vector, forward over reverse.
+    A forward sweep propagates the directional derivative along v to every node, then a single adjoint sweep
+    propagates the adjoints together with their directional derivatives, using the second partials of
+    Node._SECOND_DERIVATIVE_RULES. The cost is a small multiple of a gradient, independent of the number of inputs.
+
+    Parameters
+    ----------
+    fn : Callable[..., Node]
+        function built from Node operations and elementaries, see grad.
+    x : Union[int, float, Sequence[float]]
+        point the Hessian is evaluated at.
+    v : Union[int, float, Sequence[float]]
+        vector the Hessian is multiplied with, of the shape of x.
+
+    Returns
+    -------
+    Union[float, NDArray] :
+        Hessian vector product, of the shape of x.
+
+    Raises
+    ------
+    ValueError :
+        Raise value error if x and v differ in length, or fn does not return a Node
+
+    Example
+    -------
+    >>> hvp(lambda x: x[0] * x[0] * x[1], [2.0, 3.0], [1.0, 0.0])
+    array([6., 4.])
+
+    """
+    scalar_input = isinstance(x, Node._COMPATIBLE_VALUE_TYPES)
+    values = [x] if scalar_input else list(x)
+    directions = [v] if scalar_input else list(v)
+    if len(values) != len(directions):
+        raise ValueError(f"Point has {len(values)} values but direction has {len(directions)}")
+
+    with Node.registry_scope(policy="disabled"):
+        inputs = [
+            Node(f"_hvp_input_{index}", value, 0) for index, value in enumerate(values)
+        ]
+        output = fn(inputs[0] if scalar_input else inputs)
+
+    if not isinstance(output, Node):
+        raise ValueError("Differentiated function must return a Node")
+
+    # forward sweep: directional derivative of every node along v, and the local partials reused by the adjoint sweep
+    order = Node._topological_order([output])
+    tangents = {id(node): 0.0 for node in order}
+    for node, direction in zip(inputs, directions):
+        tangents[id(node)] = direction
+
+    local_partials = {}
+    for node in order:
+        if node._operation is None:
+            continue
+
+        partials = _local_partials(node)
+        local_partials[id(node)] = partials
+        tangents[id(node)] = sum(
+            partial * tangents[id(operand)]
+            for operand, partial in zip(node._operands, partials)
+        )
+
+    # adjoint sweep: the directional derivative of the adjoint of an input is the Hessian vector product
+    adjoints = {id(node): 0.0 for node in order}
+    adjoint_tangents = {id(node): 0.0 for node in order}
+    adjoints[id(output)] = 1.0
+    for node in reversed(order):
+        if node._operation is None:
+            continue
+
+        adjoint = adjoints[id(node)]
+        adjoint_tangent = adjoint_tangents[id(node)]
+        second_partials = Node._SECOND_DERIVATIVE_RULES[node._operation](
+            *node._operands, *node._parameters
+        )
+        operand_tangents = [tangents[id(operand)] for operand in node._operands]
+        for i, (operand, partial) in enumerate(zip(node._operands, local_partials[id(node)])):
+            partial_tangent = sum(
+                second_partial * tangent
+                for second_partial, tangent in zip(second_partials[i], operand_tangents)
+                if not (isinstance(tangent, float) and tangent == 0)
+            )
+            adjoints[id(operand)] = adjoints[id(operand)] + adjoint * partial
+            adjoint_tangents[id(operand)] = (
+                adjoint_tangents[id(operand)] + adjoint_tangent * partial + adjoint * partial_tangent
+            )
+
+    product = np.array([adjoint_tangents[id(node)] for node in inputs], dtype=float)
+    return product[0] if scalar_input else product
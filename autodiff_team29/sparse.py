@@ -0,0 +1,195 @@
+from __future__ import annotations
+from typing import Dict, FrozenSet, Iterable, List, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from autodiff_team29.node import Node
+
+
+class SparseJacobian:
+    def __init__(
+        self,
+        row: NDArray[int],
+        col: NDArray[int],
+        data: NDArray[float],
+        shape: Tuple[int, int],
+    ) -> None:
+        """
+        Jacobian stored in coordinate (COO) format. Entry k holds the derivative of function row[k]
+        with respect to column col[k]. Entries are sorted by row, then by column.
+
+        Parameters
+        ----------
+        row : NDArray[int]
+            row index of every stored entry.
+        col : NDArray[int]
+            column index of every stored entry.
+        data : NDArray[float]
+            value of every stored entry.
+        shape : Tuple[int, int]
+            number of functions and number of columns of the Jacobian.
+
+        Example
+        -------
+        Conversion to SciPy, if it is installed
+        >>> jacobian = f.sparse_jacobian(pattern)
+        >>> scipy.sparse.csr_matrix(jacobian.tocsr(), shape=jacobian.shape)
+
+        """
+        order = np.lexsort((col, row))
+        self.row = np.asarray(row, dtype=int)[order]
+        self.col = np.asarray(col, dtype=int)[order]
+        self.data = np.asarray(data, dtype=float)[order]
+        self.shape = tuple(shape)
+
+    @property
+    def nnz(self) -> int:
+        """
+        Returns the number of stored entries
+
+        """
+        return len(self.data)
+
+    def tocsr(self) -> Tuple[NDArray[float], NDArray[int], NDArray[int]]:
+        """
+        Returns the Jacobian in compressed sparse row (CSR) format.
+
+        Returns
+        -------
+        Tuple[NDArray[float], NDArray[int], NDArray[int]] :
+            data, column indices and row pointers. The entries of row i are data[indptr[i]:indptr[i + 1]].
+
+        """
+        indptr = np.zeros(self.shape[0] + 1, dtype=int)
+        np.cumsum(np.bincount(self.row, minlength=self.shape[0]), out=indptr[1:])
+        return self.data, self.col, indptr
+
+    def toarray(self) -> NDArray[float]:
+        """
+        Returns the Jacobian as a dense array
+
+        """
+        dense = np.zeros(self.shape)
+        dense[self.row, self.col] = self.data
+        return dense
+
+    def __repr__(self) -> str:
+        return f"SparseJacobian(shape={self.shape}, nnz={self.nnz})"
+
+
+def _pattern_rows(
+    sparsity: Union[NDArray[bool], Iterable[Iterable[int]]]
+) -> List[NDArray[int]]:
+    """
+    Converts a sparsity pattern to the sorted column indices of the nonzeros of every row.
+
+    Parameters
+    ----------
+    sparsity : Union[NDArray[bool], Iterable[Iterable[int]]]
+        boolean array of shape (n_functions, n_columns), or the column indices of the nonzeros of every row.
+
+    Returns
+    -------
+    List[NDArray[int]] :
+        column indices of the nonzeros of every row.
+
+    """
+    if isinstance(sparsity, np.ndarray) and sparsity.ndim == 2:
+        return [np.flatnonzero(row) for row in sparsity]
+
+    return [np.array(sorted(set(row)), dtype=int) for row in sparsity]
+
+
+def color_columns(
+    sparsity: Union[NDArray[bool], Iterable[Iterable[int]]], n_columns: int
+) -> NDArray[int]:
+    """
+    Groups the columns of a Jacobian into structurally orthogonal sets, columns of the same color never
+    have a nonzero in the same row. Columns are colored greedily, columns with the most nonzeros first.
+
+    Parameters
+    ----------
+    sparsity : Union[NDArray[bool], Iterable[Iterable[int]]]
+        boolean array of shape (n_functions, n_columns), or the column indices of the nonzeros of every row.
+    n_columns : int
+        number of columns of the Jacobian.
+
+    Returns
+    -------
+    NDArray[int] :
+        color of every column, colors are numbered from 0.
+
+    Example
+    -------
+    Tridiagonal Jacobians need three colors
+    >>> color_columns([[0, 1], [0, 1, 2], [1, 2, 3], [2, 3]], 4)
+    array([2, 0, 1, 2])
+
+    """
+    rows = _pattern_rows(sparsity)
+    columns = [[] for _ in range(n_columns)]
+    for row_index, row in enumerate(rows):
+        for column in row:
+            columns[column].append(row_index)
+
+    colors = [-1] * n_columns
+    for column in sorted(range(n_columns), key=lambda column: -len(columns[column])):
+        forbidden = {
+            colors[neighbour]
+            for row_index in columns[column]
+            for neighbour in rows[row_index].tolist()
+        }
+
+        color = 0
+        while color in forbidden:
+            color += 1
+        colors[column] = color
+
+    return np.array(colors, dtype=int)
+
+
+def propagate_index_sets(
+    outputs: List[Node], input_sets: Dict[int, FrozenSet[int]]
+) -> List[FrozenSet[int]]:
+    """
+    Propagates sets of column indices instead of tangents through the graph the outputs were computed from.
+    Every operation is elementwise, so a node depends on the union of the columns its operands depend on.
+    The result only depends on the structure of the graph, not on the values of the nodes.
+
+    Parameters
+    ----------
+    outputs : List[Node]
+        nodes the sets are propagated to.
+    input_sets : Dict[int, FrozenSet[int]]
+        columns every input node depends on, keyed by the id of the node. Nodes without operands
+        that are not in input_sets, such as constants, depend on no column.
+
+    Returns
+    -------
+    List[FrozenSet[int]] :
+        columns every output depends on.
+
+    Example
+    -------
+    >>> x, y, z = Node("x", 1, 1), Node("y", 2, 1), Node("z", 3, 1)
+    >>> propagate_index_sets([x * y, sin(z)], {id(x): {0}, id(y): {1}, id(z): {2}})
+    [frozenset({0, 1}), frozenset({2})]
+
+    """
+    empty = frozenset()
+    index_sets = {}
+    for node in Node._topological_order(outputs):
+        if not node._operands:
+            index_sets[id(node)] = frozenset(input_sets.get(id(node), empty))
+            continue
+
+        operand_sets = [index_sets[id(operand)] for operand in node._operands]
+        index_set = operand_sets[0]
+        for operand_set in operand_sets[1:]:
+            # unary chains and operands on the same columns share one set instead of copying it
+            if not operand_set <= index_set:
+                index_set = index_set | operand_set
+        index_sets[id(node)] = index_set
+
+    return [index_sets[id(output)] for output in outputs]
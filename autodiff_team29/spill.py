@@ -0,0 +1,388 @@
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from numpy.typing import NDArray
+
+from autodiff_team29.node import Node, _Trace
+from autodiff_team29.tape import Tape, _instruction_partials
+
+
+class MappedTape:
+    # files written to the spill directory
+    _INSTRUCTIONS_FILE = "instructions.npy"
+    _VALUES_FILE = "values.npy"
+    _ADJOINTS_FILE = "adjoints.npy"
+
+    def __init__(
+        self,
+        directory: str,
+        operations: List[str],
+        parameters: List[Tuple],
+        input_slots: Tuple[int, ...],
+        output_slots: Tuple[int, ...],
+        vector_output: bool,
+        chunk_size: int,
+        owns_directory: bool = False,
+    ) -> None:
+        """
+        Tape whose instructions, primal values and adjoints are stored in memory mapped files on local disk
+        instead of Python lists, see MappedTape.from_tape. Replays and reverse sweeps stream through the instructions
+        in chunks of chunk_size, forward for replays and backward for reverse sweeps, so the resident memory
+        is bounded by a chunk and the pages of the values the operating system keeps cached, however long the tape is.
+
+        Parameters
+        ----------
+        directory : str
+            directory holding the files of the tape.
+        operations : List[str]
+            name of every operation, instructions refer to operations by index.
+        parameters : List[Tuple]
+            every distinct tuple of parameters, instructions refer to parameters by index.
+        input_slots : Tuple[int, ...]
+            slots holding the inputs of the traced function.
+        output_slots : Tuple[int, ...]
+            slots holding the outputs of the traced function.
+        vector_output : bool
+            whether the traced function returned a list of nodes rather than a single node.
+        chunk_size : int
+            number of instructions read from disk at once.
+        owns_directory : bool, default=False
+            whether the directory was created for the tape, and is removed with it by close.
+
+        Notes
+        -----
+        Spilled tapes evaluate a single point at a time. Replays overwrite the values file,
+        so a mapped tape must not be shared between threads.
+
+        """
+        self._directory = directory
+        self._forward_rules = [Node._FORWARD_RULES[operation] for operation in operations]
+        self._parameters = parameters
+        self._input_slots = input_slots
+        self._output_slots = output_slots
+        self._vector_output = vector_output
+        self._chunk_size = chunk_size
+        self._owns_directory = owns_directory
+
+        self._instructions = np.load(os.path.join(directory, self._INSTRUCTIONS_FILE), mmap_mode="r")
+        self._values = np.load(os.path.join(directory, self._VALUES_FILE), mmap_mode="r+")
+        self._adjoints = np.load(os.path.join(directory, self._ADJOINTS_FILE), mmap_mode="r+")
+
+    @classmethod
+    def from_tape(
+        cls, tape: Tape, directory: str = None, chunk_size: int = 65_536
+    ) -> MappedTape:
+        """
+        Spills a tape to memory mapped files. Every instruction is stored as a fixed size record holding the index of
+        its operation and parameters, its operand slots and its output slot. The values file holds the primal value
+        of every slot, with the constants written once, and the adjoints file the adjoint of every slot.
+
+        Parameters
+        ----------
+        tape : Tape
+            tape to spill. Once spilled, the tape can be released.
+        directory : str, optional
+            existing directory the files are written to. Defaults to a new temporary directory,
+            which is removed when the mapped tape is closed or garbage collected.
+        chunk_size : int, default=65_536
+            number of instructions read from disk at once.
+
+        Returns
+        -------
+        MappedTape :
+            tape evaluating the traced function from disk.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the chunk size is not positive or the tape holds batched constants
+
+        Example
+        -------
+        >>> tape = trace(lambda x, y: x * sin(y) + y, 2)
+        >>> mapped = MappedTape.from_tape(tape, "/scratch/tape")
+        >>> mapped.vjp(1.0, 2.0, cotangent=1.0)
+        (2.909297426825682, array([0.90929743, 0.58385316]))
+
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        if any(constant is not None and np.ndim(constant.value) != 0 for constant in tape._initial_slots):
+            raise ValueError("Only tapes of scalar functions can be spilled, found a batched constant")
+        owns_directory = directory is None
+        if owns_directory:
+            directory = tempfile.mkdtemp(prefix="autodiff_tape_")
+
+        operation_indices: Dict[str, int] = {}
+        parameter_indices: Dict[Tuple, int] = {}
+        max_operands = max([len(operand_slots) for _, operand_slots, _, _ in tape._instructions] + [1])
+        record = np.dtype(
+            [
+                ("operation", np.int32),
+                ("parameters", np.int32),
+                ("n_operands", np.int32),
+                ("operands", np.int64, (max_operands,)),
+                ("output", np.int64),
+            ]
+        )
+
+        instructions = open_memmap(
+            os.path.join(directory, cls._INSTRUCTIONS_FILE),
+            mode="w+",
+            dtype=record,
+            shape=(len(tape._instructions),),
+        )
+        for start in range(0, len(tape._instructions), chunk_size):
+            block = np.zeros(min(chunk_size, len(tape._instructions) - start), dtype=record)
+            block["operands"] = -1
+            for row, (operation, operand_slots, parameters, output_slot) in enumerate(
+                tape._instructions[start : start + chunk_size]
+            ):
+                block[row]["operation"] = operation_indices.setdefault(operation, len(operation_indices))
+                # parameters may not be hashable, they are interned by identity
+                block[row]["parameters"] = parameter_indices.setdefault(
+                    tuple(id(parameter) for parameter in parameters), len(parameter_indices)
+                )
+                block[row]["n_operands"] = len(operand_slots)
+                block[row]["operands"][: len(operand_slots)] = operand_slots
+                block[row]["output"] = output_slot
+            instructions[start : start + len(block)] = block
+        instructions.flush()
+
+        distinct_parameters = [()] * len(parameter_indices)
+        for _, _, parameters, _ in tape._instructions:
+            distinct_parameters[
+                parameter_indices[tuple(id(parameter) for parameter in parameters)]
+            ] = parameters
+
+        n_slots = len(tape._initial_slots)
+        values = open_memmap(
+            os.path.join(directory, cls._VALUES_FILE), mode="w+", dtype=float, shape=(n_slots,)
+        )
+        for slot, constant in enumerate(tape._initial_slots):
+            if constant is not None:
+                values[slot] = constant.value
+        values.flush()
+
+        adjoints = open_memmap(
+            os.path.join(directory, cls._ADJOINTS_FILE), mode="w+", dtype=float, shape=(n_slots,)
+        )
+        adjoints.flush()
+        del instructions, values, adjoints
+
+        return cls(
+            directory,
+            list(operation_indices),
+            distinct_parameters,
+            tape._input_slots,
+            tape._output_slots,
+            tape._vector_output,
+            chunk_size,
+            owns_directory,
+        )
+
+    @property
+    def directory(self) -> str:
+        """
+        Returns the directory holding the files of the tape
+
+        """
+        return self._directory
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the number of bytes stored on disk
+
+        """
+        self._check_open()
+        return self._instructions.nbytes + self._values.nbytes + self._adjoints.nbytes
+
+    def _check_open(self) -> None:
+        """
+        Verify that the memory maps have not been released by close
+
+        """
+        if self._instructions is None:
+            raise ValueError("Mapped tape is closed")
+
+    def __len__(self) -> int:
+        self._check_open()
+        return len(self._instructions)
+
+    def _chunks(self, reverse: bool = False):
+        """
+        Yields the instructions as lists of operation, parameters, operands and output, one chunk at a time.
+
+        """
+        starts = range(0, len(self._instructions), self._chunk_size)
+        for start in reversed(starts) if reverse else starts:
+            block = np.array(self._instructions[start : start + self._chunk_size])
+            rows = zip(
+                block["operation"].tolist(),
+                block["parameters"].tolist(),
+                block["n_operands"].tolist(),
+                block["operands"].tolist(),
+                block["output"].tolist(),
+            )
+            yield list(reversed(list(rows))) if reverse else rows
+
+    def _replay(self, inputs: Sequence[Union[int, float]]) -> List[float]:
+        """
+        Streams through the instructions and writes the value of every slot to the values file.
+
+        Returns
+        -------
+        List[float] :
+            values of the outputs.
+
+        """
+        self._check_open()
+        if len(inputs) != len(self._input_slots):
+            raise ValueError(
+                f"Tape was traced with {len(self._input_slots)} inputs, got {len(inputs)}"
+            )
+
+        values = self._values
+        for slot, value in zip(self._input_slots, inputs):
+            values[slot] = value
+
+        forward_rules, parameters = self._forward_rules, self._parameters
+        for chunk in self._chunks():
+            for operation, parameter_index, n_operands, operands, output in chunk:
+                primal_trace, _ = forward_rules[operation](
+                    *[_Trace(values[slot], 0) for slot in operands[:n_operands]],
+                    *parameters[parameter_index],
+                )
+                values[output] = primal_trace
+
+        return [float(values[slot]) for slot in self._output_slots]
+
+    def evaluate(self, *inputs: Union[int, float]) -> Union[float, NDArray[float]]:
+        """
+        Replays the tape at a new point, without derivatives.
+
+        Parameters
+        ----------
+        inputs : Union[int, float]
+            values of the inputs, in the order the traced function receives them.
+
+        Returns
+        -------
+        Union[float, NDArray[float]] :
+            value if the traced function returned a single node, otherwise the vector of values.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the number of inputs does not match the traced function, or the tape is closed
+
+        """
+        outputs = self._replay(inputs)
+        return np.array(outputs) if self._vector_output else outputs[0]
+
+    __call__ = evaluate
+
+    def vjp(
+        self, *inputs: Union[int, float], cotangent: Union[int, float, Sequence[float]]
+    ) -> Tuple[Union[float, NDArray[float]], NDArray[float]]:
+        """
+        Replays the tape at a new point, then multiplies a cotangent with the Jacobian in a reverse sweep
+        streaming backwards through the instructions, see Tape.vjp.
+
+        Parameters
+        ----------
+        inputs : Union[int, float]
+            values of the inputs, in the order the traced function receives them.
+        cotangent : Union[int, float, Sequence[float]]
+            weight of every output, a number if the traced function returned a single node.
+
+        Returns
+        -------
+        Tuple[Union[float, NDArray[float]], NDArray[float]] :
+            value, or vector of values, and product of the cotangent with the Jacobian, one entry per input.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the number of inputs or cotangent entries does not match the traced function,
+            or the tape is closed
+
+        """
+        cotangents = list(np.atleast_1d(cotangent))
+        if len(cotangents) != len(self._output_slots):
+            raise ValueError(
+                f"Cotangent must have {len(self._output_slots)} entries, got {len(cotangents)}"
+            )
+
+        outputs = self._replay(inputs)
+
+        values, adjoints = self._values, self._adjoints
+        adjoints[:] = 0
+        for slot, weight in zip(self._output_slots, cotangents):
+            adjoints[slot] += weight
+
+        forward_rules, parameters = self._forward_rules, self._parameters
+        for chunk in self._chunks(reverse=True):
+            for operation, parameter_index, n_operands, operands, output in chunk:
+                adjoint = adjoints[output]
+                if adjoint == 0:
+                    continue
+
+                operand_slots = operands[:n_operands]
+                partials = _instruction_partials(
+                    forward_rules[operation],
+                    [values[slot] for slot in operand_slots],
+                    parameters[parameter_index],
+                )
+                for slot, partial in zip(operand_slots, partials):
+                    adjoints[slot] += adjoint * partial
+
+        gradient = np.array([adjoints[slot] for slot in self._input_slots], dtype=float)
+        if not self._vector_output:
+            return outputs[0], gradient
+
+        return np.array(outputs), gradient
+
+    def flush(self) -> None:
+        """
+        Writes the values and adjoints held in memory back to disk.
+
+        """
+        self._check_open()
+        self._values.flush()
+        self._adjoints.flush()
+
+    def close(self) -> None:
+        """
+        Releases the memory maps and removes the temporary directory the tape was spilled to, if it created one.
+        Files written to a directory given to MappedTape.from_tape are kept. The tape cannot be evaluated once closed.
+
+        """
+        if self._instructions is None:
+            return
+
+        self._instructions = self._values = self._adjoints = None
+        if self._owns_directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self) -> MappedTape:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # attributes are missing if the files could not be opened in __init__
+        if getattr(self, "_instructions", None) is not None:
+            self.close()
+
+    def __repr__(self) -> str:
+        n_instructions = len(self._instructions) if self._instructions is not None else 0
+        return f"MappedTape(directory={self._directory!r}, instructions={n_instructions})"
+
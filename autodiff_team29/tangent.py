@@ -0,0 +1,167 @@
+from __future__ import annotations
+from numbers import Number
+from typing import Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class SparseTangent:
+    # results storing more than this fraction of their entries are returned as dense arrays
+    DENSIFY_THRESHOLD = 0.25
+
+    # numpy defers arithmetic with sparse tangents to the operators below instead of building object arrays
+    __array_ufunc__ = None
+
+    def __init__(self, indices: NDArray[int], values: NDArray[float], size: int) -> None:
+        """
+        Tangent vector of length size storing only its nonzero entries as sorted index and value pairs.
+        Nodes seeded with sparse tangents propagate derivatives at a cost proportional to the number of
+        stored entries rather than to the length of the seed vector. Arithmetic with scalars and other sparse
+        tangents stays sparse until the fill exceeds DENSIFY_THRESHOLD, anything else falls back to dense arrays.
+
+        Parameters
+        ----------
+        indices : NDArray[int]
+            sorted positions of the stored entries.
+        values : NDArray[float]
+            values of the stored entries.
+        size : int
+            length of the tangent vector.
+
+        Example
+        -------
+        >>> x = Node("x", 2, 1, seed_vector=SparseTangent.unit(0, 10_000))
+        >>> y = Node("y", 3, 1, seed_vector=SparseTangent.unit(1, 10_000))
+        >>> (x * y).derivative
+        SparseTangent(size=10000, indices=[0 1], values=[3. 2.])
+
+        """
+        self.indices = indices
+        self.values = values
+        self.size = size
+
+    @classmethod
+    def unit(cls, index: int, size: int, dtype: Union[str, type] = float) -> SparseTangent:
+        """
+        Returns the unit vector of the given length with a one at index
+
+        """
+        return cls(np.array([index]), np.ones(1, dtype=dtype), size)
+
+    @classmethod
+    def from_dense(cls, dense: Union[list, NDArray], dtype: Union[str, type] = float) -> SparseTangent:
+        """
+        Returns the sparse tangent storing the nonzero entries of a dense vector
+
+        """
+        dense = np.asarray(dense, dtype=dtype)
+        indices = np.flatnonzero(dense)
+        return cls(indices, dense[indices], len(dense))
+
+    @property
+    def shape(self) -> tuple:
+        return (self.size,)
+
+    @property
+    def ndim(self) -> int:
+        return 1
+
+    @property
+    def nnz(self) -> int:
+        """
+        Returns the number of stored entries
+
+        """
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the number of bytes held by the stored entries
+
+        """
+        return self.indices.nbytes + self.values.nbytes
+
+    def toarray(self) -> NDArray[float]:
+        """
+        Returns the tangent as a dense array
+
+        """
+        dense = np.zeros(self.size, dtype=self.values.dtype)
+        dense[self.indices] = self.values
+        return dense
+
+    def __array__(self, dtype=None, copy=None) -> NDArray[float]:
+        return self.toarray() if dtype is None else self.toarray().astype(dtype)
+
+    def _new(
+        self, indices: NDArray[int], values: NDArray[float]
+    ) -> Union[SparseTangent, NDArray[float]]:
+        """
+        Returns a tangent of the same length, densified if it stores too many entries.
+
+        """
+        if len(indices) > self.DENSIFY_THRESHOLD * self.size:
+            dense = np.zeros(self.size, dtype=values.dtype)
+            dense[indices] = values
+            return dense
+
+        return SparseTangent(indices, values, self.size)
+
+    @staticmethod
+    def _is_scalar(other) -> bool:
+        return isinstance(other, Number) or (
+            isinstance(other, np.ndarray) and other.ndim == 0
+        )
+
+    def __add__(self, other) -> Union[SparseTangent, NDArray[float]]:
+        if isinstance(other, SparseTangent) and other.size == self.size:
+            if other.indices is self.indices or np.array_equal(other.indices, self.indices):
+                return self._new(self.indices, self.values + other.values)
+
+            # entries at the same index are summed
+            indices, inverse = np.unique(
+                np.concatenate((self.indices, other.indices)), return_inverse=True
+            )
+            values = np.bincount(
+                inverse, weights=np.concatenate((self.values, other.values)), minlength=len(indices)
+            )
+            return self._new(indices, values)
+
+        # constants carry a zero derivative, adding it keeps the tangent sparse
+        if self._is_scalar(other) and other == 0:
+            return self
+
+        return self.toarray() + np.asarray(other)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> SparseTangent:
+        return SparseTangent(self.indices, -self.values, self.size)
+
+    def __sub__(self, other) -> Union[SparseTangent, NDArray[float]]:
+        return self + (-other)
+
+    def __rsub__(self, other) -> Union[SparseTangent, NDArray[float]]:
+        return (-self) + other
+
+    def __mul__(self, other) -> Union[SparseTangent, NDArray[float]]:
+        if self._is_scalar(other):
+            return SparseTangent(self.indices, self.values * other, self.size)
+
+        return self.toarray() * np.asarray(other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other) -> Union[SparseTangent, NDArray[float]]:
+        if self._is_scalar(other):
+            return SparseTangent(self.indices, self.values / other, self.size)
+
+        return self.toarray() / np.asarray(other)
+
+    def __rtruediv__(self, other) -> NDArray[float]:
+        return np.asarray(other) / self.toarray()
+
+    def __repr__(self) -> str:
+        return f"SparseTangent(size={self.size}, indices={self.indices}, values={self.values})"
@@ -0,0 +1,578 @@
+from __future__ import annotations
+from typing import Callable, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from autodiff_team29.arena import TangentArena
+from autodiff_team29.node import Node, _Trace
+
+
+def _linearized_tangent_kernel(
+    forward_rule: Callable[..., Tuple], n_operands: int
+) -> Callable[..., Union[float, NDArray]]:
+    """
+    Returns a tangent kernel for an operation without a dedicated one, see Node._TANGENT_KERNELS.
+    The partial derivatives are obtained from the forward rule by seeding a unit tangent on one operand at a time,
+    so only scalars, or columns for batched values, are allocated and the tangent is accumulated in place.
+
+    Parameters
+    ----------
+    forward_rule : Callable[..., Tuple]
+        forward rule of the operation.
+    n_operands : int
+        number of operands of the operation, the remaining arguments are its parameters.
+
+    Returns
+    -------
+    Callable[..., Union[float, NDArray]] :
+        kernel writing the tangent trace to out and returning the primal trace.
+
+    """
+
+    def unary_kernel(out: NDArray, scratch: NDArray, x, *parameters) -> Union[float, NDArray]:
+        primal_trace, partial = forward_rule(_Trace(x.value, 1), *parameters)
+        np.multiply(x.derivative, partial, out=out)
+        return primal_trace
+
+    def kernel(out: NDArray, scratch: NDArray, *arguments) -> Union[float, NDArray]:
+        operands, parameters = arguments[:n_operands], arguments[n_operands:]
+        values = [operand.value for operand in operands]
+
+        primal_trace = None
+        for seeded_index, operand in enumerate(operands):
+            # constants carry a zero derivative and do not contribute to the tangent
+            if isinstance(operand.derivative, (int, float)) and operand.derivative == 0:
+                continue
+
+            seeded_operands = [
+                _Trace(value, 1 if index == seeded_index else 0)
+                for index, value in enumerate(values)
+            ]
+            contribution = out if primal_trace is None else scratch
+            primal_trace, partial = forward_rule(*seeded_operands, *parameters)
+            np.multiply(operand.derivative, partial, out=contribution)
+            if contribution is scratch:
+                np.add(out, scratch, out=out)
+
+        if primal_trace is None:
+            out.fill(0)
+            primal_trace, _ = forward_rule(*operands, *parameters)
+
+        return primal_trace
+
+    return unary_kernel if n_operands == 1 else kernel
+
+
+def _instruction_partials(
+    forward_rule: Callable[..., Tuple], values: List[Union[float, NDArray]], parameters: Tuple
+) -> List[Union[float, NDArray]]:
+    """
+    Returns the partial derivatives of an instruction with respect to each of its operands, obtained from
+    the forward rule by seeding a unit tangent on one operand at a time, see _local_partials.
+
+    """
+    partials = []
+    for seeded_index in range(len(values)):
+        _, partial = forward_rule(
+            *[
+                _Trace(value, 1 if index == seeded_index else 0)
+                for index, value in enumerate(values)
+            ],
+            *parameters,
+        )
+        partials.append(partial)
+
+    return partials
+
+
+class Tape:
+    def __init__(
+        self,
+        instructions: List[Tuple[str, Tuple[int, ...], Tuple, int]],
+        input_slots: Tuple[int, ...],
+        constant_slots: List[Tuple[int, _Trace]],
+        output_slots: Tuple[int, ...],
+        n_slots: int,
+        vector_output: bool,
+    ) -> None:
+        """
+        Flat instruction tape recorded by trace. Every instruction applies the forward rule of an operation
+        to the traces stored in its operand slots and writes the result to its output slot.
+        Evaluating the tape at a new point replays the instructions without creating nodes,
+        looking up the registry or formatting symbols.
+
+        Parameters
+        ----------
+        instructions : List[Tuple[str, Tuple[int, ...], Tuple, int]]
+            operation, operand slots, parameters and output slot of every instruction in evaluation order.
+        input_slots : Tuple[int, ...]
+            slots holding the inputs of the traced function.
+        constant_slots : List[Tuple[int, _Trace]]
+            slots holding the constants of the traced function together with their trace.
+        output_slots : Tuple[int, ...]
+            slots holding the outputs of the traced function.
+        n_slots : int
+            total number of slots.
+        vector_output : bool
+            whether the traced function returned a list of nodes rather than a single node.
+
+        """
+        self._instructions = instructions
+        self._input_slots = input_slots
+        self._output_slots = output_slots
+        self._vector_output = vector_output
+
+        # rules are resolved once so that replaying only indexes into the slots
+        self._program = [
+            (Node._FORWARD_RULES[operation], operand_slots, parameters, output_slot)
+            for operation, operand_slots, parameters, output_slot in instructions
+        ]
+
+        # in-place evaluation writes the tangent of instruction i to row i of the arena
+        self._kernel_program = [
+            (
+                Node._TANGENT_KERNELS.get(operation)
+                or _linearized_tangent_kernel(Node._FORWARD_RULES[operation], len(operand_slots)),
+                operand_slots,
+                parameters,
+                output_slot,
+            )
+            for operation, operand_slots, parameters, output_slot in instructions
+        ]
+        self._arena = TangentArena()
+
+        self._initial_slots = [None] * n_slots
+        for slot, constant in constant_slots:
+            self._initial_slots[slot] = constant
+
+        self._seed_vectors = np.identity(len(input_slots), dtype=Node._active_dtype())
+
+        # NumPy function generated from the tape, see compile_tape
+        self._compiled = None
+
+    @classmethod
+    def _record(
+        cls, inputs: List[Node], outputs: List[Node], vector_output: bool = True
+    ) -> Tape:
+        """
+        Records the graph the outputs were computed from as a tape. The inputs become the arguments of the tape,
+        every other node without operands is recorded as a constant.
+
+        Parameters
+        ----------
+        inputs : List[Node]
+            nodes whose values are passed to the tape when it is evaluated.
+        outputs : List[Node]
+            nodes computed from the inputs.
+        vector_output : bool, default=True
+            whether evaluating the tape returns a vector of values and a Jacobian rather than a value and a gradient.
+
+        Returns
+        -------
+        Tape :
+            tape evaluating the outputs.
+
+        """
+        slots = {id(node): slot for slot, node in enumerate(inputs)}
+        instructions = []
+        constant_slots = []
+        for node in Node._topological_order(outputs):
+            if id(node) in slots:
+                continue
+
+            slots[id(node)] = len(slots)
+            if node._operation is None:
+                constant_slots.append(
+                    (slots[id(node)], _Trace(node.value, node.derivative))
+                )
+            else:
+                operand_slots = tuple(slots[id(operand)] for operand in node._operands)
+                instructions.append(
+                    (node._operation, operand_slots, node._parameters, slots[id(node)])
+                )
+
+        return cls(
+            instructions,
+            tuple(range(len(inputs))),
+            constant_slots,
+            tuple(slots[id(output)] for output in outputs),
+            len(slots),
+            vector_output,
+        )
+
+    @property
+    def instructions(self) -> List[Tuple[str, Tuple[int, ...], Tuple, int]]:
+        """
+        Returns the operation, operand slots, parameters and output slot of every instruction on the tape
+
+        """
+        return list(self._instructions)
+
+    @property
+    def n_inputs(self) -> int:
+        """
+        Returns the number of inputs of the traced function
+
+        """
+        return len(self._input_slots)
+
+    @property
+    def arena(self) -> TangentArena:
+        """
+        Returns the arena holding the tangents of in-place evaluations
+
+        """
+        return self._arena
+
+    def __len__(self) -> int:
+        return len(self._instructions)
+
+    def evaluate(
+        self,
+        *inputs: Union[int, float, NDArray],
+        seed_vectors: NDArray = None,
+        out: NDArray = None,
+    ) -> Tuple[Union[float, NDArray], NDArray]:
+        """
+        Replays the tape at a new point.
+
+        Parameters
+        ----------
+        inputs : Union[int, float, NDArray]
+            values of the inputs, in the order the traced function receives them.
+            1-D arrays of equal length evaluate the tape at a batch of points at once.
+        seed_vectors : NDArray, optional
+            array of shape (n_inputs, n_directions) holding the seed vector of every input.
+            Defaults to the identity, which differentiates with respect to every input.
+        out : NDArray, optional
+            array the gradient or Jacobian is written to, and returned. Tangents are then computed in place, in the dtype
+            of out, in the rows of the arena of the tape, so evaluating repeatedly at the same shape allocates no tangent memory.
+            A tape evaluating in place must not be shared between threads.
+
+        Returns
+        -------
+        Tuple[Union[float, NDArray], NDArray] :
+            value and gradient with respect to the inputs if the traced function returned a single node,
+            otherwise the vector of values and the Jacobian. Batched evaluations prepend the batch dimension.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the number of inputs or seed vectors does not match the traced function,
+            or out does not have the shape of the derivative
+
+        """
+        if len(inputs) != len(self._input_slots):
+            raise ValueError(
+                f"Tape was traced with {len(self._input_slots)} inputs, got {len(inputs)}"
+            )
+
+        if seed_vectors is None:
+            seed_vectors = self._seed_vectors
+        elif np.ndim(seed_vectors) != 2 or len(seed_vectors) != len(inputs):
+            raise ValueError(
+                f"Seed vectors must have shape ({len(inputs)}, n_directions), got {np.shape(seed_vectors)}"
+            )
+
+        if out is not None:
+            return self._evaluate_in_place(inputs, seed_vectors, out)
+
+        slots = list(self._initial_slots)
+        for input_slot, value, seed_vector in zip(
+            self._input_slots, inputs, seed_vectors
+        ):
+            slots[input_slot] = _Trace(value, seed_vector)
+
+        for forward_rule, operand_slots, parameters, output_slot in self._program:
+            slots[output_slot] = _Trace(
+                *forward_rule(*[slots[slot] for slot in operand_slots], *parameters)
+            )
+
+        # outputs that do not depend on every input, or on the batch, are broadcast to full shape
+        outputs = [slots[slot] for slot in self._output_slots]
+        values = np.broadcast_arrays(*[output.value for output in outputs])
+        derivative_shape = values[0].shape + (np.shape(seed_vectors)[1],)
+        derivatives = [
+            output.derivative
+            if np.shape(output.derivative) == derivative_shape
+            else np.broadcast_to(output.derivative, derivative_shape)
+            for output in outputs
+        ]
+        if not self._vector_output:
+            return outputs[0].value, derivatives[0]
+
+        return np.stack(values, axis=-1), np.stack(derivatives, axis=-2)
+
+    __call__ = evaluate
+
+    def _evaluate_in_place(
+        self,
+        inputs: Tuple[Union[int, float, NDArray], ...],
+        seed_vectors: NDArray,
+        out: NDArray,
+    ) -> Tuple[Union[float, NDArray], NDArray]:
+        """
+        Replays the tape with the tangent kernels, writing every tangent to a row of the arena
+        and the derivatives of the outputs to out. See evaluate.
+
+        """
+        tangent_shape = np.broadcast_shapes(*[np.shape(value) for value in inputs]) + (
+            np.shape(seed_vectors)[1],
+        )
+        derivative_shape = tangent_shape
+        if self._vector_output:
+            derivative_shape = tangent_shape[:-1] + (len(self._output_slots), tangent_shape[-1])
+        if np.shape(out) != derivative_shape:
+            raise ValueError(f"Output must have shape {derivative_shape}, got {np.shape(out)}")
+
+        # the last row is the scratch space of the kernels
+        rows = self._arena.reserve(len(self._kernel_program) + 1, tangent_shape, out.dtype)
+        scratch = rows[-1]
+
+        slots = list(self._initial_slots)
+        for input_slot, value, seed_vector in zip(
+            self._input_slots, inputs, seed_vectors
+        ):
+            slots[input_slot] = _Trace(value, seed_vector)
+
+        for row, (kernel, operand_slots, parameters, output_slot) in zip(
+            rows, self._kernel_program
+        ):
+            primal_trace = kernel(
+                row, scratch, *[slots[slot] for slot in operand_slots], *parameters
+            )
+            slots[output_slot] = _Trace(primal_trace, row)
+
+        outputs = [slots[slot] for slot in self._output_slots]
+        if not self._vector_output:
+            np.copyto(out, outputs[0].derivative)
+            return outputs[0].value, out
+
+        for index, output in enumerate(outputs):
+            np.copyto(out[..., index, :], output.derivative)
+        values = np.broadcast_arrays(*[output.value for output in outputs])
+        return np.stack(values, axis=-1), out
+
+    def _replay_values(self, inputs: Sequence[Union[int, float]]) -> List[Union[float, NDArray]]:
+        """
+        Replays the primal trace of the tape, without tangents.
+
+        Returns
+        -------
+        List[Union[float, NDArray]] :
+            value held by every slot.
+
+        """
+        slots = [None if trace is None else trace.value for trace in self._initial_slots]
+        for input_slot, value in zip(self._input_slots, inputs):
+            slots[input_slot] = value
+
+        for forward_rule, operand_slots, parameters, output_slot in self._program:
+            slots[output_slot], _ = forward_rule(
+                *[_Trace(slots[slot], 0) for slot in operand_slots], *parameters
+            )
+
+        return slots
+
+    def _replay_second_order(
+        self,
+        inputs: Sequence[float],
+        tangents: Sequence[Union[NDArray[float], None]],
+        hessians: Sequence[Union[NDArray[float], None]],
+    ) -> Tuple[List[float], List[NDArray[float]], List[NDArray[float]]]:
+        """
+        Replays the tape at a point and propagates first and second order tangents forward over forward,
+        like Node._hessians. A slot g computed from operands u_i has tangent sum_i dg/du_i t_i and second order tangent
+        sum_i dg/du_i H_i + sum_ij d2g/du_i du_j outer(t_i, t_j). Only supports tapes of scalar functions.
+
+        Parameters
+        ----------
+        inputs : Sequence[float]
+            values of the inputs.
+        tangents : Sequence[Union[NDArray[float], None]]
+            tangent of every input along the seed directions, None for inputs that do not depend on them.
+        hessians : Sequence[Union[NDArray[float], None]]
+            second order tangent of every input, a square matrix over the seed directions, None if it is zero.
+
+        Returns
+        -------
+        Tuple[List[float], List[NDArray[float]], List[NDArray[float]]] :
+            value, tangent and second order tangent of every output.
+
+        """
+        n_seeds = next(len(tangent) for tangent in tangents if tangent is not None)
+        slots = self._replay_values(inputs)
+        slot_tangents = [None] * len(slots)
+        slot_hessians = [None] * len(slots)
+        for input_slot, tangent, hessian in zip(self._input_slots, tangents, hessians):
+            slot_tangents[input_slot] = tangent
+            slot_hessians[input_slot] = hessian
+
+        for (operation, _, _, _), (forward_rule, operand_slots, parameters, output_slot) in zip(
+            self._instructions, self._program
+        ):
+            operand_tangents = [slot_tangents[slot] for slot in operand_slots]
+            if all(tangent is None for tangent in operand_tangents):
+                continue
+
+            values = [slots[slot] for slot in operand_slots]
+            partials = _instruction_partials(forward_rule, values, parameters)
+            second_partials = Node._SECOND_DERIVATIVE_RULES[operation](
+                *[_Trace(value, 0) for value in values], *parameters
+            )
+
+            tangent = np.zeros(n_seeds)
+            hessian = np.zeros((n_seeds, n_seeds))
+            for i, (partial, tangent_i) in enumerate(zip(partials, operand_tangents)):
+                if tangent_i is None:
+                    continue
+
+                tangent += partial * tangent_i
+                if slot_hessians[operand_slots[i]] is not None:
+                    hessian += partial * slot_hessians[operand_slots[i]]
+                for j, tangent_j in enumerate(operand_tangents):
+                    if tangent_j is not None:
+                        hessian += second_partials[i][j] * np.outer(tangent_i, tangent_j)
+
+            slot_tangents[output_slot] = tangent
+            slot_hessians[output_slot] = hessian
+
+        return (
+            [slots[slot] for slot in self._output_slots],
+            [
+                np.zeros(n_seeds) if slot_tangents[slot] is None else slot_tangents[slot]
+                for slot in self._output_slots
+            ],
+            [
+                np.zeros((n_seeds, n_seeds)) if slot_hessians[slot] is None else slot_hessians[slot]
+                for slot in self._output_slots
+            ],
+        )
+
+    def vjp(
+        self, *inputs: Union[int, float], cotangent: Union[int, float, Sequence[float]]
+    ) -> Tuple[Union[float, NDArray], NDArray]:
+        """
+        Replays the tape at a new point and multiplies a cotangent with the Jacobian in a single reverse sweep,
+        without forming the Jacobian. The partials of every instruction are obtained from its forward rule,
+        as in the reverse module.
+
+        Parameters
+        ----------
+        inputs : Union[int, float]
+            values of the inputs, in the order the traced function receives them.
+        cotangent : Union[int, float, Sequence[float]]
+            weight of every output, a number if the traced function returned a single node.
+
+        Returns
+        -------
+        Tuple[Union[float, NDArray], NDArray] :
+            value, or vector of values, and product of the cotangent with the Jacobian, one entry per input.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the number of inputs or cotangent entries does not match the traced function
+
+        Example
+        -------
+        >>> tape = trace(lambda x, y: [x * y, x - 2 * y], 2)
+        >>> tape.vjp(2.0, 3.0, cotangent=[1.0, 1.0])
+        (array([ 6., -4.]), array([4., 0.]))
+
+        """
+        if len(inputs) != len(self._input_slots):
+            raise ValueError(
+                f"Tape was traced with {len(self._input_slots)} inputs, got {len(inputs)}"
+            )
+
+        cotangents = list(np.atleast_1d(cotangent))
+        if len(cotangents) != len(self._output_slots):
+            raise ValueError(
+                f"Cotangent must have {len(self._output_slots)} entries, got {len(cotangents)}"
+            )
+
+        slots = self._replay_values(inputs)
+        adjoints = [0.0] * len(slots)
+        for output_slot, weight in zip(self._output_slots, cotangents):
+            adjoints[output_slot] = adjoints[output_slot] + weight
+
+        for forward_rule, operand_slots, parameters, output_slot in reversed(self._program):
+            adjoint = adjoints[output_slot]
+            if isinstance(adjoint, float) and adjoint == 0:
+                continue
+
+            partials = _instruction_partials(
+                forward_rule, [slots[slot] for slot in operand_slots], parameters
+            )
+            for slot, partial in zip(operand_slots, partials):
+                adjoints[slot] = adjoints[slot] + adjoint * partial
+
+        values = [slots[slot] for slot in self._output_slots]
+        gradient = np.array([adjoints[slot] for slot in self._input_slots], dtype=float)
+        if not self._vector_output:
+            return values[0], gradient
+
+        return np.array(values), gradient
+
+    def __repr__(self) -> str:
+        return f"Tape(n_inputs={self.n_inputs}, instructions={len(self)})"
+
+
+def trace(
+    fn: Callable[..., Union[Node, List[Node]]],
+    n_inputs: int,
+    point: Sequence[Union[int, float]] = None,
+) -> Tape:
+    """
+    Runs a function built from Node operations and elementaries once and records it as a flat instruction tape.
+    The function is traced in an isolated registry scope, so tracing neither reads nor modifies the active registry.
+    Python control flow is recorded as it was taken at the tracing point, so branches depending on the value
+    of an input are fixed at tracing time.
+
+    Parameters
+    ----------
+    fn : Callable[..., Union[Node, List[Node]]]
+        function receiving n_inputs nodes and returning a node or a list of nodes.
+    n_inputs : int
+        number of inputs of fn.
+    point : Sequence[Union[int, float]], optional
+        point the function is traced at. Defaults to 0.5 for every input, which lies within the domain of every elementary.
+
+    Returns
+    -------
+    Tape :
+        tape that evaluates the value and derivative of fn at new points.
+
+    Raises
+    ------
+    ValueError :
+        Raise value error if fn does not return a Node or a list of Nodes
+
+    Example
+    -------
+    >>> tape = trace(lambda x, y: [x * y, sin(x)], 2)
+    >>> value, jacobian = tape(1.0, 2.0)
+
+    """
+    if point is None:
+        point = [0.5] * n_inputs
+    if len(point) != n_inputs:
+        raise ValueError(f"Tracing point must have {n_inputs} values, got {len(point)}")
+
+    seed_vectors = np.identity(n_inputs, dtype=Node._active_dtype())
+    with Node.registry_scope(policy="isolated"):
+        inputs = [
+            Node(f"_tape_input_{index}", value, 1, seed_vector=seed_vector)
+            for index, (value, seed_vector) in enumerate(zip(point, seed_vectors))
+        ]
+        outputs = fn(*inputs)
+
+    vector_output = isinstance(outputs, (list, tuple))
+    if not vector_output:
+        outputs = [outputs]
+    if not all(isinstance(output, Node) for output in outputs):
+        raise ValueError("Traced function must return a Node or a list of Nodes")
+
+    return Tape._record(inputs, outputs, vector_output)
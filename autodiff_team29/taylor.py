@@ -0,0 +1,185 @@
+from __future__ import annotations
+from math import factorial
+from typing import Callable, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from autodiff_team29.node import Node
+
+
+class Taylor:
+    # no instance dictionary, a truncated series only stores its coefficients
+    __slots__ = ("coefficients",)
+
+    def __init__(self, coefficients: Union[Sequence[float], NDArray]) -> None:
+        """
+        Truncated Taylor series of a function of t along a line through a point. Coefficient k is
+        the k-th derivative at t = 0 divided by k!. Operators and elementaries propagate the coefficients with
+        the recurrences of Node._TAYLOR_RULES, so every operation costs O(order ** 2) instead of
+        the exponential growth of nesting first order derivatives. Numbers are treated as constants.
+
+        Parameters
+        ----------
+        coefficients : Union[Sequence[float], NDArray]
+            Taylor coefficients from order 0 up to the truncation order.
+
+        Example
+        -------
+        >>> x = Taylor.variable(0.0, order=5)
+        >>> exp(x).derivatives()
+        array([1., 1., 1., 1., 1., 1.])
+
+        """
+        self.coefficients = np.asarray(coefficients, dtype=float)
+
+    @classmethod
+    def variable(
+        cls, value: Union[int, float], direction: Union[int, float] = 1, order: int = 1
+    ) -> Taylor:
+        """
+        Returns the series of value + t * direction truncated at the given order
+
+        """
+        if order < 1:
+            raise ValueError(f"Order must be positive, got {order}")
+
+        coefficients = np.zeros(order + 1)
+        coefficients[0] = value
+        coefficients[1] = direction
+        return cls(coefficients)
+
+    @property
+    def value(self) -> float:
+        """
+        Returns the value of the series at t = 0
+
+        """
+        return self.coefficients[0]
+
+    @property
+    def order(self) -> int:
+        """
+        Returns the truncation order of the series
+
+        """
+        return len(self.coefficients) - 1
+
+    def derivatives(self) -> NDArray[float]:
+        """
+        Returns the derivatives with respect to t at t = 0, from order 0 up to the truncation order
+
+        """
+        return self.coefficients * [factorial(k) for k in range(len(self.coefficients))]
+
+    def _lift(self, other: Union[int, float, Taylor]) -> Taylor:
+        """
+        Returns other as a series of the same order, numbers being constants.
+
+        """
+        if isinstance(other, Taylor):
+            return other
+
+        coefficients = np.zeros(len(self.coefficients))
+        coefficients[0] = other
+        return Taylor(coefficients)
+
+    @classmethod
+    def _apply_operation(
+        cls, operation: str, operands: Tuple[Taylor, ...], parameters: Tuple = ()
+    ) -> Taylor:
+        """
+        Returns the series resulting from applying an operation to its operands with its Taylor rule.
+
+        """
+        return cls(Node._TAYLOR_RULES[operation](*operands, *parameters))
+
+    def __add__(self, other: Union[int, float, Taylor]) -> Taylor:
+        return self._apply_operation("+", (self, self._lift(other)))
+
+    def __radd__(self, other: Union[int, float]) -> Taylor:
+        return self.__add__(other)
+
+    def __sub__(self, other: Union[int, float, Taylor]) -> Taylor:
+        return self._apply_operation("-", (self, self._lift(other)))
+
+    def __rsub__(self, other: Union[int, float]) -> Taylor:
+        return self._apply_operation("-", (self._lift(other), self))
+
+    def __mul__(self, other: Union[int, float, Taylor]) -> Taylor:
+        return self._apply_operation("*", (self, self._lift(other)))
+
+    def __rmul__(self, other: Union[int, float]) -> Taylor:
+        return self.__mul__(other)
+
+    def __truediv__(self, other: Union[int, float, Taylor]) -> Taylor:
+        return self._apply_operation("/", (self, self._lift(other)))
+
+    def __rtruediv__(self, other: Union[int, float]) -> Taylor:
+        return self._apply_operation("/", (self._lift(other), self))
+
+    def __neg__(self) -> Taylor:
+        return self._apply_operation("neg", (self,))
+
+    def __pow__(self, exponent: Union[int, float, Taylor]) -> Taylor:
+        return self._apply_operation("**", (self, self._lift(exponent)))
+
+    def __rpow__(self, base: Union[int, float]) -> Taylor:
+        return self._apply_operation("**", (self._lift(base), self))
+
+    def __repr__(self) -> str:
+        return f"Taylor({self.coefficients})"
+
+
+def taylor_derivatives(
+    fn: Callable[..., Taylor],
+    x: Union[int, float, Sequence[float]],
+    v: Union[int, float, Sequence[float]],
+    order: int,
+) -> NDArray[float]:
+    """
+    Computes the derivatives of t -> fn(x + t * v) at t = 0 up to the given order with a single Taylor mode pass.
+
+    Parameters
+    ----------
+    fn : Callable[..., Taylor]
+        function built from operators and elementaries. It receives a series if evaluated at a number,
+        otherwise a list of series, and returns a series.
+    x : Union[int, float, Sequence[float]]
+        point the derivatives are taken at.
+    v : Union[int, float, Sequence[float]]
+        direction the derivatives are taken along, of the shape of x.
+    order : int
+        highest order of the derivatives.
+
+    Returns
+    -------
+    NDArray[float] :
+        derivatives from order 0, the value of fn, up to order.
+
+    Raises
+    ------
+    ValueError :
+        Raise value error if x and v differ in length, or fn does not return a Taylor series
+
+    Example
+    -------
+    >>> taylor_derivatives(lambda x: x[0] * sin(x[1]), [2.0, 0.0], [0.0, 1.0], 4)
+    array([ 0.,  2.,  0., -2.,  0.])
+
+    """
+    scalar_input = isinstance(x, Node._COMPATIBLE_VALUE_TYPES)
+    values = [x] if scalar_input else list(x)
+    directions = [v] if scalar_input else list(v)
+    if len(values) != len(directions):
+        raise ValueError(f"Point has {len(values)} values but direction has {len(directions)}")
+
+    inputs = [
+        Taylor.variable(value, direction, order)
+        for value, direction in zip(values, directions)
+    ]
+    output = fn(inputs[0] if scalar_input else inputs)
+    if not isinstance(output, Taylor):
+        raise ValueError("Differentiated function must return a Taylor series")
+
+    return output.derivatives()
@@ -1,9 +1,44 @@
-from typing import List
+from typing import Dict, List, Union
 
 import numpy as np
 from numpy.typing import NDArray
 
 from autodiff_team29 import Node
+from autodiff_team29.reverse import backward
+from autodiff_team29.sparse import (
+    SparseJacobian,
+    _pattern_rows,
+    color_columns,
+    propagate_index_sets,
+)
+from autodiff_team29.tape import Tape
+
+# chunked Jacobians keep the tangents of every node of a chunk within this many bytes, about the size of a cache,
+# and propagate at most _MAX_CHUNK_SIZE directions per pass
+_CHUNK_BYTES = 2**22
+_MAX_CHUNK_SIZE = 64
+
+
+def _default_chunk_size(n_directions: int, n_nodes: int) -> int:
+    """
+    Chooses how many seed directions are propagated per pass.
+
+    Parameters
+    ----------
+    n_directions : int
+        number of columns of the Jacobian.
+    n_nodes : int
+        number of nodes whose tangents are held during a pass.
+
+    Returns
+    -------
+    int :
+        number of directions per pass, between 1 and n_directions.
+
+    """
+    chunk_size = _CHUNK_BYTES // (8 * max(n_nodes, 1))
+    return int(max(1, min(chunk_size, _MAX_CHUNK_SIZE, n_directions)))
+
 
 
 class VectorFunction:
@@ -38,6 +73,10 @@ class VectorFunction:
         else:
             raise ValueError("functions argument must be a list of Nodes")
 
+        self._inputs = None
+        self._tape = None
+        self._sparsity_patterns = {}
+
     @property
     def symbol(self) -> str:
         """
@@ -61,3 +100,368 @@ class VectorFunction:
 
         """
         return np.array([function.derivative for function in self._functions])
+
+    @property
+    def hessian(self) -> NDArray[float]:
+        """
+        Returns the Hessians of the functions with respect to the seed directions of their inputs, see Node.hessian.
+        The graph shared by the functions is walked once.
+
+        """
+        return np.array(Node._hessians(self._functions))
+
+    def compute_jacobian(
+        self, chunk_size: int = None, wrt: List[Node] = None
+    ) -> NDArray[float]:
+        """
+        Computes the Jacobian by propagating the seed directions in chunks. Only the tangents of one chunk are held
+        at a time, so memory is bounded by the chunk size rather than the number of columns of the Jacobian.
+        The graph of the functions is recorded once and replayed for every chunk.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            number of seed directions propagated per pass. By default the tangents of a pass are kept
+            within a few megabytes and at most 64 directions are propagated at once.
+        wrt : List[Node], optional
+            input nodes the columns of the Jacobian are taken with respect to, in order. The derivatives and seed
+            vectors stored on the inputs are ignored, so the functions can be built without seed vectors.
+            By default the columns follow the seed vectors of the inputs, as in jacobian.
+
+        Returns
+        -------
+        NDArray[float] :
+            Jacobian of shape (n_functions, n_directions).
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the chunk size is not positive or a node of wrt is not an input of the vector function
+
+        Example
+        -------
+        >>> x = Node("x", 2, 1)
+        >>> y = Node("y", 3, 1)
+        >>> f = VectorFunction([x * y, x - 2 * y])
+        >>> f.compute_jacobian(chunk_size=1, wrt=[x, y])
+        array([[ 3.,  2.],
+               [ 1., -2.]])
+
+        """
+        n_columns = self._count_columns(wrt)
+        return self._compressed_jacobian(np.arange(n_columns), n_columns, wrt, chunk_size)
+
+    def sparsity_pattern(self, wrt: List[Node] = None) -> List[List[int]]:
+        """
+        Detects the sparsity pattern of the Jacobian by propagating the sets of columns every node depends on
+        through the graph, instead of tangents. The pattern only depends on the structure of the graph and the columns
+        of the inputs, so it is computed once and reused after the inputs are updated to new points.
+
+        Parameters
+        ----------
+        wrt : List[Node], optional
+            input nodes the columns of the Jacobian are taken with respect to, see compute_jacobian.
+            By default an input depends on the columns where its seed vector is nonzero.
+
+        Returns
+        -------
+        List[List[int]] :
+            sorted column indices of the structural nonzeros of every function.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if a node of wrt is not an input of the vector function
+
+        Example
+        -------
+        >>> x = [Node(f"x{i}", i + 1, 1) for i in range(4)]
+        >>> f = VectorFunction([x[i] * x[i + 1] for i in range(3)])
+        >>> f.sparsity_pattern(wrt=x)
+        [[0, 1], [1, 2], [2, 3]]
+
+        """
+        inputs = list(self.inputs.values())
+        input_sets = {}
+        if wrt is None:
+            n_columns = self._count_columns()
+            for node in inputs:
+                seed_vector = np.broadcast_to(node.derivative, n_columns)
+                input_sets[id(node)] = frozenset(np.flatnonzero(seed_vector).tolist())
+        else:
+            input_ids = {id(node) for node in inputs}
+            if not all(id(node) in input_ids for node in wrt):
+                raise ValueError("Jacobians can only be taken with respect to inputs of the vector function")
+
+            for column, node in enumerate(wrt):
+                input_sets[id(node)] = input_sets.get(id(node), frozenset()) | {column}
+
+        # keyed on the columns of every input, so updating the seed vectors of the inputs detects a new pattern
+        cache_key = tuple(input_sets.items())
+        if cache_key in self._sparsity_patterns:
+            return self._sparsity_patterns[cache_key]
+
+        pattern = [
+            sorted(index_set)
+            for index_set in propagate_index_sets(self._functions, input_sets)
+        ]
+        self._sparsity_patterns[cache_key] = pattern
+        return pattern
+
+    def sparse_jacobian(
+        self,
+        sparsity: Union[NDArray[bool], List[List[int]]] = None,
+        chunk_size: int = None,
+        wrt: List[Node] = None,
+    ) -> SparseJacobian:
+        """
+        Computes a sparse Jacobian from its sparsity pattern. Columns that never have a nonzero in the same row
+        are grouped by graph coloring and propagated together as the sum of their seed directions,
+        so the number of directions propagated is the number of colors rather than the number of columns.
+
+        Parameters
+        ----------
+        sparsity : Union[NDArray[bool], List[List[int]]], optional
+            boolean array of shape (n_functions, n_columns), or the column indices of the nonzeros of every function.
+            Derivatives outside the pattern are assumed to be zero. Detected with sparsity_pattern if not given.
+        chunk_size : int, optional
+            number of colors propagated per pass, see compute_jacobian.
+        wrt : List[Node], optional
+            input nodes the columns of the Jacobian are taken with respect to, see compute_jacobian.
+
+        Returns
+        -------
+        SparseJacobian :
+            Jacobian in coordinate format, with one entry per nonzero of the pattern.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the pattern does not have one row per function
+
+        Example
+        -------
+        >>> x = [Node(f"x{i}", i + 1, 1) for i in range(4)]
+        >>> f = VectorFunction([x[i] * x[i + 1] for i in range(3)])
+        >>> f.sparse_jacobian([[0, 1], [1, 2], [2, 3]], wrt=x).toarray()
+        array([[2., 1., 0., 0.],
+               [0., 3., 2., 0.],
+               [0., 0., 4., 3.]])
+
+        """
+        if sparsity is None:
+            sparsity = self.sparsity_pattern(wrt)
+        if len(sparsity) != len(self._functions):
+            raise ValueError(
+                f"Sparsity pattern must have {len(self._functions)} rows, got {len(sparsity)}"
+            )
+
+        n_columns = self._count_columns(wrt)
+        colors = color_columns(sparsity, n_columns)
+        n_colors = int(colors.max()) + 1 if n_columns else 0
+        compressed = self._compressed_jacobian(colors, n_colors, wrt, chunk_size)
+
+        # every nonzero of a row has its own color, so it is the only column contributing to that entry
+        rows = _pattern_rows(sparsity)
+        row = np.repeat(np.arange(len(rows)), [len(columns) for columns in rows])
+        col = np.concatenate(rows) if rows else np.array([], dtype=int)
+        return SparseJacobian(
+            row, col, compressed[row, colors[col]], (len(self._functions), n_columns)
+        )
+
+    def _count_columns(self, wrt: List[Node] = None) -> int:
+        """
+        Returns the number of columns of the Jacobian, the number of nodes in wrt if given and the length
+        of the longest seed vector of the inputs otherwise.
+
+        """
+        if wrt is not None:
+            return len(wrt)
+
+        return max(np.size(node.derivative) for node in self.inputs.values())
+
+    def _compressed_jacobian(
+        self,
+        groups: NDArray[int],
+        n_groups: int,
+        wrt: List[Node] = None,
+        chunk_size: int = None,
+    ) -> NDArray[float]:
+        """
+        Computes the product of the Jacobian with a matrix assigning every column to one group.
+        Column g of the result is the sum of the columns of the Jacobian in group g. Groups are propagated
+        in chunks by replaying the recorded graph, with the seeds of every chunk built on demand.
+
+        Parameters
+        ----------
+        groups : NDArray[int]
+            group of every column of the Jacobian.
+        n_groups : int
+            number of groups.
+        wrt : List[Node], optional
+            input nodes the columns of the Jacobian are taken with respect to, see compute_jacobian.
+        chunk_size : int, optional
+            number of groups propagated per pass, see compute_jacobian.
+
+        Returns
+        -------
+        NDArray[float] :
+            compressed Jacobian of shape (n_functions, n_groups).
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the chunk size is not positive or a node of wrt is not an input of the vector function
+
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+
+        inputs = list(self.inputs.values())
+        if self._tape is None:
+            self._tape = Tape._record(inputs, self._functions)
+
+        if wrt is None:
+            seed_vectors = np.array(
+                [np.broadcast_to(node.derivative, len(groups)) for node in inputs],
+                dtype=Node._active_dtype(),
+            )
+        else:
+            rows = {id(node): row for row, node in enumerate(inputs)}
+            if not all(id(node) in rows for node in wrt):
+                raise ValueError("Jacobians can only be taken with respect to inputs of the vector function")
+
+            wrt_rows = np.array([rows[id(node)] for node in wrt], dtype=int)
+
+        if chunk_size is None:
+            chunk_size = _default_chunk_size(n_groups, len(self._tape) + len(inputs))
+
+        values = [node.value for node in inputs]
+        dtype = Node._active_dtype()
+        compressed = np.empty((len(self._functions), n_groups), dtype=dtype)
+        for start in range(0, n_groups, chunk_size):
+            stop = min(start + chunk_size, n_groups)
+            columns = np.flatnonzero((groups >= start) & (groups < stop))
+
+            # seeds of a chunk are built on demand so that no seed matrix of the full size is allocated
+            chunk = np.zeros((len(inputs), stop - start), dtype=dtype)
+            if wrt is None:
+                np.add.at(chunk.T, groups[columns] - start, seed_vectors[:, columns].T)
+            else:
+                np.add.at(chunk, (wrt_rows[columns], groups[columns] - start), 1)
+
+            # chunks are written in place, so tangent storage is only allocated for the first chunk
+            self._tape.evaluate(*values, seed_vectors=chunk, out=compressed[:, start:stop])
+
+        return compressed
+
+    def vjp(self, cotangent: Union[List[float], NDArray]) -> NDArray:
+        """
+        Computes the product of a cotangent vector with the Jacobian using a single reverse mode sweep,
+        without forming the Jacobian. The adjoints of the input nodes are projected onto their seed vectors,
+        so the result has one entry per column of jacobian.
+
+        Parameters
+        ----------
+        cotangent : Union[List[float], NDArray]
+            one weight per function of the vector function.
+
+        Returns
+        -------
+        NDArray :
+            product of the cotangent with the Jacobian.
+
+        Raises
+        ------
+        ValueError :
+            Raise value error if the cotangent does not have one entry per function
+
+        Example
+        -------
+        >>> x = Node("x", 2, 1 ,seed_vector=[1,0])
+        >>> y = Node("y", 3, 1, seed_vector=[0,1])
+        >>> f = VectorFunction([x * y, x - 2 * y])
+        >>> f.vjp([1, 1])
+        array([4., 0.])
+
+        """
+        if len(cotangent) != len(self._functions):
+            raise ValueError(
+                f"Cotangent must have {len(self._functions)} entries, got {len(cotangent)}"
+            )
+
+        adjoints = backward(self._functions, cotangent)
+        return sum(
+            adjoints[id(node)] * np.asarray(node.derivative, dtype=float)
+            for node in self.inputs.values()
+        )
+
+    @property
+    def inputs(self) -> Dict[str, Node]:
+        """
+        Returns the input nodes the vector function was computed from, keyed by symbol
+
+        """
+        if self._inputs is None:
+            self._inputs = self._collect_inputs()
+
+        return self._inputs
+
+    def _collect_inputs(self) -> Dict[str, Node]:
+        """
+        Walks the computational graph of every function and collects the nodes that were not computed from other nodes.
+
+        Returns
+        -------
+        Dict[str, Node] :
+            input nodes keyed by symbol.
+
+        """
+        inputs = {}
+        visited = set()
+        stack = list(self._functions)
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+
+            visited.add(id(node))
+            if node._operation is None:
+                inputs[node.symbol] = node
+            stack.extend(node._operands)
+
+        return inputs
+
+    def update(self, values: Dict[str, Union[int, float]]) -> None:
+        """
+        Updates the value of input nodes in place. Only the nodes computed from the updated inputs
+        are recomputed, the next time value or jacobian is read, and the functions are not rebuilt.
+
+        Parameters
+        ----------
+        values : Dict[str, Union[int, float]]
+            New values keyed by the symbol of the input node.
+
+        Raises
+        ------
+        KeyError :
+            Raise key error if a symbol is not an input of the vector function
+
+        Example
+        -------
+        >>> x = Node("x", 2, 1 ,seed_vector=[1,0])
+        >>> y = Node("y", 3, 1, seed_vector=[0,1])
+        >>> f = VectorFunction([x + y, x - 2 * y])
+        >>> f.update({"x": 5})
+        >>> f.value
+        array([ 8, -1])
+
+        """
+        unknown_symbols = set(values) - set(self.inputs)
+        if unknown_symbols:
+            raise KeyError(
+                f"Symbols {sorted(unknown_symbols)} are not inputs of the vector function"
+            )
+
+        for symbol, value in values.items():
+            self.inputs[symbol].update(value)
@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from autodiff_team29 import trace
+from autodiff_team29.elementaries import sin, exp
+
+
+def model(*x):
+    """
+    Chain of terms coupling neighbouring inputs, so every tangent is as wide as the number of inputs.
+
+    """
+    value = x[0]
+    for x_i in x[1:]:
+        value = sin(value * x_i) + exp(-x_i) * value - x_i
+
+    return value
+
+
+def evaluate(tape, points, in_place):
+    """
+    Replays the tape at every point, with the forward rules or in place.
+
+    """
+    gradient = np.empty(tape.n_inputs)
+    for point in points:
+        if in_place:
+            tape(*point, out=gradient)
+        else:
+            tape(*point)
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'evaluation':>11} {'time (ms/point)':>16} {'peak memory (MB)':>17}")
+
+    n_points = 50
+    for n_inputs in (10, 100, 1_000):
+        tape = trace(model, n_inputs)
+        points = rng.uniform(0.5, 2.0, size=(n_points, n_inputs)).tolist()
+        for in_place in (False, True):
+            start = time.perf_counter()
+            evaluate(tape, points, in_place)
+            elapsed_time = (time.perf_counter() - start) / n_points
+
+            # the arena already holds its buffer, so in-place evaluations only allocate primal traces
+            tracemalloc.start()
+            evaluate(tape, points[:1], in_place)
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            evaluation = "in place" if in_place else "rules"
+            print(
+                f"{n_inputs:>8} {evaluation:>11} {1000 * elapsed_time:>16.3f} {peak_memory / 2**20:>17.3f}"
+            )
+
+    print(f"\n{tape.arena}")
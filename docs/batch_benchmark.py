@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import Node
+from autodiff_team29.elementaries import sin, exp, sqrt
+
+
+def function(x, y):
+    return sqrt(exp(sin(x * y)) + y**2) / (1 + x)
+
+
+def evaluate_point_by_point(x_values, y_values):
+    """
+    Builds the graph of the function once per sample point.
+
+    """
+    for x_value, y_value in zip(x_values, y_values):
+        Node.clear_node_registry()
+        x = Node("x", float(x_value), 1, seed_vector=[1, 0])
+        y = Node("y", float(y_value), 1, seed_vector=[0, 1])
+        function(x, y).derivative
+
+
+def evaluate_batched(x_values, y_values):
+    """
+    Builds the graph of the function once on batched nodes holding every sample point.
+
+    """
+    Node.clear_node_registry()
+    x = Node.batch("x", x_values, seed_vector=[1, 0])
+    y = Node.batch("y", y_values, seed_vector=[0, 1])
+    function(x, y).derivative
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'points':>8} {'pointwise (points/s)':>21} {'batched (points/s)':>19} {'speedup':>8}")
+
+    for n_points in (100, 1_000, 10_000, 100_000):
+        x_values, y_values = rng.uniform(0.5, 2.0, size=(2, n_points))
+
+        # point by point evaluation is extrapolated from at most 10k points
+        n_pointwise = min(n_points, 10_000)
+        start = time.perf_counter()
+        evaluate_point_by_point(x_values[:n_pointwise], y_values[:n_pointwise])
+        pointwise_throughput = n_pointwise / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        evaluate_batched(x_values, y_values)
+        batched_throughput = n_points / (time.perf_counter() - start)
+
+        print(
+            f"{n_points:>8} {pointwise_throughput:>21,.0f} {batched_throughput:>19,.0f} "
+            f"{batched_throughput / pointwise_throughput:>8.0f}"
+        )
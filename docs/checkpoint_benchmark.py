@@ -0,0 +1,59 @@
+import time
+import tracemalloc
+
+from autodiff_team29 import Loop
+from autodiff_team29.elementaries import sin, cos
+
+
+def pendulum(carry, t):
+    """
+    Semi-implicit Euler step of a damped, forced pendulum with angle and angular velocity as the carry.
+
+    """
+    velocity = carry[1] + 0.001 * (-sin(carry[0]) - 0.1 * carry[1] + 0.5 * cos(t))
+    return [carry[0] + 0.001 * velocity, velocity]
+
+
+def measured(loop, n_steps, **schedule):
+    """
+    Returns the time of a reverse sweep, the peak memory of a second sweep and the statistics of the sweep.
+
+    """
+    times = [0.001 * step for step in range(n_steps)]
+    start = time.perf_counter()
+    loop.vjp([1.0, 0.0], times, [1.0, 0.0], **schedule)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    loop.vjp([1.0, 0.0], times, [1.0, 0.0], **schedule)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, loop.statistics()
+
+
+if __name__ == "__main__":
+
+    n_steps = 20_000
+    loop = Loop(pendulum, 2)
+
+    schedules = [
+        ("store every carry", {"checkpoints": n_steps}),
+        ("every sqrt(n) steps", {}),
+        ("binomial, 100", {"checkpoints": 100}),
+        ("binomial, 30", {"checkpoints": 30}),
+        ("binomial, 10", {"checkpoints": 10}),
+        ("binomial, 5", {"checkpoints": 5}),
+    ]
+
+    print(
+        f"{'schedule':>20} {'stored carries':>15} {'peak (kB)':>10} {'recomputed/steps':>17} {'time (s)':>9} {'overhead':>9}"
+    )
+    baseline = None
+    for label, schedule in schedules:
+        elapsed, peak, statistics = measured(loop, n_steps, **schedule)
+        baseline = baseline or elapsed
+        print(
+            f"{label:>20} {statistics['stored_carries']:>15} {peak / 1000:>10.1f} "
+            f"{statistics['recomputed_steps'] / n_steps:>17.2f} {elapsed:>9.3f} {elapsed / baseline:>9.2f}"
+        )
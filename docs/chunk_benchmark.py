@@ -0,0 +1,77 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from autodiff_team29 import Node, VectorFunction
+from autodiff_team29.elementaries import sin, sqrt
+
+
+def residuals(x):
+    """
+    Residuals coupling neighbouring inputs, as in a discretized differential equation.
+
+    """
+    return [sin(x[i] * x[i + 1]) + sqrt(x[i] * x[i] + 1) for i in range(len(x) - 1)]
+
+
+def dense_jacobian(point):
+    """
+    Computes the Jacobian with one dense seed vector per input.
+
+    """
+    Node.clear_node_registry()
+    seed_vectors = np.identity(len(point))
+    x = [
+        Node(f"x{index}", value, 1, seed_vector=seed_vector)
+        for index, (value, seed_vector) in enumerate(zip(point, seed_vectors))
+    ]
+    return VectorFunction(residuals(x)).jacobian
+
+
+def chunked_jacobian(point, chunk_size):
+    """
+    Builds the functions without seed vectors and computes the Jacobian in chunks of seed directions.
+
+    """
+    Node.clear_node_registry()
+    x = [Node(f"x{index}", value, 1) for index, value in enumerate(point)]
+    return VectorFunction(residuals(x)).compute_jacobian(chunk_size=chunk_size, wrt=x)
+
+
+def measure(compute, *arguments):
+    """
+    Returns the result, elapsed time and peak traced memory in megabytes of a computation.
+    Memory is traced in a separate run, since tracing allocations slows the computation down.
+
+    """
+    start = time.perf_counter()
+    result = compute(*arguments)
+    elapsed_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    compute(*arguments)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed_time, peak_memory / 2**20
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'mode':>12} {'time (s)':>9} {'peak memory (MB)':>17}")
+
+    for n_inputs in (100, 500, 1_000, 2_000):
+        point = rng.uniform(0.5, 2.0, size=n_inputs).tolist()
+
+        expected, elapsed_time, peak_memory = measure(dense_jacobian, point)
+        print(f"{n_inputs:>8} {'dense':>12} {elapsed_time:>9.3f} {peak_memory:>17.1f}")
+
+        for chunk_size in (16, None):
+            jacobian, elapsed_time, peak_memory = measure(
+                chunked_jacobian, point, chunk_size
+            )
+            assert np.allclose(jacobian, expected)
+            mode = f"chunk {chunk_size or 'auto'}"
+            print(f"{n_inputs:>8} {mode:>12} {elapsed_time:>9.3f} {peak_memory:>17.1f}")
@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import Node, compile_tape, trace
+from autodiff_team29.elementaries import sin, exp, sqrt
+
+
+def function(x, y):
+    """
+    Vector function of two inputs sharing subexpressions between its outputs.
+
+    """
+    product = x * y
+    return [sin(product) + exp(-x * x), sqrt(1 + y * y) / (2 + x) + product]
+
+
+def hand_written(x, y):
+    """
+    Value and Jacobian of function written directly with NumPy.
+
+    """
+    product = x * y
+    cos_product = np.cos(product)
+    gaussian = np.exp(-x * x)
+    root = np.sqrt(1 + y * y)
+    values = np.stack([np.sin(product) + gaussian, root / (2 + x) + product], axis=-1)
+    jacobian = np.stack(
+        [
+            np.stack([cos_product * y - 2 * x * gaussian, cos_product * x], axis=-1),
+            np.stack([-root / (2 + x) ** 2 + y, y / (root * (2 + x)) + x], axis=-1),
+        ],
+        axis=-2,
+    )
+    return values, jacobian
+
+
+def graph_per_point(x_values, y_values):
+    """
+    Builds the graph of function at every point.
+
+    """
+    for x_value, y_value in zip(x_values, y_values):
+        Node.clear_node_registry()
+        x = Node("x", float(x_value), 1, seed_vector=[1, 0])
+        y = Node("y", float(y_value), 1, seed_vector=[0, 1])
+        [output.derivative for output in function(x, y)]
+
+
+def timed(fn, *args, repeats=5):
+    """
+    Returns the best time of a few calls.
+
+    """
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+if __name__ == "__main__":
+
+    tape = trace(function, 2)
+    compiled = compile_tape(tape)
+    print(compiled.source)
+
+    rng = np.random.default_rng(0)
+    print(f"{'points':>9} {'graphs (s)':>11} {'tape (s)':>9} {'compiled (s)':>13} {'numpy (s)':>10} {'compiled/numpy':>15}")
+    for n_points in (1000, 100_000, 1_000_000):
+        x, y = rng.uniform(0, 1, size=(2, n_points))
+
+        graphs_time = timed(graph_per_point, x[:1000], y[:1000], repeats=1) * n_points / 1000
+        tape_time = timed(tape, x, y)
+        compiled_time = timed(compiled, x, y)
+        numpy_time = timed(hand_written, x, y)
+        print(
+            f"{n_points:>9} {graphs_time:>11.3f} {tape_time:>9.4f} {compiled_time:>13.4f} "
+            f"{numpy_time:>10.4f} {compiled_time / numpy_time:>15.2f}"
+        )
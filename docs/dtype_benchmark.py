@@ -0,0 +1,62 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from autodiff_team29 import Node
+from autodiff_team29.elementaries import sin, exp, sqrt
+
+
+def model(x):
+    """
+    Model coupling every input with its neighbours, evaluated at a batch of points.
+
+    """
+    return [
+        sqrt(exp(sin(x[i] * x[i + 1])) + x[i] ** 2) - x[i + 1] / (1 + x[i] * x[i])
+        for i in range(len(x) - 1)
+    ]
+
+
+def evaluate(points, dtype):
+    """
+    Evaluates the Jacobian of the model at every point under the given dtype policy.
+
+    """
+    Node.clear_node_registry()
+    n_inputs = points.shape[1]
+    with Node.dtype_scope(dtype):
+        seed_vectors = np.identity(n_inputs)
+        x = [
+            Node.batch(f"x{index}", points[:, index], seed_vector=seed_vectors[index])
+            for index in range(n_inputs)
+        ]
+        return np.stack([output.derivative for output in model(x)], axis=1)
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    n_points = 256
+    print(
+        f"{'inputs':>8} {'dtype':>8} {'time (s)':>9} {'peak memory (MB)':>17} {'relative error':>15}"
+    )
+
+    for n_inputs in (10, 50, 200):
+        points = rng.uniform(0.5, 2.0, size=(n_points, n_inputs))
+        reference = evaluate(points, "float64")
+        for dtype in ("float64", "float32"):
+            start = time.perf_counter()
+            evaluate(points, dtype)
+            elapsed_time = time.perf_counter() - start
+
+            tracemalloc.start()
+            jacobian = evaluate(points, dtype)
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # largest deviation from the float64 Jacobian relative to its largest entry
+            error = np.max(np.abs(jacobian - reference)) / np.max(np.abs(reference))
+            print(
+                f"{n_inputs:>8} {dtype:>8} {elapsed_time:>9.3f} {peak_memory / 2**20:>17.1f} {error:>15.2e}"
+            )
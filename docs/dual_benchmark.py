@@ -0,0 +1,59 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import Node, Dual
+from autodiff_team29.elementaries import sin, exp
+
+N_OPERATIONS_PER_STEP = 6
+
+
+def step(x, y):
+    """
+    Six operations, representative of the body of an inner loop.
+
+    """
+    return sin(x * y) + exp(-x) / y - x
+
+
+def time_per_operation(make_inputs, n_steps, clear_registry=False):
+    """
+    Returns the time per operation of evaluating step at n_steps distinct points.
+
+    """
+    start = time.perf_counter()
+    for index in range(n_steps):
+        if clear_registry:
+            Node.clear_node_registry()
+        x, y = make_inputs(1.0 + index / n_steps)
+        step(x, y)
+
+    return (time.perf_counter() - start) / (n_steps * N_OPERATIONS_PER_STEP)
+
+
+if __name__ == "__main__":
+
+    n_steps = 20_000
+    print(f"{'seeds':>6} {'number':>7} {'ns/operation':>13} {'slowdown':>9}")
+
+    for n_seeds in (1, 16):
+        # scalar derivatives for a single direction, seed vectors of identity rows otherwise
+        seed_x, seed_y = (1.0, 0.0) if n_seeds == 1 else np.identity(n_seeds)[:2]
+        results = {
+            "Node": time_per_operation(
+                lambda value: (
+                    Node("x", value, 1, seed_vector=seed_x),
+                    Node("y", 2.0, 1, seed_vector=seed_y),
+                ),
+                n_steps,
+                clear_registry=True,
+            ),
+            "Dual": time_per_operation(
+                lambda value: (Dual(value, seed_x), Dual(2.0, seed_y)), n_steps
+            ),
+        }
+
+        for number, elapsed_time in results.items():
+            print(
+                f"{n_seeds:>6} {number:>7} {1e9 * elapsed_time:>13.0f} {elapsed_time / results['Dual']:>9.1f}"
+            )
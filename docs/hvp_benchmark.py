@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import Node, grad, hvp
+from autodiff_team29.elementaries import sin, exp
+
+
+def loss(x):
+    """
+    Scalar loss coupling neighbouring parameters, so every input contributes a few operations.
+
+    """
+    total = 0
+    for index in range(len(x) - 1):
+        total = total + sin(x[index] * x[index + 1]) + exp(-x[index] * x[index])
+
+    return total
+
+
+def full_hessian(point):
+    """
+    Computes the full Hessian forward over forward, with one seed vector direction per input.
+
+    """
+    Node.clear_node_registry()
+    x = Node.variables([f"x{index}" for index in range(len(point))], point)
+    return loss(x).hessian
+
+
+def timed(fn, *args):
+    """
+    Returns the time taken by a call.
+
+    """
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'gradient (s)':>13} {'hvp (s)':>9} {'hvp/gradient':>13} {'full hessian (s)':>17}")
+
+    for n_inputs in (10, 100, 400):
+        point = rng.uniform(-1, 1, size=n_inputs).tolist()
+        direction = rng.uniform(-1, 1, size=n_inputs).tolist()
+
+        gradient_time = timed(grad(loss), point)
+        hvp_time = timed(hvp, loss, point, direction)
+        hessian_time = timed(full_hessian, point)
+        print(
+            f"{n_inputs:>8} {gradient_time:>13.4f} {hvp_time:>9.4f} {hvp_time / gradient_time:>13.1f} {hessian_time:>17.4f}"
+        )
@@ -0,0 +1,56 @@
+import time
+
+from autodiff_team29 import Node, implicit_solve
+
+
+def unrolled_square_root(theta, n_iterations):
+    """
+    Differentiates through Newton's iteration for the square root of theta, recording every iteration in the graph.
+
+    """
+    x = 1.0
+    for _ in range(n_iterations):
+        x = (x + theta / x) / 2
+
+    return x
+
+
+def implicit_square_root(theta, n_iterations):
+    """
+    Differentiates through the root of x * x - theta with the implicit function theorem.
+    Newton's method iterates until convergence on floats, whatever the iteration count of the unrolled version.
+
+    """
+    return implicit_solve(lambda x, theta: x * x - theta, theta, 1.0)
+
+
+def timed(solver, n_iterations, repeats=20):
+    """
+    Returns the time per differentiated solve and the number of nodes it creates.
+
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        Node.clear_node_registry()
+        Node._NODES_COMPUTED_FOR_BENCHMARKING = 0
+        theta = Node("theta", 2.0, 1)
+        solution = solver(theta, n_iterations)
+        solution.derivative
+    elapsed = (time.perf_counter() - start) / repeats
+
+    return elapsed, Node._NODES_COMPUTED_FOR_BENCHMARKING
+
+
+if __name__ == "__main__":
+
+    print(
+        f"{'iterations':>11} {'unrolled (ms)':>14} {'unrolled nodes':>15} {'implicit (ms)':>14} {'implicit nodes':>15}"
+    )
+
+    for n_iterations in (10, 100, 1000, 10_000):
+        unrolled_time, unrolled_nodes = timed(unrolled_square_root, n_iterations)
+        implicit_time, implicit_nodes = timed(implicit_square_root, n_iterations)
+        print(
+            f"{n_iterations:>11} {1000 * unrolled_time:>14.3f} {unrolled_nodes:>15} "
+            f"{1000 * implicit_time:>14.3f} {implicit_nodes:>15}"
+        )
@@ -0,0 +1,80 @@
+import time
+import tracemalloc
+
+from autodiff_team29 import Node, Loop, fori_loop
+
+
+def step(i, x):
+    """
+    One explicit Euler step of dx/dt = -x^2.
+
+    """
+    return x - 0.0001 * x * x
+
+
+def unrolled(n_steps):
+    """
+    Differentiates through a Python loop, which adds the operations of every step to the graph.
+
+    """
+    Node.clear_node_registry()
+    Node._NODES_COMPUTED_FOR_BENCHMARKING = 0
+    x = Node("x", 0.5, 1)
+    for i in range(n_steps):
+        x = step(i, x)
+
+    x.derivative
+    return Node._NODES_COMPUTED_FOR_BENCHMARKING
+
+
+def looped(n_steps):
+    """
+    Differentiates through fori_loop, which traces the step once.
+
+    """
+    Node.clear_node_registry()
+    Node._NODES_COMPUTED_FOR_BENCHMARKING = 0
+    x = Node("x", 0.5, 1)
+    x = fori_loop(n_steps, step, x)
+
+    x.derivative
+    return Node._NODES_COMPUTED_FOR_BENCHMARKING
+
+
+def measured(fn, *args):
+    """
+    Returns the time taken by a call, the peak memory of a second call and the result of the call.
+
+    """
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, result
+
+
+if __name__ == "__main__":
+
+    print(
+        f"{'steps':>7} {'mode':>9} {'time (s)':>9} {'peak (kB)':>10} {'nodes':>7}"
+    )
+    for n_steps in (100, 1000, 10_000):
+        for mode, fn in (("unrolled", unrolled), ("fori_loop", looped)):
+            elapsed, peak, nodes = measured(fn, n_steps)
+            print(
+                f"{n_steps:>7} {mode:>9} {elapsed:>9.4f} {peak / 1000:>10.1f} {nodes:>7}"
+            )
+
+    print()
+    print(f"{'steps':>7} {'checkpoint every':>17} {'vjp time (s)':>13} {'peak (kB)':>10}")
+    loop = Loop(lambda carry, i: [step(i, carry[0])], 1)
+    n_steps = 10_000
+    for checkpoint_every in (1, 10, 100, None):
+        elapsed, peak, _ = measured(loop.vjp, [0.5], range(n_steps), [1.0], checkpoint_every)
+        label = "sqrt(steps)" if checkpoint_every is None else checkpoint_every
+        print(f"{n_steps:>7} {label:>17} {elapsed:>13.4f} {peak / 1000:>10.1f}")
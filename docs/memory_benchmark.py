@@ -0,0 +1,58 @@
+import multiprocessing
+import resource
+import sys
+
+from autodiff_team29 import Node
+from autodiff_team29.elementaries import sqrt
+
+
+def apply_n_square_roots(n, x):
+
+    value = x
+    for _ in range(1, n + 1):
+        value = sqrt(value)
+
+    return value
+
+
+def measure_peak_rss(n_nodes: int, repetitions: int, weak_references: bool):
+    """
+    Computes the sqrt chain sum of optimization_benchmark.py for several independent variables
+    and reports the peak resident set size of the process in megabytes.
+    Only the values of finished computations are kept, so every other node is an unreachable intermediate.
+
+    """
+    Node.configure_registry(weak_references=weak_references)
+
+    values = []
+    for repetition in range(repetitions):
+        x = Node(f"x{repetition}", 123424341341544235, 1)
+        values.append(sum([apply_n_square_roots(n, x) for n in range(n_nodes)]).value)
+
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+
+    return peak_rss / scale, Node.count_nodes_stored()
+
+
+def benchmark(n_nodes: int, repetitions: int, weak_references: bool):
+    """
+    Runs a measurement in a fresh interpreter so that the peak memory of one mode does not leak into the other
+
+    """
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(measure_peak_rss, (n_nodes, repetitions, weak_references))
+
+
+if __name__ == "__main__":
+
+    n_nodes = 300
+    print(f"sqrt chain sum with n={n_nodes}, one independent variable per repetition")
+    print(f"{'repetitions':>12} {'mode':>8} {'peak RSS (MB)':>14} {'nodes stored':>13}")
+
+    for repetitions in (1, 5, 10, 20):
+        for weak_references in (False, True):
+            peak_rss, nodes_stored = benchmark(n_nodes, repetitions, weak_references)
+            mode = "weak" if weak_references else "strong"
+            print(f"{repetitions:>12} {mode:>8} {peak_rss:>14.1f} {nodes_stored:>13}")
@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import Node, grad
+from autodiff_team29.elementaries import sin, exp
+
+
+def loss(x):
+    """
+    Scalar loss coupling neighbouring parameters, so every input contributes a few operations.
+
+    """
+    total = 0
+    for index in range(len(x) - 1):
+        total = total + sin(x[index] * x[index + 1]) + exp(-x[index] * x[index])
+
+    return total
+
+
+def forward_mode_gradient(point):
+    """
+    Computes the gradient with one seed vector direction per input.
+
+    """
+    Node.clear_node_registry()
+    seed_vectors = np.identity(len(point))
+    x = [
+        Node(f"x{index}", value, 1, seed_vector=seed_vector)
+        for index, (value, seed_vector) in enumerate(zip(point, seed_vectors))
+    ]
+    return loss(x).derivative
+
+
+def reverse_mode_gradient(point):
+    """
+    Computes the gradient with a single backward pass.
+
+    """
+    return grad(loss)(point)
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'forward (s)':>12} {'reverse (s)':>12} {'speedup':>8}")
+
+    for n_inputs in (10, 100, 1_000, 2_000, 4_000):
+        point = rng.uniform(-1.0, 1.0, size=n_inputs).tolist()
+
+        start = time.perf_counter()
+        forward_gradient = forward_mode_gradient(point)
+        forward_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reverse_gradient = reverse_mode_gradient(point)
+        reverse_time = time.perf_counter() - start
+
+        assert np.allclose(forward_gradient, reverse_gradient)
+        print(
+            f"{n_inputs:>8} {forward_time:>12.3f} {reverse_time:>12.3f} "
+            f"{forward_time / reverse_time:>8.1f}"
+        )
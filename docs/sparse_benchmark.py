@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import Node, VectorFunction
+from autodiff_team29.elementaries import sin
+from autodiff_team29.sparse import color_columns
+
+
+def residuals(x):
+    """
+    Residuals of a discretized second order differential equation, with a tridiagonal Jacobian.
+
+    """
+    n = len(x)
+    return [
+        (x[i - 1] if i > 0 else 0) - 2 * x[i] + (x[i + 1] if i < n - 1 else 0) + sin(x[i])
+        for i in range(n)
+    ]
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(
+        f"{'inputs':>8} {'dense (s)':>10} {'pattern (s)':>12} {'sparse (s)':>11} "
+        f"{'directions':>11} {'speedup':>8}"
+    )
+
+    for n_inputs in (100, 500, 1_000, 2_000):
+        Node.clear_node_registry()
+        x = [Node(f"x{i}", value, 1) for i, value in enumerate(rng.uniform(size=n_inputs))]
+        f = VectorFunction(residuals(x))
+
+        start = time.perf_counter()
+        dense = f.compute_jacobian(wrt=x)
+        dense_time = time.perf_counter() - start
+
+        # the pattern is detected once and cached for later evaluation points
+        start = time.perf_counter()
+        pattern = f.sparsity_pattern(wrt=x)
+        pattern_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sparse = f.sparse_jacobian(pattern, wrt=x)
+        sparse_time = time.perf_counter() - start
+
+        assert np.allclose(sparse.toarray(), dense)
+        n_colors = color_columns(pattern, n_inputs).max() + 1
+        print(
+            f"{n_inputs:>8} {dense_time:>10.3f} {pattern_time:>12.3f} {sparse_time:>11.3f} "
+            f"{n_colors:>11} {dense_time / (pattern_time + sparse_time):>8.1f}"
+        )
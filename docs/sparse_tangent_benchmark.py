@@ -0,0 +1,55 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from autodiff_team29 import Node, SparseTangent
+from autodiff_team29.elementaries import sin, exp
+
+
+def local_model(x):
+    """
+    Model in which every term only depends on a few neighbouring inputs.
+
+    """
+    return [sin(x[i] * x[i + 1]) + exp(-x[i]) * x[i + 1] for i in range(len(x) - 1)]
+
+
+def evaluate(point, sparse):
+    """
+    Evaluates the derivatives of the model with dense or sparse seed vectors.
+
+    """
+    Node.clear_node_registry()
+    n = len(point)
+    if sparse:
+        seed_vectors = [SparseTangent.unit(index, n) for index in range(n)]
+    else:
+        seed_vectors = np.identity(n)
+
+    x = [
+        Node(f"x{index}", value, 1, seed_vector=seed_vector)
+        for index, (value, seed_vector) in enumerate(zip(point, seed_vectors))
+    ]
+    return [output.derivative for output in local_model(x)]
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'tangents':>9} {'time (s)':>9} {'peak memory (MB)':>17}")
+
+    for n_inputs in (100, 1_000, 4_000):
+        point = rng.uniform(size=n_inputs).tolist()
+        for sparse in (False, True):
+            start = time.perf_counter()
+            evaluate(point, sparse)
+            elapsed_time = time.perf_counter() - start
+
+            tracemalloc.start()
+            evaluate(point, sparse)
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            tangents = "sparse" if sparse else "dense"
+            print(f"{n_inputs:>8} {tangents:>9} {elapsed_time:>9.3f} {peak_memory / 2**20:>17.1f}")
@@ -0,0 +1,56 @@
+import gc
+import time
+import tracemalloc
+
+from autodiff_team29 import MappedTape, trace
+from autodiff_team29.elementaries import sin
+
+
+def chain(n_steps):
+    """
+    Returns a function of two inputs whose graph holds a few operations per step.
+
+    """
+
+    def function(x, y):
+        for _ in range(n_steps):
+            x = x + 0.001 * sin(x * y)
+        return x
+
+    return function
+
+
+def measured(fn, *args, **kwargs):
+    """
+    Returns the time taken by a call and the peak memory allocated by Python during a second call.
+
+    """
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    fn(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+
+    print(
+        f"{'instructions':>13} {'tape vjp (s)':>13} {'tape peak (MB)':>15} "
+        f"{'mapped vjp (s)':>15} {'mapped peak (MB)':>17} {'on disk (MB)':>13}"
+    )
+
+    for n_steps in (1000, 10_000, 50_000):
+        tape = trace(chain(n_steps), 2)
+        with MappedTape.from_tape(tape, chunk_size=4096) as mapped:
+            tape_time, tape_peak = measured(tape.vjp, 0.3, 0.7, cotangent=1.0)
+            mapped_time, mapped_peak = measured(mapped.vjp, 0.3, 0.7, cotangent=1.0)
+            print(
+                f"{len(tape):>13} {tape_time:>13.3f} {tape_peak / 1e6:>15.2f} "
+                f"{mapped_time:>15.3f} {mapped_peak / 1e6:>17.2f} {mapped.nbytes / 1e6:>13.2f}"
+            )
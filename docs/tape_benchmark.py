@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import Node, trace
+from autodiff_team29.elementaries import sin, exp, sqrt, log
+
+
+def function(x, y):
+    """
+    Function with a few dozen operations, representative of the functions evaluated point by point.
+
+    """
+    value = x * y
+    for _ in range(10):
+        value = sqrt(exp(sin(value)) * x + y**2) / (1 + log(y * y + 1, 10))
+
+    return [value, value * x - y]
+
+
+def evaluate_with_nodes(points):
+    """
+    Builds the graph of the function at every point.
+
+    """
+    for x_value, y_value in points:
+        Node.clear_node_registry()
+        x = Node("x", x_value, 1, seed_vector=[1, 0])
+        y = Node("y", y_value, 1, seed_vector=[0, 1])
+        outputs = function(x, y)
+        np.array([output.derivative for output in outputs])
+
+
+def evaluate_with_tape(points):
+    """
+    Traces the function once and replays the tape at every point.
+
+    """
+    tape = trace(function, 2)
+    for point in points:
+        tape(*point)
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'points':>8} {'nodes (ms/point)':>17} {'tape (ms/point)':>16} {'speedup':>8}")
+
+    for n_points in (10, 100, 1_000):
+        points = rng.uniform(0.5, 2.0, size=(n_points, 2)).tolist()
+
+        start = time.perf_counter()
+        evaluate_with_nodes(points)
+        node_latency = (time.perf_counter() - start) / n_points * 1e3
+
+        start = time.perf_counter()
+        evaluate_with_tape(points)
+        tape_latency = (time.perf_counter() - start) / n_points * 1e3
+
+        print(
+            f"{n_points:>8} {node_latency:>17.3f} {tape_latency:>16.3f} "
+            f"{node_latency / tape_latency:>8.1f}"
+        )
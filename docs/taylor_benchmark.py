@@ -0,0 +1,34 @@
+import time
+
+import numpy as np
+
+from autodiff_team29 import taylor_derivatives
+from autodiff_team29.elementaries import sin, exp, sqrt
+
+
+def function(x):
+    """
+    Scalar function mixing products, quotients and elementaries of two inputs.
+
+    """
+    return sin(x[0] * x[1]) * exp(-x[0] * x[0]) + sqrt(1 + x[1] * x[1]) / (2 + x[0])
+
+
+def timed(order, repeats=200):
+    """
+    Returns the time per evaluation of the derivatives up to the given order.
+
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        taylor_derivatives(function, [0.3, 0.7], [1.0, -0.5], order)
+    return (time.perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+
+    print(f"{'order':>6} {'time (ms)':>10} {'time/order^2 (us)':>18}")
+
+    for order in (1, 2, 5, 10, 20, 40):
+        elapsed = timed(order)
+        print(f"{order:>6} {1000 * elapsed:>10.3f} {1e6 * elapsed / order**2:>18.2f}")
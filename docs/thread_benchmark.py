@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import threading
+import time
+
+from autodiff_team29 import Node
+from autodiff_team29.elementaries import sqrt, sin, exp
+
+
+def build_graph(symbol: str, n_operations: int, barrier: threading.Barrier):
+    """
+    Builds a chain of n_operations elementary operations on a fresh variable once all threads are ready.
+
+    """
+    barrier.wait()
+
+    x = Node(symbol, 0.5, 1)
+    value = x
+    for _ in range(n_operations // 4):
+        value = sqrt(exp(sin(value)) * x)
+
+    return value.derivative
+
+
+def measure_throughput(n_threads: int, n_operations: int, shared: bool):
+    """
+    Measures the number of node operations per second performed by n_threads threads sharing the global registry.
+    Shared workloads build the same graph in every thread and contend on the same registry keys,
+    otherwise every thread builds a graph on its own variable.
+
+    """
+    Node.clear_node_registry()
+    Node._NODES_COMPUTED_FOR_BENCHMARKING = 0
+    barrier = threading.Barrier(n_threads + 1)
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        futures = [
+            executor.submit(
+                build_graph,
+                "x" if shared else f"x{thread_index}",
+                n_operations,
+                barrier,
+            )
+            for thread_index in range(n_threads)
+        ]
+
+        barrier.wait()
+        start = time.perf_counter()
+        for future in futures:
+            future.result()
+        elapsed_time = time.perf_counter() - start
+
+    operations_performed = n_threads * (n_operations // 4) * 4
+    return operations_performed / elapsed_time, Node._NODES_COMPUTED_FOR_BENCHMARKING
+
+
+if __name__ == "__main__":
+
+    n_operations = 20_000
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}")
+    print(f"{'threads':>8} {'workload':>12} {'operations/s':>13} {'nodes created':>14} {'speedup':>8}")
+
+    for shared in (False, True):
+        workload = "shared" if shared else "independent"
+        baseline_throughput = None
+        for n_threads in (1, 2, 4, 8):
+            throughput, nodes_created = measure_throughput(
+                n_threads, n_operations, shared
+            )
+            baseline_throughput = baseline_throughput or throughput
+            print(
+                f"{n_threads:>8} {workload:>12} {throughput:>13,.0f} {nodes_created:>14,} "
+                f"{throughput / baseline_throughput:>8.2f}"
+            )
@@ -0,0 +1,53 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from autodiff_team29 import Node
+
+
+def individual_inputs(names, point):
+    """
+    Creates every input with its own seed vector.
+
+    """
+    Node.clear_node_registry()
+    seed_vectors = np.identity(len(point))
+    return [
+        Node(name, value, 1, seed_vector=seed_vector)
+        for name, value, seed_vector in zip(names, point, seed_vectors)
+    ]
+
+
+def bulk_inputs(names, point, sparse=False):
+    """
+    Creates every input in one call to Node.variables.
+
+    """
+    Node.clear_node_registry()
+    return Node.variables(names, point, sparse=sparse)
+
+
+if __name__ == "__main__":
+
+    rng = np.random.default_rng(0)
+    print(f"{'inputs':>8} {'creation':>17} {'time (s)':>9} {'peak memory (MB)':>17}")
+
+    for n_inputs in (100, 1_000, 4_000):
+        names = [f"x{index}" for index in range(n_inputs)]
+        point = rng.uniform(size=n_inputs).tolist()
+        for creation, create in (
+            ("individual", lambda: individual_inputs(names, point)),
+            ("variables", lambda: bulk_inputs(names, point)),
+            ("variables sparse", lambda: bulk_inputs(names, point, sparse=True)),
+        ):
+            start = time.perf_counter()
+            create()
+            elapsed_time = time.perf_counter() - start
+
+            tracemalloc.start()
+            create()
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{n_inputs:>8} {creation:>17} {elapsed_time:>9.3f} {peak_memory / 2**20:>17.1f}")
@@ -0,0 +1,54 @@
+from expects import expect, equal, be_true
+import numpy as np
+
+from autodiff_team29.arena import TangentArena
+
+
+class TestTangentArena:
+    """
+    Test that the arena reuses its buffer and counts allocations.
+
+    """
+
+    def test_requests_that_fit_reuse_the_buffer(self):
+        """
+        Verify that smaller requests are views of the existing buffer
+
+        """
+        arena = TangentArena()
+        rows = arena.reserve(4, (3,))
+        smaller_rows = arena.reserve(2, (2,))
+
+        expect(rows.shape).to(equal((4, 3)))
+        expect(smaller_rows.shape).to(equal((2, 2)))
+        expect(np.shares_memory(rows, smaller_rows)).to(be_true)
+        expect(arena.statistics()).to(
+            equal({"allocations": 1, "allocated_bytes": 96, "reuses": 1, "stored_bytes": 96})
+        )
+
+    def test_growing_keeps_the_larger_dimensions(self):
+        """
+        Verify that a buffer grown along one dimension keeps its size along the others
+
+        """
+        arena = TangentArena()
+        arena.reserve(2, (8,))
+        rows = arena.reserve(4, (2,))
+        arena.reserve(4, (8,))
+
+        expect(rows.shape).to(equal((4, 2)))
+        expect(arena.allocations).to(equal(2))
+        expect(arena.reuses).to(equal(1))
+        expect(arena.nbytes).to(equal(4 * 8 * 8))
+
+    def test_release_preserves_counters(self):
+        """
+        Verify that releasing the buffer frees its memory but keeps lifetime counters
+
+        """
+        arena = TangentArena()
+        arena.reserve(2, (2,))
+        arena.release()
+
+        expect(arena.nbytes).to(equal(0))
+        expect(arena.allocated_bytes).to(equal(32))
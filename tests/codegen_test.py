@@ -0,0 +1,141 @@
+import pytest
+from expects import expect, equal, be_true
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, compile_tape, numpy_source, trace, grad, implicit_solve
+from autodiff_team29 import codegen
+import autodiff_team29.elementaries as E
+
+
+def vector_function(x, y):
+    return [
+        x * y + E.sin(x) - E.cos(y) / E.exp(x),
+        E.tan(x * 0.3) + E.arcsin(x / 3) * E.arccos(y / 4) - E.arctan(y) ** 2,
+        E.sinh(x) * E.cosh(y) / E.tanh(y * x) + E.logistic(x - y) * E.tanh(-x),
+        E.sqrt(y) + x**y + 2**x - x / y - (x - 3) * -2.0,
+        E.ln(x * y + 1) + E.log(y * y, 2) * x,
+        -x,
+        y * 0 + 5.0,
+    ]
+
+
+class TestCompileTape:
+    """
+    Test that tapes compiled to NumPy reproduce the values and derivatives of the tape.
+
+    """
+
+    def test_compiled_function_matches_tape(self):
+        """
+        Verify values and Jacobians at a single point and at an array of points
+
+        """
+        tape = trace(vector_function, 2)
+        compiled = compile_tape(tape)
+
+        for point in [(0.7, 1.3), (np.linspace(0.1, 1.0, 5), np.linspace(1.0, 2.0, 5))]:
+            expected_values, expected_jacobian = tape(*point)
+            values, jacobian = compiled(*point)
+
+            expect(jacobian.shape).to(equal(expected_jacobian.shape))
+            assert_array_almost_equal(values, expected_values)
+            assert_array_almost_equal(jacobian, expected_jacobian)
+
+    def test_float32_tapes_keep_their_dtype(self):
+        """
+        Verify that tapes traced under a float32 dtype policy compile to functions returning float32 like the tape
+
+        """
+        with Node.dtype_scope("float32"):
+            tape = trace(vector_function, 2)
+        compiled = compile_tape(tape)
+
+        batch = (np.linspace(0.1, 1.0, 5, dtype=np.float32), np.linspace(1.0, 2.0, 5, dtype=np.float32))
+        for point in [(0.7, 1.3), batch]:
+            expected_values, expected_jacobian = tape(*point)
+            values, jacobian = compiled(*point)
+
+            expect(np.asarray(values).dtype).to(equal(np.asarray(expected_values).dtype))
+            expect(jacobian.dtype).to(equal(expected_jacobian.dtype))
+            assert_array_almost_equal(jacobian, expected_jacobian, decimal=4)
+
+    def test_scalar_functions_return_value_and_gradient(self):
+        """
+        Verify scalar functions, including logarithms of expressions, against the gradient
+
+        """
+        function = lambda x, y: E.ln(x * y + 1) + E.log(y * y, 2) * x
+        compiled = compile_tape(trace(function, 2))
+
+        value, gradient = compiled(0.5, 3.0)
+        expected_value = np.log(0.5 * 3.0 + 1) + np.log2(9.0) * 0.5
+
+        expect(np.allclose(value, expected_value)).to(be_true)
+        assert_array_almost_equal(gradient, grad(lambda x: function(x[0], x[1]))([0.5, 3.0]))
+
+    def test_non_finite_constants(self):
+        """
+        Verify that infinite and nan constants are compiled like the tape evaluates them
+
+        """
+        for constant in [float("inf"), float("-inf"), float("nan")]:
+            tape = trace(lambda x: [x * constant + x, x - constant], 1)
+            expected_values, expected_jacobian = tape(1.0)
+
+            values, jacobian = compile_tape(tape)(1.0)
+
+            np.testing.assert_array_equal(values, expected_values)
+            np.testing.assert_array_equal(jacobian, expected_jacobian)
+
+    def test_structurally_zero_derivatives_are_not_computed(self):
+        """
+        Verify that tangents are only generated along the inputs a slot depends on
+
+        """
+        tape = trace(lambda x, y: x * E.sin(y), 2)
+        source = numpy_source(tape)
+        _, gradient = compile_tape(tape)(2.0, 1.0)
+
+        expect("d2_0" in source).to(equal(False))
+        expect("Node" in source).to(equal(False))
+        expect(np.allclose(gradient, [np.sin(1.0), 2.0 * np.cos(1.0)])).to(be_true)
+
+    def test_compiled_functions_are_cached(self):
+        """
+        Verify that compiling a tape again, or a tape of the same structure, returns the same function
+
+        """
+        tape = trace(lambda x, y: x * y + E.exp(x), 2)
+        compiled = compile_tape(tape)
+
+        expect(compile_tape(tape) is compiled).to(be_true)
+        expect(compile_tape(trace(lambda x, y: x * y + E.exp(x), 2)) is compiled).to(be_true)
+        expect(compiled.source).to(equal(numpy_source(tape)))
+
+    def test_cache_keeps_most_recently_used_functions(self, monkeypatch):
+        """
+        Verify that the cache of compiled functions is bounded and evicts the least recently used function
+
+        """
+        monkeypatch.setattr(codegen, "_MAX_COMPILED_FUNCTIONS", 2)
+        monkeypatch.setattr(codegen, "_COMPILED_FUNCTIONS", type(codegen._COMPILED_FUNCTIONS)())
+
+        first = compile_tape(trace(lambda x: x + 1.0, 1))
+        second = compile_tape(trace(lambda x: x + 2.0, 1))
+        expect(compile_tape(trace(lambda x: x + 1.0, 1)) is first).to(be_true)
+        compile_tape(trace(lambda x: x + 3.0, 1))
+
+        expect(len(codegen._COMPILED_FUNCTIONS)).to(equal(2))
+        expect(first.source in codegen._COMPILED_FUNCTIONS).to(be_true)
+        expect(second.source in codegen._COMPILED_FUNCTIONS).to(equal(False))
+
+    def test_unsupported_operations_raise_value_error(self):
+        """
+        Verify that operations without a NumPy template are rejected
+
+        """
+        tape = trace(lambda theta: implicit_solve(lambda x, t: x * x - t, theta, 1.0), 1)
+
+        with pytest.raises(ValueError):
+            compile_tape(tape)
@@ -8,11 +8,15 @@ def teardown_module():
     """
     Once nodes are created, they will persist in the registry throughout the duration of the programs' execution, unless
     the registry is cleared. To prevent precomputed nodes persisting between test, we can clear the registry before and
-    after each test unit test runs. We will also make sure that overwrite mode is off by default
+    after each test unit test runs. We will also make sure that overwrite mode is off, the registry is unbounded and the dtype is float64 by default
 
     """
     Node.clear_node_registry()
+    Node.configure_registry()
     Node.set_overwrite_mode(False)
+    Node.set_dtype("float64")
     yield
     Node.clear_node_registry()
+    Node.configure_registry()
     Node.set_overwrite_mode(False)
+    Node.set_dtype("float64")
@@ -0,0 +1,88 @@
+import pytest
+from expects import expect, equal, be_a, be_true
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, Dual
+import autodiff_team29.elementaries as E
+
+
+def scalar_function(x, y):
+    return (
+        E.sqrt(x) * E.sin(y) / E.exp(x)
+        + E.log(x, 2) * E.tan(x * y)
+        - E.arcsin(x / 3) * E.arccos(x / 4)
+        + E.arctan(y) * E.sinh(x) / E.cosh(y)
+        + E.tanh(x) ** 2
+        - E.logistic(y)
+        + E.power(2, y)
+        - 1 / x
+    )
+
+
+class TestDual:
+    """
+    Test that dual numbers apply the forward rules of Node without symbolic bookkeeping.
+
+    """
+
+    def test_dual_numbers_match_nodes(self):
+        """
+        Verify that every operator and elementary gives the value and derivative of the equivalent nodes
+
+        """
+        x = Node("x", 1.2, 1, seed_vector=[1, 0])
+        y = Node("y", 0.7, 1, seed_vector=[0, 1])
+        expected = scalar_function(x, y)
+
+        result = scalar_function(Dual(1.2, np.array([1.0, 0.0])), Dual(0.7, np.array([0.0, 1.0])))
+
+        expect(result).to(be_a(Dual))
+        expect(np.allclose(result.value, expected.value)).to(be_true)
+        assert_array_almost_equal(result.derivative, expected.derivative)
+
+    def test_numbers_are_constants_on_either_side(self):
+        """
+        Verify that reflected operators treat numbers as constants with zero derivative
+
+        """
+        x = Dual(2.0, 1.0)
+        result = 3 - x + 4 / x + 2 * x + 1 + 2**x
+
+        expect(result.value).to(equal(3 - 2 + 2 + 4 + 1 + 4))
+        expect(np.allclose(result.derivative, -1 - 1 + 2 + 4 * np.log(2))).to(be_true)
+
+    def test_batched_dual_numbers(self):
+        """
+        Verify that dual numbers holding arrays evaluate several points at once
+
+        """
+        x = Dual(np.array([0.5, 1.0, 2.0]), np.array([[1.0], [1.0], [1.0]]))
+        result = E.sin(x) * x
+
+        assert_array_almost_equal(result.derivative[:, 0], np.cos(x.value) * x.value + np.sin(x.value))
+
+    def test_domain_errors_are_raised(self):
+        """
+        Verify that dual numbers share the domain checks of the forward rules
+
+        """
+        with pytest.raises(ValueError):
+            E.ln(Dual(-1.0, 1.0))
+
+    def test_no_nodes_are_stored(self):
+        """
+        Verify that computing with dual numbers does not touch the registry
+
+        """
+        scalar_function(Dual(1.2, 1.0), Dual(0.7, 0.0))
+
+        expect(Node.count_nodes_stored()).to(equal(0))
+
+    def test_dual_numbers_have_no_instance_dictionary(self):
+        """
+        Verify that dual numbers only store their value and derivative
+
+        """
+        with pytest.raises(AttributeError):
+            Dual(1.0, 1.0).symbol = "x"
@@ -0,0 +1,150 @@
+import math
+
+import pytest
+from expects import expect, equal, be_a, be_true
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, VectorFunction, grad, hvp, implicit_solve
+import autodiff_team29.elementaries as E
+
+
+def residual(x, p):
+    return [x[0] * x[0] + x[1] - p[0], x[0] - p[1] * x[1]]
+
+
+def newton_solution(a, b):
+    x = np.array([1.0, 1.0])
+    for _ in range(50):
+        r = np.array([x[0] ** 2 + x[1] - a, x[0] - b * x[1]])
+        jacobian = np.array([[2 * x[0], 1], [1, -b]])
+        x = x - np.linalg.solve(jacobian, r)
+    return x
+
+
+class TestImplicitSolve:
+    """
+    Test that solutions of implicit problems carry derivatives from the implicit function theorem.
+
+    """
+
+    def test_scalar_root(self):
+        """
+        Verify the value and derivative of the square root as the root of x * x - theta
+
+        """
+        theta = Node("theta", 4.0, 1)
+
+        x = implicit_solve(lambda x, theta: x * x - theta, theta, 1.0)
+
+        expect(x).to(be_a(Node))
+        expect(np.allclose(x.value, 2.0)).to(be_true)
+        expect(np.allclose(x.derivative, 0.25)).to(be_true)
+
+    def test_system_matches_finite_differences(self):
+        """
+        Verify the Jacobian of the solution of a system against central differences of Newton's method
+
+        """
+        a, b = Node.variables(["a", "b"], [3.0, 2.0])
+        step = 1e-6
+        expected = np.column_stack(
+            [
+                (newton_solution(3 + step, 2) - newton_solution(3 - step, 2)) / (2 * step),
+                (newton_solution(3, 2 + step) - newton_solution(3, 2 - step)) / (2 * step),
+            ]
+        )
+
+        solution = implicit_solve(residual, [a, b], [1.0, 1.0])
+
+        expect(len(solution)).to(equal(2))
+        assert_array_almost_equal(VectorFunction(solution).value, [1.5, 0.75])
+        assert_array_almost_equal(VectorFunction(solution).jacobian, expected)
+
+    def test_fixed_point(self):
+        """
+        Verify the derivative of a fixed point x = cos(t x) written as a root
+
+        """
+        t = Node("t", 0.5, 1)
+
+        x = implicit_solve(lambda x, t: E.cos(t * x) - x, t, 0.7)
+
+        expected = -math.sin(0.5 * x.value) * x.value / (1 + 0.5 * math.sin(0.5 * x.value))
+        expect(np.allclose(x.value, math.cos(0.5 * x.value))).to(be_true)
+        expect(np.allclose(x.derivative, expected)).to(be_true)
+
+    def test_solution_composes_with_other_nodes(self):
+        """
+        Verify that the solution is a node of the graph, for forward mode and reverse mode
+
+        """
+        theta = Node("theta", 4.0, 1)
+
+        y = 3 * implicit_solve(lambda x, theta: x * x - theta, theta, 1.0) + theta
+
+        expect(np.allclose(y.derivative, 1.75)).to(be_true)
+        gradient = grad(
+            lambda theta: 3 * implicit_solve(lambda x, theta: x * x - theta, theta, 1.0) + theta
+        )(4.0)
+        expect(np.allclose(gradient, 1.75)).to(be_true)
+
+    def test_hessians_match_closed_form_solution(self):
+        """
+        Verify second derivatives of a scalar root and of a system against their closed form solutions
+
+        """
+        theta = Node("theta", 4.0, 1)
+        result = E.sin(implicit_solve(lambda x, theta: x * x - theta, theta, 1.0))
+        expected = -math.sin(2.0) / 16 - math.cos(2.0) / 32
+        expect(np.allclose(result.hessian, expected)).to(be_true)
+
+        # x0 = sqrt(a * b) and x1 = x0 * a
+        def fn(theta):
+            x = implicit_solve(
+                lambda x, theta: [x[0] * x[0] - theta[0] * theta[1], x[1] - x[0] * theta[0]],
+                list(theta),
+                [1.0, 1.0],
+            )
+            return x[1] * theta[1]
+
+        a, b = Node.variables(["a", "b"], [2.0, 3.0])
+        expected = E.sqrt(a * b) * a * b
+
+        assert_array_almost_equal(fn([a, b]).hessian, expected.hessian)
+        assert_array_almost_equal(hvp(fn, [2.0, 3.0], [1.0, -1.0]), expected.hessian @ [1.0, -1.0])
+
+    def test_update_solves_again(self):
+        """
+        Verify that updating a parameter recomputes the solution and its derivative
+
+        """
+        theta = Node("theta", 4.0, 1)
+        x = implicit_solve(lambda x, theta: x * x - theta, theta, 1.0)
+
+        theta.update(9.0)
+
+        expect(np.allclose(x.value, 3.0)).to(be_true)
+        expect(np.allclose(x.derivative, 1 / 6)).to(be_true)
+
+    def test_graph_does_not_grow_with_iterations(self):
+        """
+        Verify that the iterations of the solver create no node in the active registry
+
+        """
+        theta = Node("theta", 1e6, 1)
+        n_stored = Node.count_nodes_stored()
+
+        implicit_solve(lambda x, theta: x * x - theta, theta, 1.0)
+
+        expect(Node.count_nodes_stored()).to(equal(n_stored + 1))
+
+    def test_invalid_problems_are_rejected(self):
+        """
+        Verify that non node parameters and problems without a root raise value errors
+
+        """
+        with pytest.raises(ValueError):
+            implicit_solve(lambda x, theta: x - theta, 2.0, 1.0)
+        with pytest.raises(ValueError):
+            implicit_solve(lambda x, theta: x * x + theta, Node("theta", 1.0, 1), 1.0)
@@ -0,0 +1,225 @@
+import pytest
+from expects import expect, equal, be_a, be_true
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, Loop, VectorFunction, fori_loop, grad, hvp, scan
+import autodiff_team29.elementaries as E
+
+
+def oscillator(carry, t):
+    return [carry[0] + 0.01 * carry[1] * E.cos(t), carry[1] - 0.01 * E.sin(carry[0])]
+
+
+def unrolled(carry, xs):
+    for x in xs:
+        carry = oscillator(carry, x)
+    return carry
+
+
+class TestLoop:
+    """
+    Test that loops traced once match the unrolled Python loop.
+
+    """
+
+    def test_forward_matches_unrolled_loop(self):
+        """
+        Verify the final carry and its Jacobian against the graph of the unrolled loop
+
+        """
+        xs = np.linspace(0, 1, 50)
+        x, y = Node.variables(["x", "y"], [0.9, 0.3])
+        expected = VectorFunction(unrolled([x, y], xs))
+
+        values, jacobian = Loop(oscillator, 2).forward([0.9, 0.3], xs)
+
+        assert_array_almost_equal(values, expected.value)
+        assert_array_almost_equal(jacobian, expected.jacobian)
+
+    @pytest.mark.parametrize("checkpoint_every", [None, 1, 7, 50, 200])
+    def test_vjp_matches_forward_mode(self, checkpoint_every):
+        """
+        Verify that reverse mode with checkpoints gives the cotangent times the Jacobian of forward mode
+
+        """
+        xs = np.linspace(0, 1, 50)
+        loop = Loop(oscillator, 2)
+        values, jacobian = loop.forward([0.9, 0.3], xs)
+
+        vjp_values, product = loop.vjp([0.9, 0.3], xs, [1.0, -0.5], checkpoint_every)
+
+        assert_array_almost_equal(vjp_values, values)
+        assert_array_almost_equal(product, np.array([1.0, -0.5]) @ jacobian)
+
+    @pytest.mark.parametrize("checkpoints", [1, 2, 3, 10, 49, 50, 100])
+    def test_binomial_vjp_matches_forward_mode(self, checkpoints):
+        """
+        Verify that the binomial schedule gives the cotangent times the Jacobian within its budget of carries
+
+        """
+        xs = np.linspace(0, 1, 50)
+        loop = Loop(oscillator, 2)
+        values, jacobian = loop.forward([0.9, 0.3], xs)
+
+        vjp_values, product = loop.vjp([0.9, 0.3], xs, [1.0, -0.5], checkpoints=checkpoints)
+
+        assert_array_almost_equal(vjp_values, values)
+        assert_array_almost_equal(product, np.array([1.0, -0.5]) @ jacobian)
+        expect(loop.statistics()["stored_carries"] <= checkpoints).to(be_true)
+
+    def test_binomial_recomputation_shrinks_with_budget(self):
+        """
+        Verify that larger budgets recompute fewer steps, down to a single sweep when every carry fits
+
+        """
+        xs = np.linspace(0, 1, 200)
+        loop = Loop(oscillator, 2)
+
+        recomputed = []
+        for checkpoints in (3, 10, 200):
+            loop.vjp([0.9, 0.3], xs, [1.0, -0.5], checkpoints=checkpoints)
+            recomputed.append(loop.statistics()["recomputed_steps"])
+
+        expect(recomputed[0] > recomputed[1] > recomputed[2]).to(be_true)
+        expect(recomputed[2]).to(equal(199))
+        # with 10 carries, every step is recomputed at most 3 times since comb(10 + 3, 3) >= 200
+        expect(recomputed[1] <= 3 * 200).to(be_true)
+
+    def test_every_checkpoint_reduces_recomputation(self):
+        """
+        Verify that every additional checkpoint of a small budget is used to recompute fewer steps
+
+        """
+        xs = np.linspace(0, 1, 137)
+        loop = Loop(oscillator, 2)
+
+        recomputed = []
+        for checkpoints in (1, 2, 3):
+            loop.vjp([0.9, 0.3], xs, [1.0, -0.5], checkpoints=checkpoints)
+            recomputed.append(loop.statistics()["recomputed_steps"])
+
+        expect(recomputed[0] > recomputed[1] > recomputed[2]).to(be_true)
+        # without a free checkpoint the sweep is quadratic, one free checkpoint allows 16 recomputations per step
+        expect(recomputed[0]).to(equal(137 * 136 // 2))
+        expect(recomputed[1] <= 16 * 137).to(be_true)
+
+    def test_invalid_loops_are_rejected(self):
+        """
+        Verify that bodies must return the carry and checkpoints must be positive
+
+        """
+        with pytest.raises(ValueError):
+            Loop(lambda carry, t: [carry[0]], 2)
+        with pytest.raises(ValueError):
+            Loop(oscillator, 2).vjp([0.9, 0.3], [0.0, 1.0], [1.0, 1.0], checkpoint_every=0)
+        with pytest.raises(ValueError):
+            Loop(oscillator, 2).vjp([0.9, 0.3], [0.0, 1.0], [1.0, 1.0], checkpoints=0)
+
+
+class TestScan:
+    """
+    Test that scan and fori_loop return the final carry as nodes of the graph.
+
+    """
+
+    def test_scan_matches_unrolled_loop(self):
+        """
+        Verify the values and derivatives of the final carry, for seed vectors
+
+        """
+        xs = np.linspace(0, 1, 50)
+        x, y = Node.variables(["x", "y"], [0.9, 0.3])
+        expected = VectorFunction(unrolled([x, y], xs))
+
+        final_carry = scan(oscillator, [x, y], xs)
+
+        expect(final_carry[0]).to(be_a(Node))
+        assert_array_almost_equal(VectorFunction(final_carry).value, expected.value)
+        assert_array_almost_equal(VectorFunction(final_carry).jacobian, expected.jacobian)
+
+    def test_loop_adds_one_node_per_carry_value(self):
+        """
+        Verify that the steps of the loop create no node in the active registry
+
+        """
+        x = Node("x", 0.5, 1)
+        n_stored = Node.count_nodes_stored()
+
+        result = fori_loop(1000, lambda i, x: x - 0.0001 * x * x, x)
+
+        expect(Node.count_nodes_stored()).to(equal(n_stored + 1))
+        # Euler steps of dx/dt = -x^2 up to t = 0.1, whose solution is 1 / (1 / x0 + t)
+        expect(np.allclose(result.derivative, 4 / 2.1**2, atol=1e-4)).to(be_true)
+
+    def test_fori_loop_passes_step_index(self):
+        """
+        Verify that the body receives the index of the step
+
+        """
+        x = Node("x", 1.0, 1)
+
+        result = fori_loop(5, lambda i, x: x + i * x, x)
+
+        expect(np.allclose(result.value, 120.0)).to(be_true)
+        expect(np.allclose(result.derivative, 120.0)).to(be_true)
+
+    def test_reverse_mode_and_updates(self):
+        """
+        Verify that gradients flow through the loop and updates iterate it again
+
+        """
+        gradient = grad(lambda x: 2 * fori_loop(10, lambda i, x: x * x, x))(1.01)
+        expect(np.allclose(gradient, 2 * 1024 * 1.01**1023)).to(be_true)
+
+        x = Node("x", 2.0, 1)
+        result = fori_loop(3, lambda i, x: x * x, x)
+        x.update(3.0)
+        expect(np.allclose(result.value, 3.0**8)).to(be_true)
+        expect(np.allclose(result.derivative, 8 * 3.0**7)).to(be_true)
+
+    def test_hessians_match_unrolled_loop(self):
+        """
+        Verify Hessians and Hessian vector products of functions of the final carry
+
+        """
+        xs = np.linspace(0, 1, 20)
+
+        def loss(carry, loop):
+            final_carry = loop(carry, xs)
+            return E.sin(final_carry[0]) * final_carry[1]
+
+        x, y = Node.variables(["x", "y"], [0.9, 0.3])
+        expected = loss([x, y], unrolled)
+
+        result = loss([x, y], lambda carry, xs: scan(oscillator, carry, xs))
+
+        assert_array_almost_equal(result.hessian, expected.hessian)
+        assert_array_almost_equal(
+            hvp(lambda v: loss(v, lambda carry, xs: scan(oscillator, carry, xs)), [0.9, 0.3], [1.0, -2.0]),
+            expected.hessian @ [1.0, -2.0],
+        )
+
+    def test_empty_loops_and_invalid_carries(self):
+        """
+        Verify that loops without steps return their carry and carries must be nodes
+
+        """
+        x = Node("x", 1.0, 1)
+
+        expect(scan(oscillator, x, [])).to(equal(x))
+        with pytest.raises(ValueError):
+            scan(oscillator, [1.0, 2.0], [0.0])
+
+    def test_batched_carries_are_rejected(self):
+        """
+        Verify that loops over batched carries raise a clear error instead of comparing arrays
+
+        """
+        x = Node.batch("x", [0.5, 0.7, 0.9])
+        y = Node("y", 0.3, 1)
+
+        with pytest.raises(ValueError, match="batched"):
+            scan(oscillator, [x, y], np.linspace(0, 1, 5))
+        with pytest.raises(ValueError, match="batched"):
+            fori_loop(5, lambda i, x: x * x, x)
@@ -1,10 +1,16 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import threading
 import warnings
 
 import pytest
-from expects import expect, equal, be, be_none, be_true, be_empty, have_key
+from expects import expect, equal, be, be_a, be_none, be_true, be_empty, have_key
 import numpy as np
 
 from autodiff_team29.node import Node
+from autodiff_team29.tangent import SparseTangent
+from autodiff_team29.elementaries import sqrt, ln, log
 
 
 class TestNodeRegistry:
@@ -99,6 +105,624 @@ class TestNodeRegistry:
         expect(Node.count_nodes_stored()).to(equal(0))
 
 
+class TestStructuralKeys:
+    """
+    Derived nodes are stored under compact structural keys and render their symbols lazily.
+
+    """
+
+    def test_derived_nodes_are_keyed_on_operation_and_operand_ids(self):
+        """
+        Verify that the registry key of a derived node holds the operation and the ids of its operands
+
+        """
+        x = Node("x", 1, 1)
+        y = Node("y", 2, 1)
+        z = x - y
+
+        expect(Node._NODE_REGISTRY).to(have_key(("-", x._id, y._id)))
+        expect(Node._get_existing_node(("-", x._id, y._id))).to(be(z))
+
+    def test_commutative_operations_share_a_node(self):
+        """
+        Verify that x + y and y + x resolve to the same registered instance
+
+        """
+        x = Node("x", 1, 1)
+        y = Node("y", 2, 1)
+
+        expect(y + x).to(be(x + y))
+        expect(y * x).to(be(x * y))
+
+    def test_symbol_is_rendered_lazily(self):
+        """
+        Verify that derived nodes only build their symbolic representation when it is requested
+
+        """
+        x = Node("x", 1, 1)
+        y = (x + 2) * x
+
+        expect(y._symbol).to(be_none)
+        expect(y.symbol).to(equal("((2+x)*x)"))
+        expect(y._symbol).to(equal("((2+x)*x)"))
+
+    def test_symbol_of_deep_graph_does_not_exceed_recursion_limit(self):
+        """
+        Verify that rendering the symbol of a graph deeper than the recursion limit succeeds
+
+        """
+        x = Node("x", 1, 1)
+        y = x
+        for _ in range(5000):
+            y = -y
+
+        expect(y.symbol).to(equal("-" * 5000 + "x"))
+
+
+class TestRebindingInputs:
+    """
+    Test that binding an input symbol to a new point only invalidates the nodes computed from it.
+
+    """
+
+    def test_rebinding_returns_node_at_new_point(self):
+        """
+        Verify that creating an input with a new value does not return the stale node
+
+        """
+        x = Node("x", 2, 1)
+        y = x * x
+        x = Node("x", 3, 1)
+
+        expect(x.value).to(equal(3))
+        expect((x * x).value).to(equal(9))
+        expect((x * x).derivative).to(equal(6))
+        expect(Node._NODE_REGISTRY).not_to(have_key(y._key))
+
+    def test_same_binding_returns_existing_node(self):
+        """
+        Verify that recreating an input at the same point keeps the registered node and its dependents
+
+        """
+        x = Node("x", 2, 1, seed_vector=[1, 0])
+        y = x * x
+
+        expect(Node("x", 2, 1, seed_vector=[1, 0])).to(be(x))
+        expect(Node._NODE_REGISTRY).to(have_key(y._key))
+        expect(Node.registry_statistics()["generation"]).to(equal(0))
+
+    def test_new_seed_vector_rebinds_input(self):
+        """
+        Verify that changing the seed vector of an input counts as a new binding
+
+        """
+        x = Node("x", 2, 1, seed_vector=[1, 0])
+        rebound_x = Node("x", 2, 1, seed_vector=[0, 1])
+
+        expect(rebound_x).not_to(be(x))
+        expect(all(rebound_x.derivative == np.array([0, 1]))).to(be_true)
+
+    def test_only_dependent_nodes_are_invalidated(self):
+        """
+        Verify that nodes computed from the rebound input are removed, including indirect dependents,
+        while nodes computed from other inputs and constants survive
+
+        """
+        x = Node("x", 2, 1)
+        y = Node("y", 5, 1)
+        constant = Node("c", 4, 0) * 3
+        y_squared = y * y
+        mixed = (x + constant) * y_squared
+
+        Node("x", 7, 1)
+
+        expect(Node._NODE_REGISTRY).to(have_key(constant._key))
+        expect(Node._NODE_REGISTRY).to(have_key(y_squared._key))
+        expect(Node._NODE_REGISTRY).not_to(have_key(mixed._key))
+        expect(Node.registry_statistics()["invalidations"]).to(equal(2))
+        expect(Node.registry_statistics()["generation"]).to(equal(1))
+
+
+class TestIncrementalReevaluation:
+    """
+    Test that updating an input only recomputes the nodes that depend on it.
+
+    """
+
+    def test_update_recomputes_dependent_nodes(self):
+        """
+        Verify that values and derivatives of dependent nodes reflect the updated input
+
+        """
+        x = Node("x", 2, 1)
+        y = sqrt(x * x + 5)
+
+        x.update(6)
+
+        expect(y.value).to(equal(np.sqrt(41)))
+        expect(y.derivative).to(equal(6 / np.sqrt(41)))
+
+    def test_only_dirty_cone_is_recomputed(self):
+        """
+        Verify that nodes that do not depend on the updated input are not marked dirty
+        and that dirty nodes are clean once read
+
+        """
+        x = Node("x", 2, 1)
+        y = Node("y", 3, 1)
+        y_squared = y * y
+        f = x * y_squared
+
+        x.update(4)
+
+        expect(f._dirty).to(be_true)
+        expect(y_squared._dirty).to(equal(False))
+        expect(f.value).to(equal(36))
+        expect(f._dirty).to(equal(False))
+
+    def test_update_with_seed_vector(self):
+        """
+        Verify that the derivative of an input can be updated along with its value
+
+        """
+        x = Node("x", 2, 1, seed_vector=[1, 0])
+        y = x * 3
+
+        x.update(5, 2, seed_vector=[0, 1])
+
+        expect(y.value).to(equal(15))
+        expect(all(y.derivative == np.array([0, 6]))).to(be_true)
+
+    def test_update_of_deep_graph_does_not_exceed_recursion_limit(self):
+        """
+        Verify that recomputing a graph deeper than the recursion limit succeeds
+
+        """
+        x = Node("x", 1.0, 1)
+        y = x
+        for _ in range(5000):
+            y = y + 1
+
+        x.update(2.0)
+
+        expect(y.value).to(equal(5002.0))
+
+    def test_computed_nodes_cannot_be_updated(self):
+        """
+        Verify that only input nodes can be updated
+
+        """
+        x = Node("x", 2, 1)
+        with pytest.raises(ValueError):
+            (x + 1).update(3)
+
+
+class TestBatchedNodes:
+    """
+    Test that batched nodes evaluate a graph at many points at once.
+
+    """
+
+    def test_batched_derivative_has_one_row_per_point(self):
+        """
+        Verify the shapes of batched values and derivatives with and without seed vectors
+
+        """
+        x = Node.batch("x", [1, 2, 3])
+        y = Node.batch("y", [4, 5, 6], seed_vector=[0, 1])
+
+        expect(x.is_batched).to(be_true)
+        expect(x.value.shape).to(equal((3,)))
+        expect(x.derivative.shape).to(equal((3, 1)))
+        expect(y.derivative.shape).to(equal((3, 2)))
+
+    def test_operators_broadcast_scalars_against_batches(self):
+        """
+        Verify that scalar operands and scalar nodes are broadcast against the batch
+
+        """
+        x = Node.batch("x", [1, 2, 3], seed_vector=[1, 0])
+        y = Node("y", 2, 1, seed_vector=[0, 1])
+        z = (3 * x - y) / x + x**2
+
+        expected_value = np.array([1, 2, 3]) ** 2 + 3 - 2 / np.array([1, 2, 3])
+        expected_derivative = np.array(
+            [[2 * v + 2 / v**2, -1 / v] for v in [1.0, 2.0, 3.0]]
+        )
+        expect(np.allclose(z.value, expected_value)).to(be_true)
+        expect(np.allclose(z.derivative, expected_derivative)).to(be_true)
+
+    def test_derivative_per_point(self):
+        """
+        Verify that every point of a batch can have its own derivative
+
+        """
+        x = Node.batch("x", [1, 2], derivative=np.array([1, 2]))
+        expect(np.allclose((x * x).derivative, [[2], [8]])).to(be_true)
+
+    def test_batched_nodes_are_rebound_and_updated(self):
+        """
+        Verify that batched inputs are deduplicated, rebound to new points and updated in place
+
+        """
+        x = Node.batch("x", [1, 2])
+        expect(Node.batch("x", [1, 2])).to(be(x))
+
+        rebound_x = Node.batch("x", [3, 4])
+        expect(rebound_x).not_to(be(x))
+
+        y = rebound_x * 2
+        rebound_x.update([5, 6, 7], 1)
+        expect(np.allclose(y.value, [10, 12, 14])).to(be_true)
+        expect(y.derivative.shape).to(equal((3, 1)))
+
+    def test_invalid_batches_raise_value_error(self):
+        """
+        Verify that batches must be one dimensional and derivatives must match their length
+
+        """
+        with pytest.raises(ValueError):
+            Node.batch("x", [[1, 2], [3, 4]])
+        with pytest.raises(ValueError):
+            Node.batch("x", [1, 2, 3], derivative=np.array([1, 2]))
+
+    def test_scalar_nodes_reject_arrays(self):
+        """
+        Verify that arrays are only accepted as values through Node.batch
+
+        """
+        with pytest.raises(TypeError):
+            Node("x", np.array([1.0, 2.0]), 1)
+
+
+class TestBulkVariables:
+    """
+    Test that Node.variables creates all inputs of a function in one call.
+
+    """
+
+    def test_inputs_are_seeded_with_unit_vectors(self):
+        """
+        Verify that every input is seeded with its own unit vector and matches individually created inputs
+
+        """
+        x, y, z = Node.variables(["x", "y", "z"], [1, 2, 3])
+        w = x * y + sqrt(z)
+
+        Node.clear_node_registry()
+        a = Node("x", 1, 1, seed_vector=[1, 0, 0])
+        b = Node("y", 2, 1, seed_vector=[0, 1, 0])
+        c = Node("z", 3, 1, seed_vector=[0, 0, 1])
+
+        expect(np.array_equal(y.derivative, [0, 1, 0])).to(be_true)
+        expect(np.allclose(w.derivative, (a * b + sqrt(c)).derivative)).to(be_true)
+
+    def test_seed_vectors_share_one_buffer(self):
+        """
+        Verify that seed vectors are views of a single buffer rather than separate arrays
+
+        """
+        nodes = Node.variables([f"x{index}" for index in range(5)], range(5), derivative=2)
+        buffer = nodes[0].derivative.base
+
+        expect(buffer.shape).to(equal((5, 5)))
+        expect(all(node.derivative.base is buffer for node in nodes)).to(be_true)
+        expect(np.array_equal(buffer, 2 * np.identity(5))).to(be_true)
+
+    def test_sparse_inputs_store_one_entry(self):
+        """
+        Verify that sparse inputs are seeded with unit SparseTangents
+
+        """
+        x, y = Node.variables(["x", "y"], [2.0, 3.0], sparse=True)
+
+        expect(x.derivative).to(be_a(SparseTangent))
+        expect(y.derivative.nnz).to(equal(1))
+        expect(np.array_equal((x * y).derivative, [3, 2])).to(be_true)
+
+    def test_inputs_are_stored_in_the_registry(self):
+        """
+        Verify that inputs created in bulk are retrieved like individually created inputs
+
+        """
+        x, y = Node.variables(["x", "y"], [2, 3])
+
+        expect(Node._get_existing_node("x")).to(be(x))
+        expect(Node._get_existing_node("y")).to(be(y))
+
+    def test_mismatched_or_duplicate_names_raise_value_error(self):
+        """
+        Verify that every value needs exactly one unique name
+
+        """
+        with pytest.raises(ValueError):
+            Node.variables(["x", "y"], [1, 2, 3])
+        with pytest.raises(ValueError):
+            Node.variables(["x", "x"], [1, 2])
+
+    def test_unsupported_value_raises_type_error(self):
+        """
+        Verify that values are type checked before any input is created
+
+        """
+        with pytest.raises(TypeError):
+            Node.variables(["x", "y"], [1, "2"])
+        expect(Node._NODE_REGISTRY).not_to(have_key("x"))
+
+
+class TestDtypePolicy:
+    """
+    Test that seed vectors and batches follow the global or scoped dtype.
+
+    """
+
+    def test_seed_vectors_default_to_float64(self):
+        """
+        Verify that integer seed vectors are not stored with an integer dtype
+
+        """
+        x = Node("x", 2, 1, seed_vector=[1, 0])
+
+        expect(x.derivative.dtype).to(equal(np.float64))
+
+    def test_float32_is_preserved_through_operations(self):
+        """
+        Verify that derivatives computed from float32 inputs stay float32, also when mixed with scalar partials
+
+        """
+        Node.set_dtype("float32")
+        x = Node("x", 0.5, 1, seed_vector=[1, 0])
+        y = Node("y", 2.0, 1, seed_vector=[0, 1])
+        z = sqrt(x) * y - x / y + 3 * x**2
+
+        expect(z.derivative.dtype).to(equal(np.float32))
+        expect(
+            np.allclose(z.derivative, [y.value / (2 * np.sqrt(0.5)) - 1 / 2 + 3, np.sqrt(0.5) + 0.5 / 4])
+        ).to(be_true)
+
+    def test_float32_is_preserved_through_logarithms(self):
+        """
+        Verify that logarithms of float32 batches keep the dtype of their values and derivatives
+
+        """
+        Node.set_dtype("float32")
+        x = Node.batch("x", [0.5, 1.0, 2.0], seed_vector=[1, 0])
+        y = Node.batch("y", [2.0, 3.0, 4.0], seed_vector=[0, 1])
+
+        for result in [ln(x * y), log(x * y, 2)]:
+            expect(result.value.dtype).to(equal(np.float32))
+            expect(result.derivative.dtype).to(equal(np.float32))
+
+    def test_scope_sets_dtype_of_batches(self):
+        """
+        Verify that batches created within a dtype scope use its dtype, and the previous dtype is restored after it
+
+        """
+        with Node.dtype_scope("float32"):
+            x = Node.batch("x", [1, 2, 3], seed_vector=[1, 0])
+
+        y = Node.batch("y", [1, 2, 3], seed_vector=[0, 1])
+
+        expect(x.value.dtype).to(equal(np.float32))
+        expect(x.derivative.dtype).to(equal(np.float32))
+        expect(y.derivative.dtype).to(equal(np.float64))
+
+    def test_changing_dtype_rebinds_inputs(self):
+        """
+        Verify that an input created under another dtype is not retrieved from the registry
+
+        """
+        x = Node("x", 2, 1, seed_vector=[1, 0])
+        with Node.dtype_scope("float32"):
+            y = Node("x", 2, 1, seed_vector=[1, 0])
+
+        expect(y).not_to(be(x))
+        expect(y.derivative.dtype).to(equal(np.float32))
+
+    def test_unsupported_dtype_raises_value_error(self):
+        """
+        Verify that only floating point dtypes are accepted
+
+        """
+        with pytest.raises(ValueError):
+            Node.set_dtype("int64")
+        with pytest.raises(ValueError):
+            with Node.dtype_scope("float16"):
+                pass
+
+
+class TestHessian:
+    """
+    Test second derivatives propagated forward over forward.
+
+    """
+
+    def test_hessian_of_polynomial(self):
+        """
+        Verify the Hessian with respect to the seed directions of the inputs
+
+        """
+        x = Node("x", 2, 1, seed_vector=[1, 0])
+        y = Node("y", 3, 1, seed_vector=[0, 1])
+        z = x * x * y + x / y - 4 * y
+
+        expected = [[2 * 3, 2 * 2 - 1 / 9], [2 * 2 - 1 / 9, 2 * 2 / 27]]
+        expect(np.allclose(z.hessian, expected)).to(be_true)
+
+    def test_hessian_of_scalar_input_is_second_derivative(self):
+        """
+        Verify that inputs without seed vectors give the second derivative
+
+        """
+        x = Node("x", 0.5, 1)
+
+        expect(np.allclose(sqrt(x).hessian, -1 / (4 * 0.5**1.5))).to(be_true)
+        expect((3 * x + 1).hessian).to(equal(0))
+
+    def test_batched_hessian_has_one_matrix_per_point(self):
+        """
+        Verify that batched nodes give the Hessian at every point
+
+        """
+        x = Node.batch("x", [1, 2, 3], seed_vector=[1, 0])
+        y = Node.batch("y", [4, 5, 6], seed_vector=[0, 1])
+        hessian = (x**3 * y).hessian
+
+        expect(hessian.shape).to(equal((3, 2, 2)))
+        expect(np.allclose(hessian[1], [[6 * 2 * 5, 3 * 4], [3 * 4, 0]])).to(be_true)
+
+
+class TestRegistryScopes:
+    """
+    Test that Node.registry_scope isolates computations without touching the global registry.
+
+    """
+
+    def test_isolated_scope_starts_empty_and_discards_nodes(self):
+        """
+        Verify that an isolated scope neither sees nor modifies the global registry
+
+        """
+        x = Node("x", 1, 1)
+
+        with Node.registry_scope(policy="isolated"):
+            expect(Node.count_nodes_stored()).to(equal(0))
+            scoped_x = Node("x", 1, 1)
+            expect(scoped_x).not_to(be(x))
+
+        expect(Node.count_nodes_stored()).to(equal(1))
+        expect(Node._get_existing_node("x")).to(be(x))
+
+    def test_layered_scope_reuses_parent_nodes(self):
+        """
+        Verify that a layered scope retrieves nodes from its parent but stores new nodes locally
+
+        """
+        x = Node("x", 1, 1)
+        y = x + 1
+
+        with Node.registry_scope(policy="layered"):
+            expect(x + 1).to(be(y))
+            z = y * 2
+            expect(Node.count_nodes_stored()).to(equal(2))
+            Node.clear_node_registry()
+
+        expect(Node.count_nodes_stored()).to(equal(3))
+        expect(Node._NODE_REGISTRY).not_to(have_key(z._key))
+
+    def test_disabled_scope_recomputes_without_clearing(self):
+        """
+        Verify that disabling the registry within a scope does not clear the global registry
+
+        """
+        x = Node("x", 1, 1)
+        y = x + 1
+
+        with Node.registry_scope(policy="disabled"):
+            expect(x + 1).not_to(be(y))
+
+        expect(Node.count_nodes_stored()).to(equal(3))
+        expect(x + 1).to(be(y))
+
+    def test_unknown_scope_policy_raises_value_error(self):
+        """
+        Verify that only supported scope policies are accepted
+
+        """
+        with pytest.raises(ValueError):
+            with Node.registry_scope(policy="shared"):
+                pass
+
+    def test_threads_do_not_share_scopes(self):
+        """
+        Verify that a scope entered in one thread is not visible from another thread
+
+        """
+        with Node.registry_scope(policy="isolated") as registry:
+            thread = threading.Thread(target=Node, args=("threaded", 1, 1))
+            thread.start()
+            thread.join()
+
+            expect(registry).not_to(have_key("threaded"))
+
+        expect(Node._NODE_REGISTRY).to(have_key("threaded"))
+
+    def test_asyncio_tasks_use_their_own_scopes(self):
+        """
+        Verify that concurrent asyncio tasks computing the same expression do not interfere
+
+        """
+
+        async def evaluate(value):
+            with Node.registry_scope(policy="isolated"):
+                x = Node("x", value, 1)
+                await asyncio.sleep(0)
+                return (x * x).value
+
+        async def evaluate_concurrently():
+            return await asyncio.gather(evaluate(2), evaluate(3))
+
+        expect(asyncio.run(evaluate_concurrently())).to(equal([4, 9]))
+        expect(Node.count_nodes_stored()).to(equal(0))
+
+
+class TestConcurrentConstruction:
+    """
+    Test that graphs built concurrently from several threads share a single instance per node.
+
+    """
+
+    @pytest.fixture(autouse=True)
+    def frequent_thread_switches(self):
+        """
+        Switch threads as often as possible to provoke races between lookup and insertion
+
+        """
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        yield
+        sys.setswitchinterval(switch_interval)
+
+    def test_threads_building_the_same_graph_share_nodes(self):
+        """
+        Verify that every thread retrieves the same result instance and the registry holds each node once
+
+        """
+        n_threads = 8
+        barrier = threading.Barrier(n_threads)
+
+        def build(_):
+            barrier.wait()
+            x = Node("x", 2.0, 1)
+            value = x
+            for _ in range(200):
+                value = sqrt(value) + x
+            return value
+
+        with ThreadPoolExecutor(n_threads) as executor:
+            results = list(executor.map(build, range(n_threads)))
+
+        expect(all(result is results[0] for result in results)).to(be_true)
+        expect(Node.count_nodes_stored()).to(equal(401))
+
+    def test_node_counter_is_not_lost_under_contention(self):
+        """
+        Verify that concurrently created nodes each increment the node counter
+
+        """
+        Node.set_overwrite_mode(True)
+        Node._NODES_COMPUTED_FOR_BENCHMARKING = 0
+        n_threads = 8
+
+        def build(thread_index):
+            for node_index in range(500):
+                Node(f"x{thread_index}_{node_index}", 1, 1)
+
+        with ThreadPoolExecutor(n_threads) as executor:
+            list(executor.map(build, range(n_threads)))
+
+        expect(Node._NODES_COMPUTED_FOR_BENCHMARKING).to(equal(n_threads * 500))
+
 
 class TestNodeCreation:
     """
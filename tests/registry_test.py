@@ -0,0 +1,320 @@
+from concurrent.futures import ThreadPoolExecutor
+import gc
+
+import pytest
+from expects import expect, equal, be, be_true, have_key, have_keys
+import numpy as np
+
+from autodiff_team29 import Node
+from autodiff_team29.registry import NodeRegistry
+from autodiff_team29.elementaries import sqrt
+
+
+class TestEvictionPolicies:
+    """
+    Test that bounded registries evict nodes according to their policy.
+
+    """
+
+    def test_unknown_policy_raises_value_error(self):
+        """
+        Verify that only supported eviction policies are accepted
+
+        """
+        with pytest.raises(ValueError):
+            NodeRegistry(policy="fifo")
+
+    def test_budget_without_policy_raises_value_error(self):
+        """
+        Verify that a budget cannot be enforced without an eviction policy
+
+        """
+        with pytest.raises(ValueError):
+            NodeRegistry(max_entries=10)
+
+    def test_lru_evicts_least_recently_retrieved_node(self):
+        """
+        Retrieving a node protects it from eviction under the lru policy
+
+        """
+        registry = NodeRegistry(policy="lru", max_entries=2)
+        registry["a"] = Node("a", 1, 1)
+        registry["b"] = Node("b", 2, 1)
+        registry["a"]
+        registry["c"] = Node("c", 3, 1)
+
+        expect(list(registry)).to(equal(["a", "c"]))
+        expect(registry.evictions).to(equal(1))
+
+    def test_lfu_evicts_least_frequently_retrieved_node(self):
+        """
+        Frequently retrieved nodes survive under the lfu policy, even if they were not retrieved recently
+
+        """
+        registry = NodeRegistry(policy="lfu", max_entries=2)
+        registry["a"] = Node("a", 1, 1)
+        registry["b"] = Node("b", 2, 1)
+        registry["a"]
+        registry["a"]
+        registry["b"]
+        registry["c"] = Node("c", 3, 1)
+
+        expect(registry).to(have_keys("a", "c"))
+        expect(registry.evictions).to(equal(1))
+
+    def test_byte_budget_accounts_for_array_derivatives(self):
+        """
+        Nodes with large array derivatives consume more of the byte budget than scalar nodes
+
+        """
+        registry = NodeRegistry(policy="lru", max_bytes=10_000)
+        registry["small"] = Node("small", 1, 1)
+        registry["large"] = Node("large", 1, 1, seed_vector=np.zeros(2_000))
+
+        expect(registry.evictions).to(equal(2))
+        expect(registry.evicted_bytes > 16_000).to(be_true)
+        expect(len(registry)).to(equal(0))
+
+    def test_clear_preserves_eviction_counters(self):
+        """
+        Clearing the registry is not counted as an eviction and keeps lifetime counters
+
+        """
+        registry = NodeRegistry(policy="lru", max_entries=1)
+        registry["a"] = Node("a", 1, 1)
+        registry["b"] = Node("b", 2, 1)
+        registry.clear()
+
+        expect(registry.statistics()).to(
+            have_keys(entries=0, stored_bytes=0, evictions=1)
+        )
+
+
+class TestBoundedNodeRegistry:
+    """
+    Test Node computations on a bounded registry.
+
+    """
+
+    def test_configure_registry_keeps_existing_nodes(self):
+        """
+        Verify that nodes stored before reconfiguring remain retrievable
+
+        """
+        x = Node("x", 1, 1)
+        Node.configure_registry(policy="lru", max_entries=10)
+
+        expect(Node._NODE_REGISTRY).to(have_key("x"))
+        expect(Node._get_existing_node("x")).to(be(x))
+
+    def test_registry_size_stays_within_budget(self):
+        """
+        Verify that graph construction on a bounded registry never exceeds the entry budget
+        and still computes the correct derivative
+
+        """
+        Node.configure_registry(policy="lru", max_entries=16)
+
+        x = Node("x", 2.0, 1)
+        y = x
+        for _ in range(100):
+            y = sqrt(y) + 1
+
+        expect(Node.count_nodes_stored() <= 16).to(be_true)
+        expect(Node.registry_statistics()["evictions"] > 0).to(be_true)
+
+        Node.set_overwrite_mode(True)
+        z = Node("x", 2.0, 1)
+        for _ in range(100):
+            z = sqrt(z) + 1
+        expect(y.value).to(equal(z.value))
+        expect(y.derivative).to(equal(z.derivative))
+
+
+class TestWeakReferenceRegistry:
+    """
+    Test that weakly referenced registries deduplicate live nodes and release unreachable ones.
+
+    """
+
+    def test_live_nodes_remain_deduplicated(self):
+        """
+        Verify that nodes held by user code are still retrieved from the registry
+
+        """
+        Node.configure_registry(weak_references=True)
+        x = Node("x", 4, 1)
+        y = sqrt(x) + x
+
+        expect(Node("x", 4, 1)).to(be(x))
+        expect(sqrt(x) + x).to(be(y))
+
+    def test_unreachable_nodes_are_removed(self):
+        """
+        Verify that intermediates are dropped from the registry once the result is no longer referenced
+
+        """
+        Node.configure_registry(weak_references=True)
+        x = Node("x", 4, 1)
+        y = x
+        for _ in range(10):
+            y = sqrt(y) * 2
+
+        # x, the constant 2 and the 20 intermediates are stored
+        expect(Node.count_nodes_stored()).to(equal(22))
+
+        del y
+        expect(Node.count_nodes_stored()).to(equal(1))
+        expect(Node.registry_statistics()["reclaimed"]).to(equal(21))
+
+    def test_operands_of_live_nodes_are_kept_alive(self):
+        """
+        Verify that operands are reachable through the nodes that consume them
+
+        """
+        Node.configure_registry(weak_references=True)
+        y = sqrt(Node("x", 4, 1))
+
+        expect(Node._NODE_REGISTRY).to(have_key("x"))
+        expect(y._operands[0]).to(be(Node._get_existing_node("x")))
+
+
+    def test_garbage_collection_during_eviction(self):
+        """
+        Verify that nodes garbage collected in the middle of an eviction are removed afterwards, not during it
+
+        """
+
+        class CollectingRegistry(NodeRegistry):
+            def _discard(self, key):
+                # a collection triggered by an allocation while the lock is held by this thread
+                gc.collect()
+                return super()._discard(key)
+
+        class Entry:
+            pass
+
+        registry = CollectingRegistry(policy="lru", max_entries=2, weak_references=True)
+        gc.disable()
+        try:
+            # entries in reference cycles are only released by the garbage collector
+            garbage = Entry()
+            garbage.cycle = garbage
+            registry["garbage"] = garbage
+            del garbage
+            live = [Entry(), Entry()]
+            registry["a"] = live[0]
+            registry["b"] = live[1]
+        finally:
+            gc.enable()
+
+        expect(list(registry)).to(equal(["a", "b"]))
+        expect(registry.evictions).to(equal(1))
+        expect(registry.reclaimed).to(equal(0))
+        expect(registry.stored_bytes).to(equal(sum(registry._sizes.values())))
+
+
+class TestConcurrentRegistry:
+    """
+    Test that a bounded registry stays consistent when shared between threads.
+
+    """
+
+    def test_concurrent_insertions_respect_budget_and_accounting(self):
+        """
+        Verify that entry budget and byte accounting hold after concurrent insertions and retrievals
+
+        """
+        registry = NodeRegistry(policy="lfu", max_entries=50)
+        Node.set_overwrite_mode(True)
+        nodes = [Node(f"x{index}", index, 1) for index in range(400)]
+
+        def insert_and_retrieve(offset):
+            for index in range(offset, len(nodes), 4):
+                registry.setdefault(nodes[index]._key, nodes[index])
+                if nodes[index - 1]._key in registry:
+                    try:
+                        registry[nodes[index - 1]._key]
+                    except KeyError:
+                        pass
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(insert_and_retrieve, range(4)))
+
+        expect(len(registry)).to(equal(50))
+        expect(registry.evictions).to(equal(350))
+        expect(registry.stored_bytes).to(equal(sum(registry._sizes.values())))
+
+
+    def test_nodes_evicted_between_lookups_are_recomputed(self, monkeypatch):
+        """
+        Verify that graph construction does not fail when a node reported as stored is evicted before it is retrieved
+
+        """
+        x = Node("x", 4, 1)
+        expected = sqrt(x).value
+        Node.clear_node_registry()
+
+        # membership claims every key, as if the node was evicted right after the check
+        monkeypatch.setattr(NodeRegistry, "__contains__", lambda registry, key: True)
+        x = Node("x", 4, 1)
+
+        expect(sqrt(x).value).to(equal(expected))
+
+    def test_concurrent_graph_construction_with_eviction(self):
+        """
+        Verify that threads building the same graph in a small registry never observe a missing node
+
+        """
+        Node.configure_registry(policy="lru", max_entries=4)
+
+        def build(offset):
+            x = Node("x", 0.5, 1)
+            for _ in range(200):
+                value = sqrt(x * x + offset % 2) * x
+            return value.value
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(build, range(8)))
+
+        expect(np.allclose(results[::2], 0.25)).to(be_true)
+        expect(np.allclose(results[1::2], np.sqrt(1.25) * 0.5)).to(be_true)
+
+
+class TestRebinding:
+    """
+    Test that rebinding a key removes the nodes computed from it.
+
+    """
+
+    def test_storing_a_new_input_invalidates_dependents_of_an_evicted_input(self):
+        """
+        Verify that the dependents of an input are removed even if the input itself has already been evicted
+
+        """
+        Node.configure_registry(policy="lru", max_entries=3)
+        x = Node("x", 4, 1)
+        y = sqrt(x)
+        z = sqrt(y)
+        w = sqrt(z)
+        registry = Node._NODE_REGISTRY
+        expect(registry).not_to(have_key("x"))
+
+        Node("x", 9, 1)
+
+        expect(registry).not_to(have_key(y._key))
+        expect(registry).not_to(have_key(z._key))
+        expect(registry).not_to(have_key(w._key))
+        expect(registry.invalidations).to(equal(3))
+
+    def test_discarded_nodes_release_dependency_edges(self):
+        """
+        Verify that dependency edges do not outlive the nodes they describe
+
+        """
+        Node.configure_registry(policy="lru", max_entries=2)
+        x = Node("x", 4, 1)
+        for _ in range(100):
+            x = sqrt(x)
+
+        expect(len(Node._NODE_REGISTRY._dependents) <= 3).to(be_true)
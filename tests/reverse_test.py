@@ -0,0 +1,235 @@
+import pytest
+from expects import expect, equal
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, VectorFunction, grad, hvp
+from autodiff_team29.reverse import backward
+import autodiff_team29.elementaries as E
+
+
+def loss(x):
+    return (
+        E.sin(x[0] * x[1])
+        + E.log(x[0], 3) * E.sqrt(x[1])
+        + x[0] ** x[1] / (2 - x[1])
+        + E.ln(x[1]) * x[0] * x[0]
+        - (-x[2])
+        + E.logistic(x[0]) * E.tanh(x[2])
+        + 3 ** x[1]
+    )
+
+
+def finite_differences(fn, point, step=1e-6):
+    """
+    Approximates the gradient of fn with central differences.
+
+    """
+    gradient = []
+    for index in range(len(point)):
+        forward_point, backward_point = list(point), list(point)
+        forward_point[index] += step
+        backward_point[index] -= step
+        with Node.registry_scope(policy="isolated"):
+            forward_value = fn([Node(f"x{i}", v, 0) for i, v in enumerate(forward_point)])
+            backward_value = fn([Node(f"x{i}", v, 0) for i, v in enumerate(backward_point)])
+        gradient.append((forward_value.value - backward_value.value) / (2 * step))
+
+    return np.array(gradient)
+
+
+class TestGrad:
+    """
+    Test gradients computed with a single reverse mode sweep.
+
+    """
+
+    def test_gradient_matches_finite_differences(self):
+        """
+        Verify the gradient of a function using every kind of operation
+
+        """
+        point = [0.7, 1.3, -0.4]
+        assert_array_almost_equal(grad(loss)(point), finite_differences(loss, point))
+
+    def test_gradient_matches_forward_mode(self):
+        """
+        Verify that reverse mode agrees with forward mode seed vectors
+
+        """
+
+        def fn(x):
+            return E.exp(x[0] * x[1]) / (1 + x[2] ** 2) - E.arctan(x[1]) * x[2]
+
+        point = [0.3, -1.2, 2.0]
+        nodes = [
+            Node(f"x{index}", value, 1, seed_vector=np.identity(3)[index])
+            for index, value in enumerate(point)
+        ]
+        assert_array_almost_equal(grad(fn)(point), fn(nodes).derivative)
+
+    def test_logarithms_of_expressions_match_forward_mode(self):
+        """
+        Verify that forward and reverse mode apply the chain rule through ln and log of compound arguments
+
+        """
+
+        def fn(x):
+            return E.ln(x[0] * x[1]) + E.log(x[0] * x[0] + x[1], 2) * x[1]
+
+        point = [2.0, 3.0]
+        nodes = [
+            Node(f"x{index}", value, 1, seed_vector=np.identity(2)[index])
+            for index, value in enumerate(point)
+        ]
+        expected = [
+            1 / 2.0 + 3.0 * 4.0 / (7.0 * np.log(2)),
+            1 / 3.0 + np.log2(7.0) + 3.0 / (7.0 * np.log(2)),
+        ]
+
+        assert_array_almost_equal(fn(nodes).derivative, expected)
+        assert_array_almost_equal(grad(fn)(point), expected)
+        assert_array_almost_equal(VectorFunction([fn(nodes)]).jacobian[0], expected)
+
+    def test_scalar_input_returns_scalar_derivative(self):
+        """
+        Verify that functions of a single number receive a node and return a number
+
+        """
+        expect(grad(lambda x: x * x * x)(2.0)).to(equal(12.0))
+
+    def test_unused_inputs_have_zero_gradient(self):
+        """
+        Verify that inputs the function does not depend on have a zero gradient
+
+        """
+        expect(list(grad(lambda x: x[0] * 2)([1.0, 5.0]))).to(equal([2.0, 0.0]))
+
+    def test_grad_does_not_modify_active_registry(self):
+        """
+        Verify that the graph recorded for the backward pass does not pollute the registry
+
+        """
+        x = Node("x", 1, 1)
+        grad(loss)([0.7, 1.3, -0.4])
+
+        expect(list(Node._NODE_REGISTRY)).to(equal(["x"]))
+
+    def test_non_node_output_raises_value_error(self):
+        """
+        Verify that only functions returning nodes can be differentiated
+
+        """
+        with pytest.raises(ValueError):
+            grad(lambda x: 1.0)([1.0])
+
+
+class TestBackward:
+    """
+    Test the adjoint sweep shared by grad and VectorFunction.vjp.
+
+    """
+
+    def test_adjoints_accumulate_over_shared_nodes(self):
+        """
+        Verify that a node used several times receives the sum of its adjoints
+
+        """
+        x = Node("x", 2, 0)
+        y = E.sin(x)
+        z = y * y + y
+
+        adjoints = backward([z], [1])
+
+        expect(np.isclose(adjoints[id(y)], 2 * np.sin(2) + 1)).to(equal(True))
+        expect(np.isclose(adjoints[id(x)], (2 * np.sin(2) + 1) * np.cos(2))).to(equal(True))
+
+    def test_deep_graph_does_not_exceed_recursion_limit(self):
+        """
+        Verify that the sweep over a graph deeper than the recursion limit succeeds
+
+        """
+        x = Node("x", 1.0, 0)
+        y = x
+        for _ in range(5000):
+            y = y * 1.0001
+
+        expect(np.isclose(backward([y], [1])[id(x)], 1.0001**5000)).to(equal(True))
+
+
+class TestVectorJacobianProduct:
+    """
+    Test vector Jacobian products of vector functions.
+
+    """
+
+    def test_vjp_matches_jacobian_product(self):
+        """
+        Verify that the vjp equals the cotangent multiplied with the forward mode Jacobian
+
+        """
+        x = Node("x", 0.5, 1, seed_vector=[1, 0])
+        y = Node("y", 2.0, 1, seed_vector=[0, 1])
+        f = VectorFunction([x * y + E.sin(x), x / y, E.sqrt(x * x + y)])
+        cotangent = np.array([1.0, -2.0, 0.5])
+
+        assert_array_almost_equal(f.vjp(cotangent), cotangent @ f.jacobian)
+
+    def test_vjp_with_wrong_cotangent_size_raises_value_error(self):
+        """
+        Verify that the cotangent must have one entry per function
+
+        """
+        x = Node("x", 0.5, 1)
+        with pytest.raises(ValueError):
+            VectorFunction([x, x * 2]).vjp([1.0])
+
+
+class TestHvp:
+    """
+    Test Hessian vector products computed forward over reverse.
+
+    """
+
+    def test_products_with_unit_vectors_match_finite_differences_of_the_gradient(self):
+        """
+        Verify every column of the Hessian of a function using every kind of operation
+
+        """
+        point = np.array([0.7, 1.3, -0.4])
+        gradient = grad(loss)
+        step = 1e-6
+        for direction in np.identity(3):
+            expected = (gradient(point + step * direction) - gradient(point - step * direction)) / (2 * step)
+            assert_array_almost_equal(hvp(loss, point, direction), expected)
+
+    def test_product_matches_full_hessian(self):
+        """
+        Verify that the product with an arbitrary vector is the Hessian times the vector
+
+        """
+        point = [0.7, 1.3, -0.4]
+        direction = np.array([0.3, -2.0, 1.5])
+        inputs = [
+            Node(f"x{index}", value, 1, seed_vector=seed_vector)
+            for index, (value, seed_vector) in enumerate(zip(point, np.identity(3)))
+        ]
+
+        assert_array_almost_equal(hvp(loss, point, direction), loss(inputs).hessian @ direction)
+
+    def test_scalar_input_returns_scalar_product(self):
+        """
+        Verify that a scalar point gives the second derivative times the direction
+
+        """
+        product = hvp(lambda x: x * x * x, 2.0, 0.5)
+
+        expect(product).to(equal(6.0))
+
+    def test_mismatched_direction_raises_value_error(self):
+        """
+        Verify that the direction must have the shape of the point
+
+        """
+        with pytest.raises(ValueError):
+            hvp(loss, [0.7, 1.3, -0.4], [1.0, 0.0])
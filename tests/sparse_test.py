@@ -0,0 +1,191 @@
+import pytest
+from expects import expect, equal, be
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, VectorFunction
+from autodiff_team29.sparse import SparseJacobian, color_columns
+import autodiff_team29.elementaries as E
+
+
+def residuals(x):
+    """
+    Residuals of a discretized second order differential equation, with a tridiagonal Jacobian.
+
+    """
+    n = len(x)
+    return [
+        (x[i - 1] if i > 0 else 0) - 2 * x[i] + (x[i + 1] if i < n - 1 else 0) + E.sin(x[i])
+        for i in range(n)
+    ]
+
+
+def tridiagonal_pattern(n):
+    return [[j for j in (i - 1, i, i + 1) if 0 <= j < n] for i in range(n)]
+
+
+class TestColorColumns:
+    """
+    Test that columns sharing a nonzero row never receive the same color.
+
+    """
+
+    @pytest.mark.parametrize("n", [1, 2, 10, 50])
+    def test_tridiagonal_pattern_needs_three_colors(self, n):
+        """
+        Verify that banded patterns are colored with as many colors as the bandwidth
+
+        """
+        colors = color_columns(tridiagonal_pattern(n), n)
+
+        expect(int(colors.max()) + 1).to(equal(min(n, 3)))
+
+    def test_columns_of_a_color_are_structurally_orthogonal(self):
+        """
+        Verify that no row has two nonzeros of the same color in a random pattern
+
+        """
+        pattern = np.random.default_rng(0).random((30, 40)) < 0.1
+        colors = color_columns(pattern, 40)
+
+        for row in pattern:
+            row_colors = colors[np.flatnonzero(row)]
+            expect(len(set(row_colors))).to(equal(len(row_colors)))
+
+    def test_dense_pattern_needs_one_color_per_column(self):
+        """
+        Verify that a dense row forces every column into its own color
+
+        """
+        expect(sorted(color_columns(np.ones((2, 5), dtype=bool), 5))).to(
+            equal([0, 1, 2, 3, 4])
+        )
+
+
+class TestSparseJacobian:
+    """
+    Test sparse Jacobians computed from compressed seed directions.
+
+    """
+
+    def test_sparse_jacobian_matches_dense_jacobian(self):
+        """
+        Verify that the sparse Jacobian equals the Jacobian of dense seed vectors
+
+        """
+        n = 20
+        x = [
+            Node(f"x{i}", 0.1 * i, 1, seed_vector=np.identity(n)[i]) for i in range(n)
+        ]
+        f = VectorFunction(residuals(x))
+
+        jacobian = f.sparse_jacobian(tridiagonal_pattern(n), chunk_size=2)
+
+        expect(jacobian.nnz).to(equal(3 * n - 2))
+        assert_array_almost_equal(jacobian.toarray(), f.jacobian)
+
+    def test_sparse_jacobian_with_respect_to_inputs(self):
+        """
+        Verify that boolean patterns and columns with respect to inputs are supported
+
+        """
+        n = 6
+        x = [Node(f"x{i}", 0.1 * i, 1) for i in range(n)]
+        f = VectorFunction(residuals(x))
+        pattern = np.abs(np.subtract.outer(np.arange(n), np.arange(n))) <= 1
+
+        jacobian = f.sparse_jacobian(pattern, wrt=x)
+
+        assert_array_almost_equal(jacobian.toarray(), f.compute_jacobian(wrt=x))
+
+    def test_pattern_must_have_one_row_per_function(self):
+        """
+        Verify that patterns of the wrong size are rejected
+
+        """
+        x = Node("x", 1, 1)
+        with pytest.raises(ValueError):
+            VectorFunction([x, x * 2]).sparse_jacobian([[0]])
+
+    def test_csr_conversion(self):
+        """
+        Verify the row pointers, column indices and data of the compressed sparse row format
+
+        """
+        jacobian = SparseJacobian([2, 0, 0], [1, 2, 0], [3.0, 2.0, 1.0], (3, 3))
+        data, indices, indptr = jacobian.tocsr()
+
+        expect(list(data)).to(equal([1.0, 2.0, 3.0]))
+        expect(list(indices)).to(equal([0, 2, 1]))
+        expect(list(indptr)).to(equal([0, 2, 2, 3]))
+
+
+class TestSparsityPattern:
+    """
+    Test sparsity patterns detected by propagating index sets.
+
+    """
+
+    def test_detected_pattern_matches_nonzeros_of_jacobian(self):
+        """
+        Verify that the detected pattern of a tridiagonal system is tridiagonal
+
+        """
+        n = 8
+        x = [Node(f"x{i}", 0.1 * i + 0.5, 1) for i in range(n)]
+        f = VectorFunction(residuals(x))
+
+        expect(f.sparsity_pattern(wrt=x)).to(equal(tridiagonal_pattern(n)))
+
+    def test_pattern_follows_seed_vectors(self):
+        """
+        Verify that inputs depend on the columns where their seed vector is nonzero
+
+        """
+        x = Node("x", 1, 1, seed_vector=[1, 0, 0])
+        y = Node("y", 2, 1, seed_vector=[0, 1, 1])
+        f = VectorFunction([x * 2, E.exp(y) + x, Node("c", 3, 0) * 1])
+
+        expect(f.sparsity_pattern()).to(equal([[0], [0, 1, 2], []]))
+
+    def test_pattern_is_cached_and_reused_after_update(self):
+        """
+        Verify that the pattern is computed once and the detected pattern gives the Jacobian at new points
+
+        """
+        n = 6
+        x = [Node(f"x{i}", 0.1 * i + 0.5, 1) for i in range(n)]
+        f = VectorFunction(residuals(x))
+        pattern = f.sparsity_pattern(wrt=x)
+
+        f.update({"x2": 3.0})
+
+        expect(f.sparsity_pattern(wrt=x)).to(be(pattern))
+        assert_array_almost_equal(
+            f.sparse_jacobian(wrt=x).toarray(), f.compute_jacobian(wrt=x)
+        )
+
+    def test_pattern_follows_updated_seed_vectors(self):
+        """
+        Verify that a cached pattern is not reused after the seed vectors of the inputs change
+
+        """
+        x = Node("x", 1, 1, seed_vector=[1, 0])
+        y = Node("y", 2, 1, seed_vector=[0, 1])
+        f = VectorFunction([x * 2, E.exp(y)])
+        expect(f.sparsity_pattern()).to(equal([[0], [1]]))
+
+        x.update(1, 1, seed_vector=[0, 1])
+        y.update(2, 1, seed_vector=[1, 0])
+
+        expect(f.sparsity_pattern()).to(equal([[1], [0]]))
+        assert_array_almost_equal(f.sparse_jacobian().toarray(), f.jacobian)
+
+    def test_pattern_with_respect_to_non_input_raises_value_error(self):
+        """
+        Verify that columns must belong to inputs of the vector function
+
+        """
+        f = VectorFunction([Node("x", 1, 1) * 2])
+        with pytest.raises(ValueError):
+            f.sparsity_pattern(wrt=[Node("y", 1, 1)])
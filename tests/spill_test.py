@@ -0,0 +1,131 @@
+import gc
+import os
+
+import pytest
+from expects import expect, equal, be_true
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import MappedTape, trace
+import autodiff_team29.elementaries as E
+
+
+def vector_function(x, y):
+    return [x * y + E.sin(x), E.exp(x) / y + 3, E.log(y, 2) * E.power(x, 2.5)]
+
+
+class TestMappedTape:
+    """
+    Test that tapes spilled to memory mapped files reproduce the in-memory tape.
+
+    """
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 65_536])
+    def test_vjp_matches_tape(self, tmp_path, chunk_size):
+        """
+        Verify values and vector Jacobian products for chunks smaller and larger than the tape
+
+        """
+        tape = trace(vector_function, 2)
+        mapped = MappedTape.from_tape(tape, str(tmp_path), chunk_size=chunk_size)
+
+        for point in [(0.7, 1.3), (2.0, 0.4)]:
+            expected_value, expected_product = tape.vjp(*point, cotangent=[1.0, -2.0, 0.5])
+            value, product = mapped.vjp(*point, cotangent=[1.0, -2.0, 0.5])
+
+            assert_array_almost_equal(value, expected_value)
+            assert_array_almost_equal(product, expected_product)
+            assert_array_almost_equal(mapped(*point), expected_value)
+
+    def test_scalar_functions_return_value_and_gradient(self, tmp_path):
+        """
+        Verify that tapes of scalar functions return a value and a gradient
+
+        """
+        mapped = MappedTape.from_tape(trace(lambda x, y: x * E.sin(y) + y, 2), str(tmp_path))
+
+        value, gradient = mapped.vjp(1.0, 2.0, cotangent=1.0)
+
+        expect(np.allclose(value, np.sin(2.0) + 2.0)).to(be_true)
+        assert_array_almost_equal(gradient, [np.sin(2.0), np.cos(2.0) + 1])
+
+    def test_files_are_written_to_directory(self, tmp_path):
+        """
+        Verify that instructions, values and adjoints are stored on disk
+
+        """
+        tape = trace(vector_function, 2)
+        mapped = MappedTape.from_tape(tape, str(tmp_path))
+
+        expect(sorted(os.listdir(tmp_path))).to(
+            equal(["adjoints.npy", "instructions.npy", "values.npy"])
+        )
+        expect(len(mapped)).to(equal(len(tape)))
+        expect(mapped.nbytes > 0).to(be_true)
+
+    def test_temporary_directories_are_removed(self, tmp_path):
+        """
+        Verify that default directories are removed on close, by the context manager and on garbage collection,
+        while given directories are kept
+
+        """
+        tape = trace(vector_function, 2)
+
+        mapped = MappedTape.from_tape(tape)
+        directory = mapped.directory
+        expect(os.path.isdir(directory)).to(be_true)
+        mapped.close()
+        expect(os.path.exists(directory)).to(equal(False))
+
+        with MappedTape.from_tape(tape) as mapped:
+            directory = mapped.directory
+            expect(np.allclose(mapped(0.7, 1.3), tape(0.7, 1.3)[0])).to(be_true)
+        expect(os.path.exists(directory)).to(equal(False))
+
+        mapped = MappedTape.from_tape(tape)
+        directory = mapped.directory
+        del mapped
+        gc.collect()
+        expect(os.path.exists(directory)).to(equal(False))
+
+        with MappedTape.from_tape(tape, str(tmp_path)):
+            pass
+        expect(sorted(os.listdir(tmp_path))).to(
+            equal(["adjoints.npy", "instructions.npy", "values.npy"])
+        )
+
+    def test_repr_and_closed_tapes(self, tmp_path):
+        """
+        Verify the representation of open and closed tapes, and that closed tapes cannot be evaluated
+
+        """
+        tape = trace(lambda x, y: x * E.sin(y) + y, 2)
+        mapped = MappedTape.from_tape(tape, str(tmp_path))
+
+        expect(repr(mapped)).to(
+            equal(f"MappedTape(directory={str(tmp_path)!r}, instructions={len(tape)})")
+        )
+
+        mapped.close()
+        expect(repr(mapped)).to(equal(f"MappedTape(directory={str(tmp_path)!r}, instructions=0)"))
+        with pytest.raises(ValueError, match="tape is closed"):
+            len(mapped)
+        with pytest.raises(ValueError, match="tape is closed"):
+            mapped.evaluate(1.0, 2.0)
+        with pytest.raises(ValueError, match="tape is closed"):
+            mapped.vjp(1.0, 2.0, cotangent=1.0)
+
+    def test_invalid_arguments_raise_value_error(self, tmp_path):
+        """
+        Verify that chunk sizes must be positive and inputs and cotangents must match the tape
+
+        """
+        tape = trace(vector_function, 2)
+        with pytest.raises(ValueError):
+            MappedTape.from_tape(tape, str(tmp_path), chunk_size=0)
+
+        mapped = MappedTape.from_tape(tape, str(tmp_path))
+        with pytest.raises(ValueError):
+            mapped.evaluate(1.0)
+        with pytest.raises(ValueError):
+            mapped.vjp(1.0, 2.0, cotangent=[1.0])
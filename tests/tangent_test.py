@@ -0,0 +1,133 @@
+import pytest
+from expects import expect, equal, be, be_a
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, SparseTangent
+from autodiff_team29.registry import NodeRegistry
+import autodiff_team29.elementaries as E
+
+
+class TestSparseTangentArithmetic:
+    """
+    Test that sparse tangents behave like the dense vectors they represent.
+
+    """
+
+    def test_sum_merges_indices(self):
+        """
+        Verify that entries at the same index are summed and other entries are kept
+
+        """
+        a = SparseTangent(np.array([1, 5]), np.array([1.0, 2.0]), 100)
+        b = SparseTangent(np.array([5, 9]), np.array([3.0, 4.0]), 100)
+
+        result = a + b
+
+        expect(list(result.indices)).to(equal([1, 5, 9]))
+        expect(list(result.values)).to(equal([1.0, 5.0, 4.0]))
+        assert_array_almost_equal(result.toarray(), a.toarray() + b.toarray())
+
+    def test_scalar_arithmetic_stays_sparse(self):
+        """
+        Verify that scaling, negation and adding zero derivatives of constants keep the tangent sparse
+
+        """
+        a = SparseTangent.unit(3, 100)
+        result = 0 + (-(np.float64(2.0) * a) / 4 - 0) * 3
+
+        expect(result).to(be_a(SparseTangent))
+        assert_array_almost_equal(result.toarray(), -1.5 * a.toarray())
+
+    def test_dense_operands_give_dense_results(self):
+        """
+        Verify that arithmetic with dense arrays or nonzero scalars falls back to dense arrays
+
+        """
+        a = SparseTangent.unit(0, 4)
+
+        assert_array_almost_equal(a + np.ones(4), [2, 1, 1, 1])
+        assert_array_almost_equal(a + 1, [2, 1, 1, 1])
+        assert_array_almost_equal(np.arange(4) * a, [0, 0, 0, 0])
+
+    def test_fill_above_threshold_is_densified(self):
+        """
+        Verify that results storing more entries than the threshold allows are returned as dense arrays
+
+        """
+        a = SparseTangent.unit(0, 8)
+        b = SparseTangent.unit(1, 8)
+        c = SparseTangent.unit(2, 8)
+
+        expect(a + b).to(be_a(SparseTangent))
+        expect(a + b + c).to(be_a(np.ndarray))
+
+
+class TestSparseSeededNodes:
+    """
+    Test nodes seeded with sparse tangents.
+
+    """
+
+    def function(self, x, y):
+        return E.sin(x * y) / E.sqrt(y) + E.exp(-x) * 3 - y**2 + E.tanh(x / y)
+
+    def test_sparse_seeds_match_dense_seeds(self):
+        """
+        Verify that values and derivatives agree with dense seed vectors
+
+        """
+        n = 50
+        dense = self.function(
+            Node("x", 0.5, 1, seed_vector=np.identity(n)[3]),
+            Node("y", 2.0, 1, seed_vector=np.identity(n)[7]),
+        )
+        Node.clear_node_registry()
+        sparse = self.function(
+            Node("x", 0.5, 1, seed_vector=SparseTangent.unit(3, n)),
+            Node("y", 2.0, 1, seed_vector=[0] * 7 + [1] + [0] * (n - 8), sparse=True),
+        )
+
+        expect(sparse.derivative).to(be_a(SparseTangent))
+        expect(sparse.derivative.nnz).to(equal(2))
+        expect(sparse.value).to(equal(dense.value))
+        assert_array_almost_equal(np.asarray(sparse.derivative), dense.derivative)
+
+    def test_logarithms_keep_sparse_tangents(self):
+        """
+        Verify that ln and log of expressions of sparse seeded nodes give sparse tangents
+
+        """
+        n = 50
+        x = Node("x", 0.5, 1, seed_vector=SparseTangent.unit(3, n))
+        y = Node("y", 2.0, 1, seed_vector=SparseTangent.unit(7, n))
+        result = E.ln(x * y) + E.log(x + y, 2)
+
+        expect(result.derivative).to(be_a(SparseTangent))
+        expected = np.zeros(n)
+        expected[3] = 1 / 0.5 + 1 / (2.5 * np.log(2))
+        expected[7] = 1 / 2.0 + 1 / (2.5 * np.log(2))
+        assert_array_almost_equal(np.asarray(result.derivative), expected)
+
+    def test_inputs_are_rebound_and_updated_with_sparse_seeds(self):
+        """
+        Verify that sparse seeds are compared by value when rebinding and accepted by update
+
+        """
+        x = Node("x", 1.0, 1, seed_vector=SparseTangent.unit(0, 10))
+        expect(Node("x", 1.0, 1, seed_vector=SparseTangent.unit(0, 10))).to(be(x))
+
+        y = x * 2
+        x.update(3.0, 1, seed_vector=SparseTangent.unit(4, 10))
+        expect(list(y.derivative.indices)).to(equal([4]))
+
+    def test_registry_accounts_for_sparse_tangents(self):
+        """
+        Verify that the byte budget counts the entries stored by sparse tangents
+
+        """
+        registry = NodeRegistry(policy="lru", max_bytes=10**6)
+        tangent = SparseTangent(np.arange(1000), np.ones(1000), 10**6)
+        registry["x"] = Node("x", 1, 1, seed_vector=tangent)
+
+        expect(registry.stored_bytes > tangent.nbytes).to(equal(True))
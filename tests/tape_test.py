@@ -0,0 +1,217 @@
+import pytest
+from expects import expect, equal, be_true
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, trace
+import autodiff_team29.elementaries as E
+
+
+def vector_function(x1, x2):
+    return [x1 * x2 + E.sin(x1), x1 + x2 + E.sin(x1 * x2), E.log(x1, 2) / x2]
+
+
+class TestTrace:
+    """
+    Test that tapes reproduce the values and derivatives of the traced function.
+
+    """
+
+    def test_replay_matches_graph_construction(self):
+        """
+        Verify that replaying the tape at new points gives the value and Jacobian of building the graph there
+
+        """
+        tape = trace(vector_function, 2)
+
+        for point in [(np.pi, np.pi / 2), (0.3, 4.0), (2.0, -1.5)]:
+            value, jacobian = tape(*point)
+
+            Node.clear_node_registry()
+            x1 = Node("x1", point[0], 1, seed_vector=[1, 0])
+            x2 = Node("x2", point[1], 1, seed_vector=[0, 1])
+            expected = vector_function(x1, x2)
+
+            assert_array_almost_equal(value, [f.value for f in expected])
+            assert_array_almost_equal(jacobian, [f.derivative for f in expected])
+
+    def test_scalar_function_returns_value_and_gradient(self):
+        """
+        Verify that tracing a function returning a single node gives its value and gradient
+
+        """
+        tape = trace(lambda x: E.sqrt(x) * 3 + 2, 1)
+        value, gradient = tape(4.0)
+
+        expect(value).to(equal(8.0))
+        assert_array_almost_equal(gradient, [0.75])
+
+    def test_constant_outputs_have_zero_derivative(self):
+        """
+        Verify that outputs that do not depend on the inputs still have a derivative of the right shape
+
+        """
+        tape = trace(lambda x, y: [x + y, x - x], 2)
+        _, jacobian = tape(1.0, 2.0)
+
+        assert_array_almost_equal(jacobian, [[1, 1], [0, 0]])
+
+    def test_shared_subexpressions_are_recorded_once(self):
+        """
+        Verify that a node used several times appears once on the tape
+
+        """
+        tape = trace(lambda x: E.sin(x) * E.sin(x) + E.sin(x), 1)
+
+        operations = [instruction[0] for instruction in tape.instructions]
+        expect(operations).to(equal(["sin", "*", "+"]))
+
+    def test_replay_does_not_create_nodes(self):
+        """
+        Verify that tracing and replaying leave the active registry untouched and create no nodes during replay
+
+        """
+        x = Node("x", 1, 1)
+        tape = trace(vector_function, 2)
+        nodes_created = Node._NODES_COMPUTED_FOR_BENCHMARKING
+
+        tape(1.0, 2.0)
+
+        expect(Node._NODES_COMPUTED_FOR_BENCHMARKING).to(equal(nodes_created))
+        expect(list(Node._NODE_REGISTRY)).to(equal(["x"]))
+
+    def test_domain_errors_are_raised_on_replay(self):
+        """
+        Verify that replaying a tape outside the domain of an elementary raises the same error as graph construction
+
+        """
+        tape = trace(lambda x: E.sqrt(x), 1)
+        with pytest.raises(ValueError):
+            tape(-1.0)
+
+    def test_wrong_number_of_inputs_raises_value_error(self):
+        """
+        Verify that a tape only accepts as many inputs as it was traced with
+
+        """
+        tape = trace(vector_function, 2)
+        with pytest.raises(ValueError):
+            tape(1.0)
+
+    def test_non_node_output_raises_value_error(self):
+        """
+        Verify that only functions returning nodes can be traced
+
+        """
+        with pytest.raises(ValueError):
+            trace(lambda x: 1.0, 1)
+
+    def test_batched_replay_matches_pointwise_replay(self):
+        """
+        Verify that replaying a tape on arrays of points evaluates every point at once
+
+        """
+        tape = trace(vector_function, 2)
+        x1_values = np.array([0.3, 1.0, 2.0])
+        x2_values = np.array([4.0, 0.5, -1.5])
+
+        values, jacobians = tape(x1_values, x2_values)
+
+        expect(values.shape).to(equal((3, 3)))
+        expect(jacobians.shape).to(equal((3, 3, 2)))
+        for index, point in enumerate(zip(x1_values, x2_values)):
+            value, jacobian = tape(*point)
+            assert_array_almost_equal(values[index], value)
+            assert_array_almost_equal(jacobians[index], jacobian)
+
+    def test_custom_seed_vectors_select_directions(self):
+        """
+        Verify that seed vectors choose the directions the derivative is taken in
+
+        """
+        tape = trace(lambda x1, x2: [x1 * x2 + E.sin(x1), x1 / x2], 2)
+        _, jacobian = tape(0.3, 4.0)
+        _, directional = tape(0.3, 4.0, seed_vectors=np.array([[1.0], [1.0]]))
+
+        assert_array_almost_equal(directional[:, 0], jacobian.sum(axis=1))
+        with pytest.raises(ValueError):
+            tape(0.3, 4.0, seed_vectors=np.ones(2))
+
+    def test_vjp_matches_cotangent_times_jacobian(self):
+        """
+        Verify that the reverse sweep of a tape multiplies the cotangent with the Jacobian of the replay
+
+        """
+        tape = trace(lambda x1, x2: [x1 * x2 + E.sin(x1), x1 + x2 + E.sin(x1 * x2), E.exp(x1) / x2], 2)
+        value, jacobian = tape(0.7, 1.3)
+
+        vjp_value, product = tape.vjp(0.7, 1.3, cotangent=[0.3, -2.0, 1.5])
+
+        assert_array_almost_equal(vjp_value, value)
+        assert_array_almost_equal(product, np.array([0.3, -2.0, 1.5]) @ jacobian)
+        with pytest.raises(ValueError):
+            tape.vjp(0.7, 1.3, cotangent=[1.0])
+
+
+class TestInPlaceEvaluation:
+    """
+    Test that evaluating a tape into a preallocated output reuses the tangent storage of its arena.
+
+    """
+
+    def test_in_place_evaluation_matches_replay(self):
+        """
+        Verify that tangent kernels give the value and Jacobian of replaying the forward rules,
+        for single points and batches
+
+        """
+        tape = trace(
+            lambda x, y: [x * y - E.exp(-x) / y, E.sqrt(y) ** 2 + 3, E.ln(x * y), y], 2
+        )
+
+        for point in [(0.3, 4.0), (np.array([0.5, 1.0, 2.0]), np.array([1.0, 3.0, 5.0]))]:
+            value, jacobian = tape(*point)
+            out = np.empty_like(jacobian)
+            in_place_value, in_place_jacobian = tape(*point, out=out)
+
+            expect(in_place_jacobian is out).to(be_true)
+            assert_array_almost_equal(in_place_value, value)
+            assert_array_almost_equal(in_place_jacobian, jacobian)
+
+    def test_steady_state_evaluation_does_not_allocate(self):
+        """
+        Verify that repeated evaluations at the same shape are served from the buffer of the arena
+
+        """
+        tape = trace(lambda x, y: x * E.sin(y) + y, 2)
+        gradient = np.empty(2)
+        for x in np.linspace(0, 1, 10):
+            tape(x, 2.0, out=gradient)
+
+        expect(tape.arena.allocations).to(equal(1))
+        expect(tape.arena.reuses).to(equal(9))
+        assert_array_almost_equal(gradient, [np.sin(2.0), np.cos(2.0) + 1])
+
+    def test_wrong_output_shape_raises_value_error(self):
+        """
+        Verify that the output must have the shape of the Jacobian
+
+        """
+        tape = trace(vector_function, 2)
+
+        with pytest.raises(ValueError):
+            tape(1.0, 2.0, out=np.empty((2, 3)))
+
+    def test_in_place_evaluation_uses_dtype_of_output(self):
+        """
+        Verify that tangents are computed in the dtype of the output
+
+        """
+        tape = trace(lambda x, y: [x * E.sin(y), x / y], 2)
+        out = np.empty((2, 2), dtype=np.float32)
+        _, jacobian = tape(1.0, 2.0)
+        tape(1.0, 2.0, out=out)
+
+        # three instructions and the scratch row, each holding two single precision entries
+        expect(tape.arena.statistics()["stored_bytes"]).to(equal(4 * 2 * 4))
+        assert_array_almost_equal(out, jacobian, decimal=6)
@@ -0,0 +1,164 @@
+import math
+
+import pytest
+from expects import expect, equal, be_a, be_true
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+from autodiff_team29 import Node, Taylor, grad, taylor_derivatives
+import autodiff_team29.elementaries as E
+
+
+def scalar_function(x):
+    return (
+        E.sqrt(x[0]) * E.sin(x[1]) / E.exp(x[0])
+        + E.log(x[0], 2) * E.tan(x[0] * x[1])
+        - E.arcsin(x[0] / 3) * E.arccos(x[0] / 4)
+        + E.arctan(x[1]) * E.sinh(x[0]) / E.cosh(x[1])
+        + E.tanh(x[0]) ** 2
+        - E.logistic(x[1])
+        + E.power(2, x[1])
+        - 1 / x[0]
+        + x[0] ** x[1]
+        + E.ln(x[0] * x[1])
+        + x[0] ** 2.5
+    )
+
+
+class TestTaylor:
+    """
+    Test that Taylor series propagate derivatives of arbitrary order along a direction.
+
+    """
+
+    def test_variable_holds_value_and_direction(self):
+        """
+        Verify that a variable is the line through its value along its direction
+
+        """
+        x = Taylor.variable(2.0, 3.0, order=4)
+
+        expect(x).to(be_a(Taylor))
+        expect(x.order).to(equal(4))
+        expect(x.value).to(equal(2.0))
+        assert_array_almost_equal(x.coefficients, [2, 3, 0, 0, 0])
+
+    def test_order_must_be_positive(self):
+        """
+        Verify that variables of order zero are rejected
+
+        """
+        with pytest.raises(ValueError):
+            Taylor.variable(1.0, order=0)
+
+    def test_known_series(self):
+        """
+        Verify the derivatives of functions with closed form derivatives of every order
+
+        """
+        assert_array_almost_equal(E.exp(Taylor.variable(0.0, order=6)).derivatives(), np.ones(7))
+        assert_array_almost_equal(
+            E.sin(Taylor.variable(0.0, order=7)).derivatives(), [0, 1, 0, -1, 0, 1, 0, -1]
+        )
+        assert_array_almost_equal(
+            taylor_derivatives(lambda x: 1 / (1 - x), 0.5, 1, 8),
+            [math.factorial(k) / 0.5 ** (k + 1) for k in range(9)],
+        )
+        assert_array_almost_equal(taylor_derivatives(lambda x: x**3, 0.0, 1, 4), [0, 0, 0, 6, 0])
+
+    def test_low_orders_match_gradient_and_hessian(self):
+        """
+        Verify that orders one and two are the directional first and second derivatives of every elementary
+
+        """
+        point, direction = [0.7, 1.3], np.array([0.4, -1.1])
+        x = Node.variables(["x", "y"], point)
+        expected = scalar_function(x)
+
+        derivatives = taylor_derivatives(scalar_function, point, direction, 2)
+
+        expect(np.allclose(derivatives[0], expected.value)).to(be_true)
+        expect(np.allclose(derivatives[1], np.dot(grad(scalar_function)(point), direction))).to(be_true)
+        expect(np.allclose(derivatives[2], direction @ expected.hessian @ direction)).to(be_true)
+
+    @pytest.mark.parametrize(
+        "elementary",
+        [
+            E.sqrt,
+            E.ln,
+            lambda u: E.log(u, 2),
+            E.exp,
+            E.sin,
+            E.cos,
+            E.tan,
+            E.arcsin,
+            E.arccos,
+            E.arctan,
+            E.sinh,
+            E.cosh,
+            E.tanh,
+            E.logistic,
+            lambda u: E.power(u, 2.5),
+        ],
+    )
+    def test_first_order_matches_node_derivative(self, elementary):
+        """
+        Verify that the first order coefficient of every elementary of an expression is the derivative of its node
+
+        """
+        point, direction = [0.7, 1.3], [0.4, -1.1]
+        function = lambda x: elementary(x[0] * x[1] / 4 + x[0])
+        x = [Node(symbol, value, tangent) for symbol, value, tangent in zip("xy", point, direction)]
+
+        derivatives = taylor_derivatives(function, point, direction, 1)
+
+        expect(np.allclose(derivatives[1], function(x).derivative)).to(be_true)
+
+    def test_third_order_matches_finite_difference_of_hessian(self):
+        """
+        Verify the third derivative against a central difference of directional second derivatives
+
+        """
+        point, direction, step = np.array([0.7, 1.3]), np.array([0.4, -1.1]), 1e-4
+
+        def second_derivative(at):
+            Node.clear_node_registry()
+            return taylor_derivatives(scalar_function, at, direction, 2)[2]
+
+        expected = (
+            second_derivative(point + step * direction) - second_derivative(point - step * direction)
+        ) / (2 * step)
+
+        derivatives = taylor_derivatives(scalar_function, point, direction, 3)
+
+        expect(np.allclose(derivatives[3], expected, rtol=1e-5)).to(be_true)
+
+    def test_numbers_are_constants_on_either_side(self):
+        """
+        Verify that reflected operators treat numbers as constants
+
+        """
+        result = taylor_derivatives(lambda x: 3 - x + 4 / x + 2 * x + 1 + 2**x, 2.0, 1, 2)
+
+        expected_second = 8 / 2.0**3 + math.log(2) ** 2 * 4
+        expect(np.allclose(result[2], expected_second)).to(be_true)
+
+    def test_domain_errors_are_raised(self):
+        """
+        Verify that elementaries keep their domain restrictions for series
+
+        """
+        with pytest.raises(ValueError):
+            E.sqrt(Taylor.variable(-1.0, order=3))
+        with pytest.raises(ValueError):
+            E.arcsin(Taylor.variable(2.0, order=3))
+
+    def test_mismatched_direction_and_outputs_are_rejected(self):
+        """
+        Verify that directions must match the point and functions must return series
+
+        """
+        with pytest.raises(ValueError):
+            taylor_derivatives(lambda x: x[0], [1.0, 2.0], [1.0], 3)
+        with pytest.raises(ValueError):
+            taylor_derivatives(lambda x: 1.0, 1.0, 1.0, 3)
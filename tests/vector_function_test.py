@@ -49,3 +49,104 @@ def test_vector_function():
     expect(f.symbol).to(equal(expected_symbol))
     assert_array_almost_equal(f.value, expected_value)
     assert_array_almost_equal(f.jacobian, expected_jacobian)
+
+
+def test_update_recomputes_value_and_jacobian():
+    """
+    Test that updating inputs of a VectorFunction in place gives the same value and jacobian
+    as building the functions at the new point
+
+    """
+    x1 = Node("x1", np.pi, 1, seed_vector=[1, 0])
+    x2 = Node("x2", np.pi / 2, 1, seed_vector=[0, 1])
+    f = VectorFunction([x1 * x2 + E.sin(x1), x1 + x2 + E.sin(x1 * x2)])
+
+    f.update({"x1": 0.5, "x2": 2.0})
+
+    expected_value = np.array([0.5 * 2.0 + np.sin(0.5), 0.5 + 2.0 + np.sin(1.0)])
+    expected_jacobian = np.array(
+        [
+            [2.0 + np.cos(0.5), 0.5],
+            [1 + 2.0 * np.cos(1.0), 1 + 0.5 * np.cos(1.0)],
+        ]
+    )
+    assert_array_almost_equal(f.value, expected_value)
+    assert_array_almost_equal(f.jacobian, expected_jacobian)
+
+
+def test_update_unknown_symbol_raises_key_error():
+    """
+    Test that only inputs of the vector function can be updated
+
+    """
+    x = Node("x", 1, 1)
+    f = VectorFunction([x * 2])
+
+    expect(set(f.inputs)).to(equal({"x", "2"}))
+    with pytest.raises(KeyError):
+        f.update({"y": 1})
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 3, 100])
+def test_compute_jacobian_in_chunks_matches_jacobian(chunk_size):
+    """
+    Test that the Jacobian computed in chunks of seed directions equals the Jacobian of the seed vectors
+
+    """
+    n = 7
+    x = [Node(f"x{i}", 0.5 + 0.1 * i, 1, seed_vector=np.identity(n)[i]) for i in range(n)]
+    f = VectorFunction([E.sin(x[i] * x[i + 1]) + E.sqrt(x[i]) / 2 for i in range(n - 1)])
+
+    assert_array_almost_equal(f.compute_jacobian(chunk_size=chunk_size), f.jacobian)
+
+
+def test_compute_jacobian_with_respect_to_inputs():
+    """
+    Test that columns can be taken with respect to inputs built without seed vectors,
+    and that updated inputs are reflected
+
+    """
+    x = Node("x", 2, 1)
+    y = Node("y", 3, 1)
+    f = VectorFunction([x * y, x - 2 * y, E.exp(y)])
+
+    assert_array_almost_equal(
+        f.compute_jacobian(chunk_size=1, wrt=[y, x]),
+        [[2, 3], [-2, 1], [np.exp(3), 0]],
+    )
+
+    f.update({"y": 1.0})
+    assert_array_almost_equal(
+        f.compute_jacobian(wrt=[x, y]), [[1, 2], [1, -2], [0, np.exp(1)]]
+    )
+
+
+def test_compute_jacobian_rejects_invalid_arguments():
+    """
+    Test that chunk sizes must be positive and columns must belong to inputs
+
+    """
+    x = Node("x", 2, 1)
+    f = VectorFunction([x * 2])
+
+    with pytest.raises(ValueError):
+        f.compute_jacobian(chunk_size=0)
+    with pytest.raises(ValueError):
+        f.compute_jacobian(wrt=[Node("y", 1, 1)])
+
+
+def test_hessian_stacks_hessians_of_functions():
+    """
+    Test that the Hessian of a vector function holds the Hessian of every function
+
+    """
+    x = Node("x", 1, 1, seed_vector=[1, 0])
+    y = Node("y", 2, 1, seed_vector=[0, 1])
+    f = VectorFunction([x * y, E.sin(x) + y, y**2])
+
+    expected = [
+        [[0, 1], [1, 0]],
+        [[-np.sin(1), 0], [0, 0]],
+        [[0, 0], [0, 2]],
+    ]
+    assert_array_almost_equal(f.hessian, expected)